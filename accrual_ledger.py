@@ -0,0 +1,275 @@
+"""
+Accrual Ledger for Indian Labor Law Compliance System
+Incremental year-to-date earned leave and gratuity liability per employee
+
+calculate_leave_entitlement() and calculate_gratuity() work from totals
+(days worked in the year, years of service) that callers would otherwise
+aggregate from raw attendance. The ledger keeps those totals per employee and
+updates them as attendance and salary events arrive. Each event costs O(1),
+and the establishment-wide totals and per-month provisions are kept as
+running sums, so a provisioning report is a read, not a recomputation.
+
+Rules (same as core_calculators):
+    Earned leave: 1 day per 20 days worked, capped at 30 (factories) or 21
+                  (other establishments); shops in Maharashtra, Karnataka and
+                  Tamil Nadu earn 1 day per 18 days, capped at 21.
+                  Government employees are credited 30 days a year.
+    Gratuity:     Private employees get (salary / 26) x 15 x years of service,
+                  capped at the limit in force on the valuation date (Rs. 20
+                  lakhs since 2018). Government employees get
+                  (salary x years x 15) / 26, with no cap.
+                  The liability accrues from the first day; it vests after 5
+                  (private) or 10 (government) completed years.
+
+Years of service count completed years, plus one for a part year of six
+months or more (Payment of Gratuity Act, Section 4(2)).
+"""
+
+from core_calculators import calculate_government_leave_entitlement
+from rates import active_rules
+
+SHOP_18_DAY_STATES = ('maharashtra', 'karnataka', 'tamil nadu')
+
+def gratuity_cap(on):
+    """
+    Private-sector gratuity cap in force on a date
+
+    Before the first cap on record the earliest one is used, so services
+    valued at old dates still get a (conservative) cap instead of an error.
+    """
+    table = active_rules().tables['gratuity_cap']
+    cap = table.on(on)
+    return table.values[0] if cap is None else cap
+
+def leave_rule(state='general', establishment_type='factory'):
+    """
+    Return (days worked per earned leave day, cap) for an establishment
+
+    Matches the earned leave in calculate_leave_entitlement().
+    """
+    establishment_type = establishment_type.lower()
+    if establishment_type == 'shop' and state.lower() in SHOP_18_DAY_STATES:
+        return 18, 21
+    return 20, 30 if establishment_type == 'factory' else 21
+
+def _anniversary(joined, years):
+    try:
+        return joined.replace(year=joined.year + years)
+    except ValueError:
+        # Joined on 29 February
+        return joined.replace(year=joined.year + years, day=28)
+
+def service_years(joined, as_of):
+    """
+    Years of service for gratuity on a date
+
+    Returns:
+        tuple: (completed years, years counted for gratuity)
+    """
+    if as_of < joined:
+        return 0, 0
+    completed = as_of.year - joined.year - ((as_of.month, as_of.day) < (joined.month, joined.day))
+    anniversary = _anniversary(joined, completed)
+    months = (as_of.year - anniversary.year) * 12 + as_of.month - anniversary.month - (as_of.day < anniversary.day)
+    return completed, completed + (1 if months >= 6 else 0)
+
+class EmployeeAccrual:
+    """Running accrual state for one employee"""
+
+    __slots__ = (
+        'employee_id', 'joined', 'salary', 'sector', 'state', 'establishment_type',
+        'days_per_leave', 'leave_cap', 'as_of', 'leave_year', 'days_worked', 'earned_leave',
+        'completed_years', 'gratuity_years', 'gratuity_liability', 'gratuity_vested', 'leave_liability'
+    )
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__
+                if name not in ('days_per_leave', 'leave_cap')}
+
+class AccrualLedger:
+    """
+    Employee accrual ledger with establishment-wide running totals
+
+    Events for an employee may arrive in any order within a leave year.
+    Attendance for an earlier leave year than the one the employee's ledger has
+    moved on to is rejected.
+    """
+
+    def __init__(self):
+        self._employees = {}
+        self._totals = {
+            'employees': 0,
+            'days_worked': 0,
+            'earned_leave': 0,
+            'leave_liability': 0.0,
+            'gratuity_liability': 0.0,
+            'vested_employees': 0
+        }
+        # (year, month) -> changes recorded by events dated in that month
+        self._months = {}
+
+    def add_employee(self, employee_id, joined, salary, sector='private', state='general',
+                     establishment_type='factory'):
+        """
+        Open a ledger account
+
+        Args:
+            employee_id: Unique employee id
+            joined: Date of joining
+            salary: Monthly basic + DA
+            sector: 'private' or 'government'
+            state: State of the establishment
+            establishment_type: 'factory', 'shop', ...
+        """
+        if employee_id in self._employees:
+            raise ValueError(f'Employee already in ledger: {employee_id}')
+        account = EmployeeAccrual()
+        account.employee_id = employee_id
+        account.joined = joined
+        account.salary = salary
+        account.sector = sector
+        account.state = state
+        account.establishment_type = establishment_type
+        account.days_per_leave, account.leave_cap = leave_rule(state, establishment_type)
+        account.as_of = joined
+        account.leave_year = joined.year
+        account.days_worked = 0
+        account.earned_leave = 0
+        account.completed_years = 0
+        account.gratuity_years = 0
+        account.gratuity_liability = 0.0
+        account.gratuity_vested = False
+        account.leave_liability = 0.0
+        self._employees[employee_id] = account
+        self._totals['employees'] += 1
+        self._update(account, joined)
+
+    def record_attendance(self, employee_id, on, days_worked=1):
+        """
+        Record days worked (a day's attendance, or a whole month's total)
+
+        Args:
+            employee_id: Employee id
+            on: Date of the attendance (for a monthly total, any day in the month)
+            days_worked: Days worked
+        """
+        account = self._account(employee_id)
+        if on.year < account.leave_year:
+            raise ValueError(f'Attendance for {on.year} after the ledger moved on to {account.leave_year}')
+        if on.year > account.leave_year:
+            self._start_leave_year(account, on)
+        account.days_worked += days_worked
+        self._totals['days_worked'] += days_worked
+        self._month(on)['days_worked'] += days_worked
+        self._update(account, on)
+
+    def update_salary(self, employee_id, salary, on):
+        """Record a change of monthly basic + DA effective from a date"""
+        account = self._account(employee_id)
+        account.salary = salary
+        self._update(account, on)
+
+    def advance(self, employee_id, on):
+        """Bring an employee's service (and so gratuity liability) up to a date without attendance"""
+        account = self._account(employee_id)
+        if on.year > account.leave_year:
+            self._start_leave_year(account, on)
+        self._update(account, on)
+
+    def employee(self, employee_id):
+        """
+        Get an employee's accruals
+
+        Returns:
+            dict: Year-to-date days worked and earned leave, service years,
+                  gratuity liability and vesting, leave encashment liability
+        """
+        return self._account(employee_id).to_dict()
+
+    def provisioning_report(self, year=None, month=None):
+        """
+        Read the establishment's accruals (no recomputation)
+
+        Args:
+            year, month: Also return the provision charged in this month
+
+        Returns:
+            dict: {'totals': {...}, 'month': {...} or None}
+        """
+        totals = dict(self._totals)
+        totals['leave_liability'] = round(totals['leave_liability'], 2)
+        totals['gratuity_liability'] = round(totals['gratuity_liability'], 2)
+        report = {'totals': totals, 'month': None}
+        if year is not None and month is not None:
+            charges = dict(self._months.get((year, month), _empty_month()))
+            charges['leave_provision'] = round(charges['leave_provision'], 2)
+            charges['gratuity_provision'] = round(charges['gratuity_provision'], 2)
+            report['month'] = dict(charges, year=year, month=month)
+        return report
+
+    def _account(self, employee_id):
+        try:
+            return self._employees[employee_id]
+        except KeyError:
+            raise KeyError(f'Employee not in ledger: {employee_id}')
+
+    def _month(self, on):
+        key = (on.year, on.month)
+        charges = self._months.get(key)
+        if charges is None:
+            charges = self._months[key] = _empty_month()
+        return charges
+
+    def _start_leave_year(self, account, on):
+        # Last year's leave is closed out, not charged to the new year's first month
+        self._totals['days_worked'] -= account.days_worked
+        self._totals['earned_leave'] -= account.earned_leave
+        self._totals['leave_liability'] -= account.leave_liability
+        account.leave_year = on.year
+        account.days_worked = 0
+        account.earned_leave = 0
+        account.leave_liability = 0.0
+
+    def _update(self, account, on):
+        """Re-derive the employee's accruals from its counters and apply the change to the running sums"""
+        if on > account.as_of:
+            account.as_of = on
+        if account.sector == 'government':
+            earned_leave = calculate_government_leave_entitlement()['earned_leave']
+            vesting_years = 10
+        else:
+            earned_leave = min(account.days_worked // account.days_per_leave, account.leave_cap)
+            vesting_years = 5
+
+        completed, counted = service_years(account.joined, account.as_of)
+        # Same operation order as calculate_gratuity / calculate_government_gratuity,
+        # so the rounded amounts agree to the paisa
+        if account.sector == 'government':
+            liability = (account.salary * counted * 15) / 26
+        else:
+            liability = (account.salary / 26) * 15 * counted
+        if account.sector != 'government' and liability:
+            # Valued at the account's as_of date, which an older event does not move back
+            liability = min(liability, gratuity_cap(account.as_of))
+        liability = round(liability, 2)
+        vested = completed >= vesting_years
+        leave_liability = round(earned_leave * account.salary / 26, 2)
+
+        charges = self._month(on)
+        charges['earned_leave'] += earned_leave - account.earned_leave
+        charges['leave_provision'] += leave_liability - account.leave_liability
+        charges['gratuity_provision'] += liability - account.gratuity_liability
+        self._totals['earned_leave'] += earned_leave - account.earned_leave
+        self._totals['leave_liability'] += leave_liability - account.leave_liability
+        self._totals['gratuity_liability'] += liability - account.gratuity_liability
+        self._totals['vested_employees'] += vested - account.gratuity_vested
+
+        account.earned_leave = earned_leave
+        account.leave_liability = leave_liability
+        account.completed_years = completed
+        account.gratuity_years = counted
+        account.gratuity_liability = liability
+        account.gratuity_vested = vested
+
+def _empty_month():
+    return {'days_worked': 0, 'earned_leave': 0, 'leave_provision': 0.0, 'gratuity_provision': 0.0}
\ No newline at end of file
@@ -2,15 +2,224 @@
 Flask Web Application for Indian Labor Law Compliance System
 """
 
-from flask import Flask, render_template, request, jsonify, send_file
+import hashlib
+import importlib
+import io
+import itertools
+import json
+import os
+import shutil
+import tempfile
+import time
+from datetime import date
+
+from flask import Flask, Response, g, render_template, request, jsonify, send_file, stream_with_context, url_for
+from compression import COMPRESSIBLE_TYPES, choose_encoding, compress, compress_stream
 from core_calculators import (
     calculate_gratuity, calculate_pf_contribution, is_esi_applicable,
     calculate_leave_entitlement, generate_compliance_checklist, calculate_nps_contribution
 )
-from holiday_calendar import get_holidays_by_month, count_working_days
-from pdf_generator import generate_calculation_report, generate_compliance_report
+from bulk_reports import read_employee_csv, read_employee_json, stream_reports_zip
+from calculations import CALCULATION_TYPES, prepare_report, run_calculation, run_batch_record
+from holiday_calendar import (
+    available_holiday_calendars, get_holiday_calendar, get_holiday_summary, holidays_to_ics, warm_holiday_cache
+)
+from instrumentation import init_instrumentation, stage
+from jobs import JOB_HANDLERS, JobQueue
+from memoize import memoization_stats
+from parallel import BatchExecutor
+from rates import REQUIRED_RATES, as_pay_period, rates_on, reload_if_changed, rules_version
+from report_cache import ReportCache, report_cache_key
 
 app = Flask(__name__)
+# Bulk PDF rendering: process pool size and ceiling for reports held in flight
+app.config['BULK_REPORT_WORKERS'] = int(os.environ.get('BULK_REPORT_WORKERS', os.cpu_count() or 1))
+app.config['BULK_REPORT_MAX_MEMORY'] = int(os.environ.get('BULK_REPORT_MAX_MEMORY', 256 * 1024 * 1024))
+# Rendered PDF cache: memory budget (0 disables) and optional on-disk tier
+app.config['REPORT_CACHE_MAX_BYTES'] = int(os.environ.get('REPORT_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+app.config['REPORT_CACHE_DIR'] = os.environ.get('REPORT_CACHE_DIR', '')
+app.config['REPORT_CACHE_MAX_DISK_BYTES'] = int(os.environ.get('REPORT_CACHE_MAX_DISK_BYTES', 1024 * 1024 * 1024))
+# Batch API: worker processes, records per chunk, and the batch size below which it runs in-process
+app.config['BATCH_WORKERS'] = int(os.environ.get('BATCH_WORKERS', os.cpu_count() or 1))
+app.config['BATCH_CHUNK_SIZE'] = int(os.environ.get('BATCH_CHUNK_SIZE', 500))
+app.config['BATCH_MIN_PARALLEL'] = int(os.environ.get('BATCH_MIN_PARALLEL', 5000))
+# Background jobs: queue directory (SQLite + files), worker threads, attempts and result lifetime
+app.config['JOBS_DIR'] = os.environ.get('JOBS_DIR', os.path.join(app.instance_path, 'jobs'))
+app.config['JOBS_WORKERS'] = int(os.environ.get('JOBS_WORKERS', 2))
+app.config['JOBS_MAX_ATTEMPTS'] = int(os.environ.get('JOBS_MAX_ATTEMPTS', 3))
+app.config['JOBS_RETENTION_SECONDS'] = int(os.environ.get('JOBS_RETENTION_SECONDS', 24 * 3600))
+# Instrumentation: per-stage timings and /metrics, and on-demand profiles (X-Profile header or ?_profile=1)
+app.config['INSTRUMENTATION_ENABLED'] = os.environ.get('INSTRUMENTATION_ENABLED', '0') == '1'
+app.config['PROFILING_ENABLED'] = os.environ.get('PROFILING_ENABLED', '0') == '1'
+app.config['PROFILE_DIR'] = os.environ.get('PROFILE_DIR', os.path.join(app.instance_path, 'profiles'))
+init_instrumentation(app)
+# Holiday pages: browser/proxy cache lifetime in seconds (clients revalidate with the ETag)
+app.config['HOLIDAY_CACHE_MAX_AGE'] = int(os.environ.get('HOLIDAY_CACHE_MAX_AGE', 3600))
+# Statutory rates: seconds between checks of data/rates.json for changes (0 disables hot reload)
+app.config['RATES_RELOAD_INTERVAL'] = float(os.environ.get('RATES_RELOAD_INTERVAL', 30))
+_rates_checked = [time.monotonic()]
+# Response compression: gzip (Brotli too when installed) for text bodies of at least COMPRESSION_MIN_SIZE bytes
+app.config['COMPRESSION_ENABLED'] = os.environ.get('COMPRESSION_ENABLED', '1') == '1'
+app.config['COMPRESSION_MIN_SIZE'] = int(os.environ.get('COMPRESSION_MIN_SIZE', 500))
+app.config['COMPRESSION_LEVEL'] = int(os.environ.get('COMPRESSION_LEVEL', 6))
+# Calculator pages: in-memory cache of parameter-free GET renders and their browser cache lifetime
+app.config['PAGE_CACHE_ENABLED'] = os.environ.get('PAGE_CACHE_ENABLED', '1') == '1'
+app.config['PAGE_CACHE_MAX_AGE'] = int(os.environ.get('PAGE_CACHE_MAX_AGE', 300))
+# Static assets: cache lifetime of versioned URLs from static_url() (unversioned URLs are revalidated)
+app.config['STATIC_CACHE_MAX_AGE'] = int(os.environ.get('STATIC_CACHE_MAX_AGE', 365 * 24 * 3600))
+
+# Response options per endpoint:
+#   page_cache:     serve GET renders from memory; the only query parameter allowed is
+#                   ?sector=private|government, which is part of the cache key
+#   compress:       False to always send the body as is
+#   compress_level: gzip level / Brotli quality for this endpoint (default COMPRESSION_LEVEL)
+ROUTE_RESPONSE_OPTIONS = {
+    'index': {'page_cache': True},
+    'private_sector': {'page_cache': True},
+    'government_sector': {'page_cache': True},
+    'gratuity_calculator': {'page_cache': True},
+    'pf_calculator': {'page_cache': True},
+    'nps_calculator': {'page_cache': True},
+    'esi_calculator': {'page_cache': True},
+    'leave_calculator': {'page_cache': True},
+    'compliance_checker': {'page_cache': True},
+    # Large streamed outputs: favour throughput over ratio
+    'api_process_payroll': {'compress_level': 1},
+    'api_calculate_batch': {'compress_level': 1},
+    # Probes are tiny and polled constantly
+    'healthz': {'compress': False},
+    'readyz': {'compress': False}
+}
+PAGE_CACHE_SECTORS = (None, 'private', 'government')
+
+@app.before_request
+def _reload_rates_if_changed():
+    """Pick up an edited rates file without restarting the worker"""
+    interval = app.config['RATES_RELOAD_INTERVAL']
+    now = time.monotonic()
+    if interval <= 0 or now - _rates_checked[0] < interval:
+        return
+    _rates_checked[0] = now
+    try:
+        if reload_if_changed():
+            app.logger.info('Loaded statutory rates %s', rules_version())
+    except ValueError as e:
+        app.logger.error('Rates file not reloaded, keeping %s: %s', rules_version(), e)
+
+def _page_cache_key():
+    """(endpoint, sector) if this request may be served from the page cache, else None"""
+    if request.method != 'GET' or app.debug or not app.config['PAGE_CACHE_ENABLED']:
+        return None
+    if not ROUTE_RESPONSE_OPTIONS.get(request.endpoint, {}).get('page_cache'):
+        return None
+    sector = request.args.get('sector')
+    if sector not in PAGE_CACHE_SECTORS or any(name != 'sector' for name in request.args):
+        return None
+    return request.endpoint, sector
+
+def _page_response(page):
+    """
+    Build the response for a cached page, compressed for this client
+
+    Each encoding of a page is compressed once and kept with it; the ETag
+    names the encoding, so conditional requests work for every variant.
+    """
+    encoding = None
+    if app.config['COMPRESSION_ENABLED'] and len(page['body']) >= app.config['COMPRESSION_MIN_SIZE']:
+        encoding = choose_encoding(request.accept_encodings)
+    body = page['body']
+    if encoding is not None:
+        body = page['encoded'].get(encoding)
+        if body is None:
+            body = page['encoded'][encoding] = compress(page['body'], encoding, _compress_level())
+    response = app.response_class(body, content_type='text/html; charset=utf-8')
+    response.set_etag(f"{page['etag']}-{encoding}" if encoding else page['etag'])
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.max_age = app.config['PAGE_CACHE_MAX_AGE']
+    return response.make_conditional(request)
+
+@app.before_request
+def _serve_cached_page():
+    key = _page_cache_key()
+    if key is None:
+        return None
+    page = app.extensions.setdefault('page_cache', {}).get(key)
+    if page is None:
+        return None
+    # Served from the cache: _finish_response must not store it again
+    g.page_cache_hit = True
+    return _page_response(page)
+
+def _compress_level():
+    return ROUTE_RESPONSE_OPTIONS.get(request.endpoint, {}).get('compress_level', app.config['COMPRESSION_LEVEL'])
+
+def _compress(response):
+    """Compress a text response in place if the client accepts it"""
+    if (response.mimetype not in COMPRESSIBLE_TYPES or response.status_code != 200
+            or 'Content-Encoding' in response.headers or response.direct_passthrough):
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+    level = _compress_level()
+    if response.is_streamed:
+        response.response = compress_stream(response.iter_encoded(), encoding, level)
+        response.headers.pop('Content-Length', None)
+    else:
+        body = response.get_data()
+        if len(body) < app.config['COMPRESSION_MIN_SIZE']:
+            return response
+        response.set_data(compress(body, encoding, level))
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag:
+        # Each encoding is its own representation; revalidate against the encoded ETag
+        response.set_etag(f'{etag}-{encoding}', weak)
+        response = response.make_conditional(request)
+    return response
+
+@app.after_request
+def _finish_response(response):
+    """Page caching, static asset caching headers and compression, per ROUTE_RESPONSE_OPTIONS"""
+    key = _page_cache_key()
+    if g.get('page_cache_hit'):
+        return response
+    if key is not None and response.status_code == 200 and 'Content-Encoding' not in response.headers:
+        body = response.get_data()
+        page = {'body': body, 'etag': hashlib.sha256(body).hexdigest(), 'encoded': {}}
+        app.extensions.setdefault('page_cache', {})[key] = page
+        return _page_response(page)
+    
+    if request.endpoint == 'static':
+        if request.args.get('v') and request.args.get('v') == _static_version(request.view_args['filename']):
+            response.cache_control.public = True
+            response.cache_control.max_age = app.config['STATIC_CACHE_MAX_AGE']
+            response.cache_control.immutable = True
+        return response
+    
+    if app.config['COMPRESSION_ENABLED'] and ROUTE_RESPONSE_OPTIONS.get(request.endpoint, {}).get('compress', True):
+        return _compress(response)
+    return response
+
+def _static_version(filename):
+    """Short content hash of a static file (cached), or None if it does not exist"""
+    versions = app.extensions.setdefault('static_versions', {})
+    if filename not in versions:
+        try:
+            with open(os.path.join(app.static_folder, filename), 'rb') as source:
+                versions[filename] = hashlib.sha256(source.read()).hexdigest()[:12]
+        except (OSError, ValueError):
+            return None
+    return versions[filename]
+
+@app.template_global()
+def static_url(filename):
+    """URL of a static asset with a content version, so it can be cached for STATIC_CACHE_MAX_AGE"""
+    return url_for('static', filename=filename, v=_static_version(filename))
 
 @app.route('/')
 def index():
@@ -32,7 +241,8 @@ def gratuity_calculator():
             salary = float(request.form['salary'])
             years = float(request.form['years'])
             sector = request.form.get('sector', 'private')
-            result = calculate_gratuity(salary, years, sector)
+            with stage('calculate', 'gratuity'):
+                result = calculate_gratuity(salary, years, sector)
             return render_template('gratuity.html', result=result, salary=salary, years=years, sector=sector)
         except ValueError:
             error = "Please enter valid numbers"
@@ -47,7 +257,8 @@ def pf_calculator():
             basic = float(request.form['basic'])
             da = float(request.form.get('da', 0))
             sector = request.form.get('sector', 'private')
-            result = calculate_pf_contribution(basic, da, sector)
+            with stage('calculate', 'pf'):
+                result = calculate_pf_contribution(basic, da, sector)
             return render_template('pf.html', result=result, basic=basic, da=da, sector=sector)
         except ValueError:
             error = "Please enter valid numbers"
@@ -61,7 +272,8 @@ def nps_calculator():
             basic = float(request.form['basic'])
             da = float(request.form.get('da', 0))
             employee_rate = int(request.form.get('employee_rate', 10))
-            result = calculate_nps_contribution(basic, da, employee_rate)
+            with stage('calculate', 'nps'):
+                result = calculate_nps_contribution(basic, da, employee_rate)
             return render_template('nps.html', result=result, basic=basic, da=da)
         except ValueError:
             error = "Please enter valid numbers"
@@ -74,7 +286,8 @@ def esi_calculator():
         try:
             salary = float(request.form['salary'])
             state = request.form.get('state', 'general')
-            result = is_esi_applicable(salary, state)
+            with stage('calculate', 'esi'):
+                result = is_esi_applicable(salary, state)
             return render_template('esi.html', result=result, salary=salary, state=state)
         except ValueError:
             error = "Please enter valid numbers"
@@ -88,13 +301,15 @@ def leave_calculator():
         try:
             sector = request.form.get('sector', 'private')
             if sector == 'government':
-                result = calculate_leave_entitlement(0, '', '', 'government')
+                with stage('calculate', 'leave'):
+                    result = calculate_leave_entitlement(0, '', '', 'government')
                 return render_template('leave.html', result=result, sector=sector)
             else:
                 days_worked = int(request.form['days_worked'])
                 state = request.form.get('state', 'general')
                 establishment_type = request.form.get('establishment_type', 'factory')
-                result = calculate_leave_entitlement(days_worked, state, establishment_type, sector)
+                with stage('calculate', 'leave'):
+                    result = calculate_leave_entitlement(days_worked, state, establishment_type, sector)
                 return render_template('leave.html', result=result, days_worked=days_worked, 
                                      state=state, establishment_type=establishment_type, sector=sector)
         except ValueError:
@@ -109,7 +324,8 @@ def compliance_checker():
             state = request.form['state']
             num_employees = int(request.form['num_employees'])
             industry_type = request.form['industry_type']
-            checklist = generate_compliance_checklist(state, num_employees, industry_type)
+            with stage('calculate', 'compliance'):
+                checklist = generate_compliance_checklist(state, num_employees, industry_type)
             return render_template('compliance.html', checklist=checklist, 
                                  state=state, num_employees=num_employees, 
                                  industry_type=industry_type)
@@ -118,115 +334,533 @@ def compliance_checker():
             return render_template('compliance.html', error=error)
     return render_template('compliance.html')
 
+@app.route('/api/compliance/portfolio', methods=['POST'])
+def api_compliance_portfolio():
+    """
+    Compliance matrix for every branch of an employer
+    
+    JSON body: {'establishments': [{'name', 'state', 'num_employees', 'industry_type'}, ...]}
+    (or just the list). ?format=pdf returns the consolidated PDF report instead.
+    """
+    from compliance_portfolio import evaluate_portfolio, portfolio_to_dict
+    data = request.get_json(silent=True)
+    establishments = data.get('establishments') if isinstance(data, dict) else data
+    if not isinstance(establishments, list) or not establishments:
+        return jsonify({'error': 'Request body must list at least one establishment'}), 400
+    try:
+        with stage('calculate', 'compliance_portfolio'):
+            portfolio = evaluate_portfolio(establishments)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    if request.args.get('format') == 'pdf':
+        from pdf_generator import generate_portfolio_compliance_report
+        return send_file(generate_portfolio_compliance_report(portfolio), as_attachment=True, download_name='portfolio_compliance_report.pdf',
+                         mimetype='application/pdf')
+    return jsonify(portfolio_to_dict(portfolio))
+
 @app.route('/holidays')
 def holiday_calendar():
-    state = request.args.get('state', 'central')
-    months = get_holidays_by_month(2025, state)
-    working_days = count_working_days(2025, state)
-    return render_template('holiday_calendar.html', months=months, working_days=working_days, state=state)
+    year, state = _holiday_request_args()
+    if year is None:
+        return "No holiday data for that year", 404
+    
+    def render():
+        summary = get_holiday_summary(year, state)
+        return render_template('holiday_calendar.html', months=summary['months'],
+                               working_days=summary['working_days'], state=summary['state'], year=year)
+    
+    return _cached_holiday_response('html', year, state, render, 'text/html; charset=utf-8')
+
+@app.route('/api/holidays')
+def holiday_calendar_json():
+    """Holidays, per-month listing and working-day summary for a year and state"""
+    year, state = _holiday_request_args()
+    if year is None:
+        return jsonify({'error': 'No holiday data for that year'}), 404
+    
+    def render():
+        return json.dumps(get_holiday_summary(year, state), sort_keys=True)
+    
+    return _cached_holiday_response('json', year, state, render, 'application/json')
+
+@app.route('/holidays.ics')
+def holiday_calendar_ics():
+    """Holidays as an iCalendar feed, for calendar apps to subscribe to"""
+    year, state = _holiday_request_args()
+    if year is None:
+        return "No holiday data for that year", 404
+    response = _cached_holiday_response('ics', year, state, lambda: holidays_to_ics(year, state),
+                                        'text/calendar; charset=utf-8')
+    response.headers['Content-Disposition'] = f'inline; filename=holidays_{year}_{state}.ics'
+    return response
+
+def _holiday_request_args():
+    """Return (year, normalized state) from the query string; year is None if there is no data for it"""
+    try:
+        year = int(request.args.get('year', 2025))
+    except ValueError:
+        return None, None
+    if year not in {available_year for available_year, _ in available_holiday_calendars()}:
+        return None, None
+    return year, get_holiday_calendar(year, request.args.get('state', 'central')).state
+
+def _cached_holiday_response(kind, year, state, render, content_type):
+    """
+    Serve a holiday page from the rendered-page cache with a strong ETag
+
+    Holiday data only changes with the data files, so each (kind, year, state)
+    is rendered once; clients revalidate with If-None-Match and get 304s.
+    Pages remember the calendar they were rendered from: clear_holiday_cache()
+    builds new calendars, so pages of reloaded data are rendered again.
+    """
+    pages = app.extensions.setdefault('holiday_pages', {})
+    key = (kind, year, state)
+    calendar = get_holiday_calendar(year, state)
+    page = pages.get(key)
+    if page is None or page[0] is not calendar:
+        body = render().encode('utf-8')
+        page = pages[key] = (calendar, body, hashlib.sha256(body).hexdigest())
+    _, body, etag = page
+    
+    response = app.response_class(body, content_type=content_type)
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = app.config['HOLIDAY_CACHE_MAX_AGE']
+    return response.make_conditional(request)
 
 @app.route('/download/<calc_type>/<format>')
 def download_report(calc_type, format):
     """Download calculation reports"""
     if format != 'pdf':
         return "Invalid format", 400
+    if calc_type not in CALCULATION_TYPES:
+        return "Invalid calculation type", 400
+    
+    if request.args.get('async') == '1':
+        params = {key: value for key, value in request.args.items() if key != 'async'}
+        return _submit_job('report', {'calc_type': calc_type, 'params': params})
+    
+    with stage('calculate', calc_type):
+        data, result = prepare_report(calc_type, request.args)
+    from pdf_generator import generate_report
+    cache = _get_report_cache()
+    if cache is None:
+        pdf_buffer = generate_report(calc_type, data, result)
+        return send_file(pdf_buffer, as_attachment=True, download_name=f'{calc_type}_report.pdf', mimetype='application/pdf')
+    
+    # Cached reports are dated, not timestamped, so identical inputs give identical bytes
+    generated_on = date.today()
+    etag = report_cache_key(calc_type, data, rules_version(), generated_on)
+    if etag in request.if_none_match:
+        response = app.response_class(status=304)
+        response.set_etag(etag)
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response
+    
+    pdf_bytes = cache.get(etag)
+    if pdf_bytes is None:
+        pdf_bytes = generate_report(calc_type, data, result, generated_on=generated_on).getvalue()
+        cache.put(etag, pdf_bytes)
+    response = send_file(io.BytesIO(pdf_bytes), as_attachment=True, download_name=f'{calc_type}_report.pdf',
+                         mimetype='application/pdf', etag=etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+def _get_report_cache():
+    """Return the shared rendered-report cache, or None if it is disabled"""
+    if 'report_cache' not in app.extensions:
+        max_bytes = app.config['REPORT_CACHE_MAX_BYTES']
+        app.extensions['report_cache'] = ReportCache(
+            max_bytes=max_bytes,
+            directory=app.config['REPORT_CACHE_DIR'] or None,
+            max_disk_bytes=app.config['REPORT_CACHE_MAX_DISK_BYTES']
+        ) if max_bytes > 0 else None
+    return app.extensions['report_cache']
+
+@app.route('/download/bulk', methods=['POST'])
+def download_bulk_reports():
+    """Render statutory reports for a whole establishment and stream them as a ZIP"""
+    upload = request.files.get('file')
+    stream = upload.stream if upload else request.stream
+    filename = upload.filename if upload else ''
+    is_json = filename.lower().endswith('.json') or request.mimetype == 'application/json'
+    if request.args.get('async') == '1':
+        return _submit_bulk_reports_job(stream, is_json)
     
-    # Get data from session or request args
-    if calc_type == 'gratuity':
-        salary = float(request.args.get('salary', 0))
-        years = float(request.args.get('years', 0))
-        sector = request.args.get('sector', 'private')
-        data = {'salary': salary, 'years': years, 'sector': sector}
-        result = calculate_gratuity(salary, years, sector)
-    elif calc_type == 'pf':
-        basic = float(request.args.get('basic', 0))
-        da = float(request.args.get('da', 0))
-        sector = request.args.get('sector', 'private')
-        data = {'basic': basic, 'da': da, 'sector': sector}
-        result = calculate_pf_contribution(basic, da, sector)
-    elif calc_type == 'esi':
-        salary = float(request.args.get('salary', 0))
-        state = request.args.get('state', 'general')
-        data = {'salary': salary, 'state': state}
-        result = is_esi_applicable(salary, state)
-    elif calc_type == 'leave':
-        sector = request.args.get('sector', 'private')
-        if sector == 'government':
-            data = {'sector': sector}
-            result = calculate_leave_entitlement(0, '', '', 'government')
+    try:
+        if is_json:
+            rows = read_employee_json(stream)
         else:
-            days_worked = int(request.args.get('days_worked', 0))
-            state = request.args.get('state', 'general')
-            establishment_type = request.args.get('establishment_type', 'factory')
-            data = {'days_worked': days_worked, 'state': state, 'establishment_type': establishment_type, 'sector': sector}
-            result = calculate_leave_entitlement(days_worked, state, establishment_type, sector)
-    elif calc_type == 'nps':
-        basic = float(request.args.get('basic', 0))
-        da = float(request.args.get('da', 0))
-        employee_rate = int(request.args.get('employee_rate', 10))
-        data = {'basic': basic, 'da': da, 'employee_rate': employee_rate}
-        result = calculate_nps_contribution(basic, da, employee_rate)
-    elif calc_type == 'gpf':
-        basic = float(request.args.get('basic', 0))
-        da = float(request.args.get('da', 0))
-        data = {'basic': basic, 'da': da, 'sector': 'government'}
-        result = calculate_pf_contribution(basic, da, 'government')
-    elif calc_type == 'compliance':
-        state = request.args.get('state', '')
-        num_employees = int(request.args.get('num_employees', 0))
-        industry_type = request.args.get('industry_type', '')
-        checklist = generate_compliance_checklist(state, num_employees, industry_type)
-        pdf_buffer = generate_compliance_report(state, num_employees, industry_type, checklist)
-        return send_file(pdf_buffer, as_attachment=True, download_name=f'compliance_report.pdf', mimetype='application/pdf')
+            rows = read_employee_csv(stream)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    chunks = stream_reports_zip(
+        rows,
+        workers=app.config['BULK_REPORT_WORKERS'],
+        max_memory=app.config['BULK_REPORT_MAX_MEMORY']
+    )
+    return Response(stream_with_context(chunks), mimetype='application/zip',
+                    headers={'Content-Disposition': 'attachment; filename=statutory_reports.zip'})
+
+@app.route('/api/payroll/process', methods=['POST'])
+def api_process_payroll():
+    """Stream a payroll CSV/XLSX through the statutory calculators and return a CSV"""
+    from payroll_pipeline import PipelineProgress, process_payroll, read_csv_rows, read_xlsx_rows
+    try:
+        pay_period = as_pay_period(request.args.get('pay_period') or None)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    output_format = request.args.get('format', 'csv')
+    calc_type = request.args.get('calc_type', 'pf')
+    if output_format != 'csv':
+        from arrow_export import FORMATS, SCHEMAS
+        if output_format not in FORMATS:
+            return jsonify({'error': f'Invalid output format: {output_format}'}), 400
+        if calc_type not in SCHEMAS:
+            return jsonify({'error': f'Invalid calculation type: {calc_type}'}), 400
+    
+    upload = request.files.get('file')
+    if upload:
+        # Upload files are closed when the request ends, before the response has
+        # finished streaming, so spool the upload into a file we own
+        source = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+        shutil.copyfileobj(upload.stream, source)
+        source.seek(0)
     else:
-        return "Invalid calculation type", 400
+        source = request.stream
+    
+    if upload and upload.filename.lower().endswith('.xlsx'):
+        try:
+            rows = read_xlsx_rows(source)
+        except ValueError as e:
+            source.close()
+            return jsonify({'error': str(e)}), 400
+    else:
+        rows = read_csv_rows(source)
+    
+    def report(summary):
+        app.logger.info('Payroll pipeline: %(rows)d rows, %(errors)d errors, %(rows_per_sec).0f rows/sec', summary)
     
-    pdf_buffer = generate_calculation_report(calc_type, data, result)
-    return send_file(pdf_buffer, as_attachment=True, download_name=f'{calc_type}_report.pdf', mimetype='application/pdf')
+    if output_format != 'csv':
+        return _export_payroll(rows, source if upload else None, calc_type, output_format, pay_period)
+    
+    progress = PipelineProgress(report)
+    
+    def generate():
+        try:
+            yield from process_payroll(rows, progress=progress, pay_period=pay_period)
+        finally:
+            if upload:
+                source.close()
+        report(progress.summary())
+    
+    return Response(stream_with_context(generate()), mimetype='text/csv',
+                    headers={'Content-Disposition': 'attachment; filename=statutory_payroll.csv'})
 
 @app.route('/api/calculate', methods=['POST'])
 def api_calculate():
     """API endpoint for calculations"""
     data = request.get_json()
     calc_type = data.get('type')
+    if calc_type not in CALCULATION_TYPES:
+        return jsonify({'error': 'Invalid calculation type'}), 400
     
     try:
-        if calc_type == 'gratuity':
-            sector = data.get('sector', 'private')
-            result = calculate_gratuity(data['salary'], data['years'], sector)
-        elif calc_type == 'pf':
-            sector = data.get('sector', 'private')
-            result = calculate_pf_contribution(data['basic'], data.get('da', 0), sector)
-        elif calc_type == 'nps':
-            result = calculate_nps_contribution(data['basic'], data.get('da', 0), data.get('employee_rate', 10))
-        elif calc_type == 'esi':
-            result = is_esi_applicable(data['salary'], data.get('state', 'general'))
-        elif calc_type == 'leave':
-            sector = data.get('sector', 'private')
-            if sector == 'government':
-                result = calculate_leave_entitlement(0, '', '', 'government')
-            else:
-                result = calculate_leave_entitlement(
-                    data['days_worked'], 
-                    data.get('state', 'general'),
-                    data.get('establishment_type', 'factory'),
-                    sector
-                )
-        elif calc_type == 'compliance':
-            result = generate_compliance_checklist(
-                data['state'], 
-                data['num_employees'], 
-                data['industry_type']
-            )
-        elif calc_type == 'gpf':
-            result = calculate_pf_contribution(data['basic'], data.get('da', 0), 'government')
-        else:
-            return jsonify({'error': 'Invalid calculation type'}), 400
-        
+        result = run_calculation(data)
         return jsonify({'success': True, 'result': result})
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
+class BatchParseError(ValueError):
+    """Raised (or yielded per record) when batch input cannot be parsed"""
+
+def _iter_batch_records():
+    """Yield (index, record) pairs from a JSON array or NDJSON request body"""
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        # Read NDJSON line by line so large uploads are never held in memory
+        index = 0
+        for line in request.stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield index, json.loads(line)
+            except ValueError as e:
+                yield index, BatchParseError(f'Invalid JSON: {e}')
+            index += 1
+        return
+    
+    records = request.get_json(silent=True)
+    if not isinstance(records, list):
+        raise BatchParseError('Request body must be a JSON array or NDJSON')
+    yield from enumerate(records)
+
+@app.route('/api/calculate/batch', methods=['POST'])
+def api_calculate_batch():
+    """Batch API endpoint: streams one NDJSON result line per input record"""
+    if request.args.get('async') == '1':
+        records = request.get_json(silent=True)
+        if not isinstance(records, list):
+            return jsonify({'error': 'Request body must be a JSON array'}), 400
+        return _submit_job('batch', {'records': records})
+    
+    records = _iter_batch_records()
+    try:
+        first = next(records, None)
+    except BatchParseError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    def generate():
+        if first is None:
+            return
+        entries = _get_batch_executor().map(run_batch_record, itertools.chain([first], records))
+        for entry in entries:
+            yield json.dumps(entry) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+def _get_batch_executor():
+    """Return the shared batch executor, creating it on first use"""
+    executor = app.extensions.get('batch_executor')
+    if executor is None:
+        executor = BatchExecutor(
+            workers=app.config['BATCH_WORKERS'],
+            chunksize=app.config['BATCH_CHUNK_SIZE'],
+            min_parallel=app.config['BATCH_MIN_PARALLEL']
+        )
+        app.extensions['batch_executor'] = executor
+    return executor
+
+def _get_job_queue():
+    """Return the shared background job queue, starting its workers on first use"""
+    queue = app.extensions.get('job_queue')
+    if queue is None:
+        queue = JobQueue(
+            app.config['JOBS_DIR'],
+            JOB_HANDLERS,
+            workers=app.config['JOBS_WORKERS'],
+            max_attempts=app.config['JOBS_MAX_ATTEMPTS'],
+            retention_seconds=app.config['JOBS_RETENTION_SECONDS']
+        )
+        queue.start()
+        app.extensions['job_queue'] = queue
+    return queue
+
+@app.route('/api/returns', methods=['POST'])
+def api_statutory_returns():
+    """Generate the monthly EPF ECR and ESI files for an uploaded roster and return them as a ZIP"""
+    from statutory_returns import read_csv_rows, read_xlsx_rows, write_returns_zip
+    try:
+        pay_period = as_pay_period(request.args.get('pay_period') or None)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    upload = request.files.get('file')
+    stream = upload.stream if upload else request.stream
+    is_xlsx = bool(upload) and upload.filename.lower().endswith('.xlsx')
+    if request.args.get('async') == '1':
+        return _submit_job('returns', {'pay_period': pay_period.isoformat(), 'format': 'xlsx' if is_xlsx else 'csv'},
+                           input_stream=stream)
+    
+    output = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+    try:
+        rows = read_xlsx_rows(stream) if is_xlsx else read_csv_rows(stream)
+        summary = write_returns_zip(rows, output, pay_period)
+    except ValueError as e:
+        output.close()
+        return jsonify({'error': str(e)}), 400
+    app.logger.info('Statutory returns: %(rows)d rows, %(errors)d errors in %(seconds).1fs', summary)
+    output.seek(0)
+    return send_file(output, as_attachment=True, mimetype='application/zip',
+                     download_name=f"statutory_returns_{pay_period.strftime('%Y%m')}.zip")
+
+def _export_payroll(rows, source, calc_type, output_format, pay_period):
+    """Stream one calculation type's payroll results as an Arrow or Parquet file"""
+    from arrow_export import FORMATS, iter_export
+    extension, mimetype = FORMATS[output_format]
+    summary = {}
+    try:
+        chunks = iter_export(rows, calc_type, output_format, pay_period=pay_period, summary=summary)
+    except ValueError as e:
+        if source is not None:
+            source.close()
+        return jsonify({'error': str(e)}), 400
+    
+    def generate():
+        try:
+            yield from chunks
+        finally:
+            if source is not None:
+                source.close()
+        app.logger.info('Payroll export: %(rows)d rows, %(errors)d errors', summary)
+    
+    return Response(stream_with_context(generate()), mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename=statutory_{calc_type}.{extension}'})
+
+def _job_response(job, status=200):
+    job = dict(job, status_url=url_for('job_status', job_id=job['id']),
+               download_url=url_for('job_download', job_id=job['id']))
+    response = jsonify(job)
+    response.status_code = status
+    return response
+
+def _submit_job(kind, params, input_stream=None):
+    """Queue a background job and answer 202 Accepted with its status URL"""
+    queue = _get_job_queue()
+    job = queue.get(queue.submit(kind, params, input_stream))
+    response = _job_response(job, 202)
+    response.headers['Location'] = url_for('job_status', job_id=job['id'])
+    return response
+
+def _submit_bulk_reports_job(stream, is_json):
+    return _submit_job('bulk_reports', {
+        'format': 'json' if is_json else 'csv',
+        'workers': app.config['BULK_REPORT_WORKERS'],
+        'max_memory': app.config['BULK_REPORT_MAX_MEMORY']
+    }, input_stream=stream)
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """Queue a job: JSON {'kind': 'report' | 'batch', ...}, or a 'bulk_reports' file upload"""
+    upload = request.files.get('file')
+    if upload:
+        return _submit_bulk_reports_job(upload.stream, upload.filename.lower().endswith('.json'))
+    
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Request body must be a JSON object or a file upload'}), 400
+    kind = data.pop('kind', None)
+    if kind not in ('report', 'batch'):
+        return jsonify({'error': f'Invalid job kind: {kind}'}), 400
+    return _submit_job(kind, data)
+
+@app.route('/api/jobs/<job_id>')
+def job_status(job_id):
+    """Poll a job's status and progress"""
+    job = _get_job_queue().get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return _job_response(job)
+
+@app.route('/api/jobs/<job_id>/download')
+def job_download(job_id):
+    """Download a finished job's artifact"""
+    queue = _get_job_queue()
+    job = queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    artifact = queue.artifact(job_id)
+    if artifact is None:
+        return jsonify({'error': f"Job is {job['status']}", 'status': job['status']}), 409
+    path, filename, mimetype = artifact
+    return send_file(path, as_attachment=True, download_name=filename, mimetype=mimetype)
+
+@app.route('/api/rates')
+def api_rates():
+    """Statutory rates in force for a pay period (?pay_period=YYYY-MM or YYYY-MM-DD, default today)"""
+    try:
+        pay_period = as_pay_period(request.args.get('pay_period') or None)
+        rates = rates_on(pay_period)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    missing = [name for name in REQUIRED_RATES if name not in rates]
+    if missing:
+        return jsonify({'error': f"No {', '.join(missing)} in force on {pay_period.isoformat()}"}), 400
+    return jsonify({'rules_version': rules_version(), 'pay_period': pay_period.isoformat(), 'rates': dict(rates)})
+
+@app.route('/api/cache/stats')
+def cache_stats():
+    """Hit/miss/eviction counters for the calculator memoization and report caches"""
+    report_cache = _get_report_cache()
+    return jsonify({
+        'memoization': memoization_stats(),
+        'report_cache': report_cache.stats() if report_cache else None
+    })
+
+# Heavy modules (ReportLab, NumPy) that views import on first use
+LAZY_MODULES = (
+    'pdf_generator', 'payroll_pipeline', 'batch_engine',
+    'arrow_export',  # Arrow/Parquet payroll output
+    'statutory_returns',  # /api/returns
+    'compliance_portfolio'  # /api/compliance/portfolio
+)
+
+# One report of each type, rendered by warm_up() to load ReportLab's lazily imported modules and fonts
+WARM_UP_REPORTS = (
+    ('gratuity', {'salary': 50000, 'years': 10}),
+    ('pf', {'basic': 25000, 'da': 5000}),
+    ('gpf', {'basic': 56100, 'da': 2000}),
+    ('nps', {'basic': 56100, 'da': 2000}),
+    ('esi', {'salary': 15000}),
+    ('leave', {'days_worked': 240}),
+    ('compliance', {'state': 'Maharashtra', 'num_employees': 25, 'industry_type': 'Factory'})
+)
+
+def warm_up():
+    """
+    Load everything the first requests would otherwise load lazily
+
+    Importing app stays light: the PDF generator, the NumPy-based modules and
+    the holiday summaries load on first use. wsgi.py calls this in the
+    server's master process before it forks the workers, so imported modules,
+    compiled templates and parsed data are shared copy-on-write instead of
+    being rebuilt by every worker.
+
+    Returns:
+        dict: What was warmed and the seconds it took
+    """
+    started = time.perf_counter()
+    for module in LAZY_MODULES:
+        importlib.import_module(module)
+    from arrow_export import _pyarrow
+    from pdf_generator import generate_report
+    # pyarrow is optional: load it now if it is installed
+    try:
+        _pyarrow()
+    except ValueError:
+        pass
+    rates_on()
+    # Holiday data only changes with the data files, so parse and summarize it once
+    warm_holiday_cache()
+    templates = app.jinja_env.list_templates()
+    for name in templates:
+        app.jinja_env.get_template(name)
+    for calc_type, params in WARM_UP_REPORTS:
+        data, result = prepare_report(calc_type, params)
+        generate_report(calc_type, data, result, generated_on=date.today())
+    # Calculator pages are the same for every visitor: fill the page cache before the fork
+    pages = [endpoint for endpoint, options in ROUTE_RESPONSE_OPTIONS.items() if options.get('page_cache')]
+    client = app.test_client()
+    for endpoint in pages:
+        with app.test_request_context():
+            url = url_for(endpoint)
+        client.get(url)
+    app.extensions['warm_up'] = {
+        'templates': len(templates),
+        'reports': len(WARM_UP_REPORTS),
+        'pages': len(pages),
+        'seconds': round(time.perf_counter() - started, 3)
+    }
+    return app.extensions['warm_up']
+
+@app.route('/healthz')
+def healthz():
+    """Liveness: the process is serving requests"""
+    return jsonify({'status': 'ok'})
+
+@app.route('/readyz')
+def readyz():
+    """Readiness: warm-up has finished, so requests will not pay for cold imports"""
+    warmed = app.extensions.get('warm_up')
+    if warmed is None:
+        return jsonify({'status': 'warming up'}), 503
+    return jsonify({'status': 'ready', 'rules_version': rules_version(), 'warm_up': warmed})
+
 if __name__ == '__main__':
+    warm_up()
     print("Starting Flask app on http://localhost:5000")
     app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
@@ -0,0 +1,275 @@
+"""
+Columnar Export for Indian Labor Law Compliance System
+Batch results as Apache Arrow (IPC file) or Parquet, one table per calculation type
+
+Each calculation type has a fixed schema (SCHEMAS), so files from different
+runs can be appended to the same warehouse table. The leading columns identify
+the payroll row; the rest are the batch engine's result arrays. Float columns
+are handed to Arrow without copying: the Arrow buffers point at the NumPy
+arrays, and NaN ("not applicable", e.g. PF columns of government rows) becomes
+a null through a validity bitmap. Boolean columns are bit-packed, which is the
+only conversion.
+
+Arrow files are written uncompressed so that open_arrow() can memory-map them:
+another process on the same machine reads the columns straight from the page
+cache without parsing or copying.
+
+pyarrow is an optional dependency, needed only here.
+"""
+
+import numpy as np
+
+from payroll_pipeline import compute_chunks, validate_rows
+from rates import as_pay_period, rules_version
+
+# Bump when a column is added, removed, renamed or changes type
+SCHEMA_VERSION = '1'
+
+# Columns every table starts with: payroll row number, employee ID and sector
+KEY_COLUMNS = [('row', 'int64'), ('employee_id', 'string'), ('sector', 'string')]
+
+SCHEMAS = {
+    'pf': KEY_COLUMNS + [
+        ('is_government', 'bool_'),
+        ('pf_eligible_salary', 'float64'),
+        ('employee_contribution', 'float64'),
+        ('employer_epf_contribution', 'float64'),
+        ('employer_eps_contribution', 'float64'),
+        ('total_employer_contribution', 'float64'),
+        ('total_monthly_pf', 'float64'),
+        ('basic_salary', 'float64'),
+        ('min_gpf_contribution', 'float64'),
+        ('max_gpf_contribution', 'float64'),
+        ('recommended_contribution', 'float64')
+    ],
+    'esi': KEY_COLUMNS + [
+        ('eligible', 'bool_'),
+        ('employee_contribution', 'float64'),
+        ('employer_contribution', 'float64'),
+        ('total_contribution', 'float64'),
+        ('wage_limit', 'float64')
+    ],
+    'nps': KEY_COLUMNS + [
+        ('nps_eligible_salary', 'float64'),
+        ('employee_contribution', 'float64'),
+        ('employer_contribution', 'float64'),
+        ('total_contribution', 'float64'),
+        ('employee_rate', 'float64'),
+        ('employer_rate', 'float64')
+    ],
+    'gratuity': KEY_COLUMNS + [
+        ('years_of_service', 'float64'),
+        ('eligible', 'bool_'),
+        ('gratuity_amount', 'float64'),
+        ('capped_at_maximum', 'bool_'),
+        ('is_government', 'bool_')
+    ]
+}
+
+FORMATS = {
+    'arrow': ('arrow', 'application/vnd.apache.arrow.file'),
+    'parquet': ('parquet', 'application/vnd.apache.parquet')
+}
+
+# Rows per record batch (and Parquet row group)
+EXPORT_CHUNK_SIZE = 65536
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise ValueError('Arrow and Parquet output requires the pyarrow package')
+    return pyarrow
+
+def arrow_schema(calc_type, pay_period=None):
+    """
+    Arrow schema of a calculation type's table
+
+    Args:
+        calc_type: 'pf', 'esi', 'nps' or 'gratuity'
+        pay_period: Pay period recorded in the schema metadata (default: today)
+
+    Returns:
+        pyarrow.Schema: With 'calc_type', 'schema_version', 'rules_version' and
+                        'pay_period' metadata
+    """
+    pa = _pyarrow()
+    if calc_type not in SCHEMAS:
+        raise ValueError(f'Invalid calculation type: {calc_type}')
+    fields = [pa.field(name, getattr(pa, kind)(), nullable=name not in ('row', 'sector'))
+              for name, kind in SCHEMAS[calc_type]]
+    return pa.schema(fields, metadata={
+        'calc_type': calc_type,
+        'schema_version': SCHEMA_VERSION,
+        'rules_version': rules_version(),
+        'pay_period': as_pay_period(pay_period).isoformat()
+    })
+
+def record_batch(schema, employees, results):
+    """
+    Build one record batch from a chunk of batch engine results
+
+    Args:
+        schema: arrow_schema() of the calculation type
+        employees: [(row_number, employee)] as yielded by compute_chunks
+        results: calculate_batch() output for those employees
+
+    Returns:
+        pyarrow.RecordBatch
+    """
+    pa = _pyarrow()
+    calc_type = schema.metadata[b'calc_type'].decode()
+    columns = results[calc_type]
+    arrays = [
+        pa.array([number for number, _ in employees], pa.int64()),
+        pa.array([employee['employee_id'] or None for _, employee in employees], pa.string()),
+        pa.array([employee['sector'] for _, employee in employees], pa.string())
+    ]
+    for field in list(schema)[len(KEY_COLUMNS):]:
+        if field.name == 'years_of_service':
+            arrays.append(pa.array([employee['years'] for _, employee in employees], pa.float64()))
+        elif field.type == pa.bool_():
+            arrays.append(pa.array(np.asarray(columns[field.name], dtype=bool)))
+        else:
+            # No copy for C-contiguous float64 arrays; NaN becomes null
+            values = np.ascontiguousarray(columns[field.name], dtype=np.float64)
+            arrays.append(pa.array(values, pa.float64(), from_pandas=True))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+def iter_record_batches(rows, calc_type, chunk_size=EXPORT_CHUNK_SIZE, pay_period=None, summary=None,
+                        progress=None):
+    """
+    Validate and compute raw payroll rows into record batches
+
+    Rows that fail validation are skipped (the 'row' column keeps the original
+    row numbers); they are counted in summary['errors'].
+
+    Args:
+        rows: Iterable of raw row dicts (from read_csv_rows / read_xlsx_rows)
+        calc_type: 'pf', 'esi', 'nps' or 'gratuity'
+        chunk_size: Rows per record batch
+        pay_period: Month of the payroll, for the rates in force (default: today)
+        summary: Optional dict updated with 'rows' and 'errors' counts
+        progress: Optional payroll_pipeline.PipelineProgress, given every row read
+
+    Returns:
+        iterator: pyarrow.RecordBatch
+    """
+    schema = arrow_schema(calc_type, pay_period)
+    summary = {} if summary is None else summary
+    summary.update(rows=0, errors=0)
+    for chunk, employees, results in compute_chunks(validate_rows(rows), chunk_size, pay_period):
+        summary['rows'] += len(employees)
+        summary['errors'] += len(chunk) - len(employees)
+        if progress is not None:
+            progress.add(len(chunk), len(chunk) - len(employees))
+        if employees:
+            yield record_batch(schema, employees, results)
+
+def _writer(format, sink, schema):
+    pa = _pyarrow()
+    if format == 'arrow':
+        return pa.ipc.new_file(sink, schema)
+    if format == 'parquet':
+        return pa.parquet.ParquetWriter(sink, schema, compression='zstd')
+    raise ValueError(f'Invalid output format: {format}')
+
+def write_export(rows, output, calc_type, format='parquet', chunk_size=EXPORT_CHUNK_SIZE, pay_period=None,
+                 progress=None):
+    """
+    Compute raw payroll rows and write one calculation type's results to a file
+
+    Args:
+        rows: Iterable of raw row dicts
+        output: Path or writable binary file object
+        calc_type: 'pf', 'esi', 'nps' or 'gratuity'
+        format: 'parquet' or 'arrow' (Arrow IPC file, memory-mappable)
+        chunk_size: Rows per record batch / row group
+        pay_period: Month of the payroll (default: today)
+        progress: Optional PipelineProgress
+
+    Returns:
+        dict: {'rows': rows written, 'errors': rows skipped}
+    """
+    summary = {}
+    schema = arrow_schema(calc_type, pay_period)
+    writer = _writer(format, output, schema)
+    try:
+        for batch in iter_record_batches(rows, calc_type, chunk_size, pay_period, summary, progress):
+            writer.write_batch(batch)
+    finally:
+        writer.close()
+    return summary
+
+class _ChunkSink:
+    """Write-only file object that collects bytes until drained"""
+
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def writable(self):
+        return True
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self.parts)
+        self.parts = []
+        return data
+
+def iter_export(rows, calc_type, format='parquet', chunk_size=EXPORT_CHUNK_SIZE, pay_period=None, summary=None):
+    """
+    Like write_export(), but yields the file's bytes as each batch is written (for HTTP streaming)
+
+    Returns:
+        iterator: bytes chunks
+
+    Raises:
+        ValueError: Straight away (not on first iteration) if pyarrow is missing
+                    or the calculation type or format is invalid
+    """
+    pa = _pyarrow()
+    sink = _ChunkSink()
+    writer = _writer(format, pa.PythonFile(sink, mode='w'), arrow_schema(calc_type, pay_period))
+    batches = iter_record_batches(rows, calc_type, chunk_size, pay_period, summary)
+    return _drain_batches(writer, sink, batches)
+
+def _drain_batches(writer, sink, batches):
+    for batch in batches:
+        writer.write_batch(batch)
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+def open_arrow(path):
+    """
+    Memory-map an Arrow IPC file written by write_export()
+
+    The returned table's buffers are views of the mapped file, so nothing is
+    read or copied until a column is used.
+
+    Args:
+        path: Arrow file path
+
+    Returns:
+        pyarrow.Table
+    """
+    pa = _pyarrow()
+    with pa.memory_map(path, 'r') as source:
+        return pa.ipc.open_file(source).read_all()
@@ -0,0 +1,364 @@
+"""
+Vectorized Batch Engine for Indian Labor Law Compliance System
+Computes PF/EPS, ESI, NPS and Gratuity for whole payrolls using NumPy columns.
+
+The scalar functions in core_calculators remain the reference implementation;
+every batch function here reproduces their arithmetic (same operation order,
+same rounding) so that row i of a batch result equals the scalar result for
+employee i.
+"""
+
+import numpy as np
+
+from rates import rates_on
+from results import ESIResult, GPFResult, GratuityResult, NPSResult, PFResult
+
+# Reason and note texts of the scalar calculators, shared by every batch row
+GRATUITY_PRIVATE_REASON = 'Minimum 5 years of service required'
+GRATUITY_GOVERNMENT_REASON = 'Minimum 10 years of qualifying service required for government employees'
+GRATUITY_GOVERNMENT_NOTE = 'No maximum limit for government employees'
+GPF_NOTE = 'GPF contribution is voluntary, minimum 6% of basic pay'
+ESI_LIMIT_REASON = 'Monthly salary exceeds ESI limit of Rs. {}'
+
+def column(values, dtype=float):
+    """Convert a scalar or sequence into a 1-D NumPy array"""
+    return np.atleast_1d(np.asarray(values, dtype=dtype))
+
+def broadcast(size, *columns):
+    """Broadcast all columns to the same length"""
+    return [np.broadcast_to(values, (size,)) for values in columns]
+
+def round_currency(values):
+    """
+    Round an array to 2 decimals exactly like Python's built-in round(x, 2)
+
+    np.round scales by 100 and rounds the binary product, while round() rounds
+    the exact decimal value of the float. They can only disagree when the
+    scaled value sits on (or within float error of) a .5 boundary, so those
+    few elements are re-rounded with round() itself.
+
+    Args:
+        values: Array of floats
+
+    Returns:
+        numpy.ndarray: Rounded values
+    """
+    values = np.asarray(values, dtype=float)
+    rounded = np.round(values, 2)
+    scaled = values * 100
+    distance = np.abs(scaled - np.floor(scaled) - 0.5)
+    tolerance = np.maximum(1e-9, np.abs(scaled) * 4 * np.finfo(float).eps)
+    for i in np.flatnonzero(distance <= tolerance):
+        rounded.flat[i] = round(float(values.flat[i]), 2)
+    return rounded
+
+def batch_gratuity(last_drawn_salary, years_of_service, sector='private', pay_period=None):
+    """
+    Vectorized equivalent of calculate_gratuity
+
+    Args:
+        last_drawn_salary: Array of last drawn salaries
+        years_of_service: Array of years of service
+        sector: Array (or single value) of 'private' / 'government'
+        pay_period: Date for the gratuity cap in force (default: today)
+
+    Returns:
+        dict: Arrays 'eligible', 'gratuity_amount', 'capped_at_maximum',
+              'is_government'
+    """
+    salary = column(last_drawn_salary)
+    years = column(years_of_service)
+    size = max(len(salary), len(years), np.size(sector))
+    salary, years = broadcast(size, salary, years)
+    is_government = broadcast(size, column(sector, dtype=object) == 'government')[0]
+
+    # Private: (Last Drawn Salary / 26) * 15 * Years, capped (Rs. 20 lakhs since 2018)
+    max_gratuity = rates_on(pay_period)['gratuity_cap']
+    private_amount = np.minimum((salary / 26) * 15 * years, max_gratuity)
+    # Government: (Basic Pay * Years * 15) / 26, no maximum limit
+    government_amount = (salary * years * 15) / 26
+
+    eligible = np.where(is_government, years >= 10, years >= 5)
+    amount = np.where(is_government, government_amount, private_amount)
+    amount = np.where(eligible, amount, 0.0)
+
+    return {
+        'eligible': eligible,
+        'gratuity_amount': round_currency(amount),
+        'capped_at_maximum': eligible & ~is_government & (amount == max_gratuity),
+        'is_government': is_government
+    }
+
+def batch_pf_contribution(basic_salary, da=0, sector='private', employee_contribution_rate=12, employer_contribution_rate=12,
+                          pay_period=None):
+    """
+    Vectorized equivalent of calculate_pf_contribution
+
+    Private rows get the EPF/EPS split, government rows get the GPF options.
+    Columns that do not apply to a row are NaN.
+
+    Args:
+        basic_salary: Array of basic salaries
+        da: Array (or single value) of dearness allowance
+        sector: Array (or single value) of 'private' / 'government'
+        employee_contribution_rate: Employee contribution percentage
+        employer_contribution_rate: Employer contribution percentage
+        pay_period: Month of the wages, for the ceiling and EPS rate in force (default: today)
+
+    Returns:
+        dict: Arrays keyed like the scalar PF and GPF result dicts
+    """
+    basic = column(basic_salary)
+    da = column(da)
+    size = max(len(basic), len(da), np.size(sector),
+               np.size(employee_contribution_rate), np.size(employer_contribution_rate))
+    basic, da, employee_rate, employer_rate = broadcast(
+        size, basic, da, column(employee_contribution_rate), column(employer_contribution_rate))
+    is_government = broadcast(size, column(sector, dtype=object) == 'government')[0]
+
+    rates = rates_on(pay_period)
+
+    # PF is calculated on Basic + DA, capped at the wage ceiling
+    pf_eligible_salary = np.minimum(basic + da, rates['pf_wage_ceiling'])
+    employee_contribution = (pf_eligible_salary * employee_rate) / 100
+    employer_contribution = (pf_eligible_salary * employer_rate) / 100
+
+    # Employer contribution split: 8.33% to EPS, 3.67% to EPF
+    eps_contribution = (pf_eligible_salary * rates['eps_rate']) / 100
+    epf_contribution = employer_contribution - eps_contribution
+
+    def private(values):
+        return np.where(is_government, np.nan, values)
+
+    def government(values):
+        return np.where(is_government, values, np.nan)
+
+    return {
+        'pf_eligible_salary': private(pf_eligible_salary),
+        'employee_contribution': private(round_currency(employee_contribution)),
+        'employer_epf_contribution': private(round_currency(epf_contribution)),
+        'employer_eps_contribution': private(round_currency(eps_contribution)),
+        'total_employer_contribution': private(round_currency(employer_contribution)),
+        'total_monthly_pf': private(round_currency(employee_contribution + employer_contribution)),
+        # GPF: minimum 6% of basic pay, up to full basic pay
+        'basic_salary': government(basic),
+        'min_gpf_contribution': government(round_currency((basic * 6) / 100)),
+        'max_gpf_contribution': government(round_currency(basic)),
+        'recommended_contribution': government(round_currency((basic * 12) / 100)),
+        'is_government': is_government
+    }
+
+def batch_nps_contribution(basic_salary, da=0, employee_rate=10, employer_rate=None, pay_period=None):
+    """
+    Vectorized equivalent of calculate_nps_contribution
+
+    Args:
+        basic_salary: Array of basic pay
+        da: Array (or single value) of dearness allowance
+        employee_rate: Employee contribution rate(s)
+        employer_rate: Government contribution rate(s) (default: the rate in force)
+        pay_period: Month of the wages (default: today)
+
+    Returns:
+        dict: Arrays keyed like the scalar NPS result dict
+    """
+    if employer_rate is None:
+        employer_rate = rates_on(pay_period)['nps_employer_rate']
+    basic = column(basic_salary)
+    da = column(da)
+    size = max(len(basic), len(da), np.size(employee_rate), np.size(employer_rate))
+    basic, da, employee_rate, employer_rate = broadcast(
+        size, basic, da, column(employee_rate), column(employer_rate))
+
+    nps_eligible_salary = basic + da
+    employee_contribution = (nps_eligible_salary * employee_rate) / 100
+    employer_contribution = (nps_eligible_salary * employer_rate) / 100
+
+    return {
+        'nps_eligible_salary': nps_eligible_salary,
+        'employee_contribution': round_currency(employee_contribution),
+        'employer_contribution': round_currency(employer_contribution),
+        'total_contribution': round_currency(employee_contribution + employer_contribution),
+        'employee_rate': employee_rate,
+        'employer_rate': employer_rate
+    }
+
+def batch_esi_applicable(monthly_salary, state='general', pay_period=None):
+    """
+    Vectorized equivalent of is_esi_applicable
+
+    Args:
+        monthly_salary: Array of monthly salaries
+        state: Accepted for parity with the scalar function (not used)
+        pay_period: Month of the wages, for the limit and rates in force (default: today)
+
+    Returns:
+        dict: Arrays 'eligible', 'employee_contribution', 'employer_contribution',
+              'total_contribution' (NaN where not eligible), 'wage_limit'
+    """
+    salary = column(monthly_salary)
+    rates = rates_on(pay_period)
+
+    # ESI wage limit: Rs. 21,000 per month; Employee 0.75%, Employer 3.25% (since July 2019)
+    eligible = salary <= rates['esi_wage_limit']
+    employee_contribution = (salary * rates['esi_employee_rate']) / 100
+    employer_contribution = (salary * rates['esi_employer_rate']) / 100
+
+    return {
+        'eligible': eligible,
+        'employee_contribution': np.where(eligible, round_currency(employee_contribution), 0.0),
+        'employer_contribution': np.where(eligible, round_currency(employer_contribution), 0.0),
+        'total_contribution': np.where(eligible, round_currency(employee_contribution + employer_contribution), np.nan),
+        'wage_limit': np.full(salary.shape, rates['esi_wage_limit'])
+    }
+
+def calculate_batch(basic, da=0, salary=None, sector='private', state='general', years_of_service=None,
+                    nps_employee_rate=10, pay_period=None):
+    """
+    Compute PF/EPS, ESI, NPS and (optionally) gratuity for a whole payroll
+
+    Args:
+        basic: Array of basic salaries
+        da: Array (or single value) of dearness allowance
+        salary: Array of monthly gross salaries for ESI and last drawn salary
+                for gratuity (defaults to basic + DA)
+        sector: Array (or single value) of 'private' / 'government'
+        state: Array (or single value) of states
+        years_of_service: Array of years of service; gratuity is skipped if None
+        nps_employee_rate: NPS employee contribution rate(s)
+        pay_period: Month of the wages, for the rates in force (default: today)
+
+    Returns:
+        dict: {'pf': {...}, 'esi': {...}, 'nps': {...}, 'gratuity': {...}} of arrays
+    """
+    basic = column(basic)
+    da = broadcast(len(basic), column(da))[0]
+    salary = basic + da if salary is None else column(salary)
+
+    results = {
+        'pf': batch_pf_contribution(basic, da, sector, pay_period=pay_period),
+        'esi': batch_esi_applicable(salary, state, pay_period=pay_period),
+        'nps': batch_nps_contribution(basic, da, nps_employee_rate, pay_period=pay_period)
+    }
+    if years_of_service is not None:
+        results['gratuity'] = batch_gratuity(salary, years_of_service, sector, pay_period=pay_period)
+    return results
+
+def result_row(calc_type, columns, index):
+    """
+    Rebuild the scalar-equivalent result dict for one row of a batch result
+
+    Args:
+        calc_type: 'pf', 'esi', 'nps' or 'gratuity'
+        columns: Batch result dict for that calc type
+        index: Row index
+
+    Returns:
+        dict: Same keys and values as the matching core_calculators function
+    """
+    def value(key):
+        return columns[key][index].item()
+
+    if calc_type == 'gratuity':
+        sector = 'government' if value('is_government') else 'private'
+        if not value('eligible'):
+            reason = GRATUITY_GOVERNMENT_REASON if sector == 'government' else GRATUITY_PRIVATE_REASON
+            return {'eligible': False, 'gratuity_amount': 0, 'reason': reason, 'sector': sector}
+        row = {'eligible': True, 'gratuity_amount': value('gratuity_amount')}
+        if sector == 'government':
+            row.update({'sector': sector, 'note': GRATUITY_GOVERNMENT_NOTE})
+        else:
+            row.update({'capped_at_maximum': value('capped_at_maximum'), 'sector': sector})
+        return row
+
+    if calc_type == 'pf':
+        if value('is_government'):
+            keys = ['basic_salary', 'min_gpf_contribution', 'max_gpf_contribution', 'recommended_contribution']
+            row = {key: value(key) for key in keys}
+            row.update({'sector': 'government', 'note': GPF_NOTE})
+            return row
+        keys = ['pf_eligible_salary', 'employee_contribution', 'employer_epf_contribution',
+                'employer_eps_contribution', 'total_employer_contribution', 'total_monthly_pf']
+        row = {key: value(key) for key in keys}
+        row['sector'] = 'private'
+        return row
+
+    if calc_type == 'esi':
+        if not value('eligible'):
+            return {
+                'eligible': False,
+                'reason': ESI_LIMIT_REASON.format(value('wage_limit')),
+                'employee_contribution': 0,
+                'employer_contribution': 0
+            }
+        keys = ['employee_contribution', 'employer_contribution', 'total_contribution']
+        row = {'eligible': True}
+        row.update({key: value(key) for key in keys})
+        return row
+
+    if calc_type == 'nps':
+        keys = ['nps_eligible_salary', 'employee_contribution', 'employer_contribution',
+                'total_contribution', 'employee_rate', 'employer_rate']
+        row = {key: value(key) for key in keys}
+        row['sector'] = 'government'
+        return row
+
+    raise ValueError(f'Unsupported batch calculation type: {calc_type}')
+
+def to_records(calc_type, columns):
+    """
+    Convert a batch result into a list of compact result records
+
+    Records share the note/reason strings instead of copying them per row,
+    and take far less memory than one dict per employee (see results.py).
+
+    Args:
+        calc_type: 'pf', 'esi', 'nps' or 'gratuity'
+        columns: Batch result dict for that calc type
+
+    Returns:
+        list: One record per row; record.to_dict() equals the scalar result
+    """
+    def lists(*keys):
+        return zip(*(columns[key].tolist() for key in keys))
+
+    if calc_type == 'gratuity':
+        records = []
+        for eligible, amount, capped, is_government in lists(
+                'eligible', 'gratuity_amount', 'capped_at_maximum', 'is_government'):
+            if not eligible:
+                records.append(GratuityResult(
+                    False, 0,
+                    reason=GRATUITY_GOVERNMENT_REASON if is_government else GRATUITY_PRIVATE_REASON,
+                    sector='government' if is_government else 'private'))
+            elif is_government:
+                records.append(GratuityResult(True, amount, sector='government', note=GRATUITY_GOVERNMENT_NOTE))
+            else:
+                records.append(GratuityResult(True, amount, capped_at_maximum=capped))
+        return records
+
+    if calc_type == 'pf':
+        records = []
+        for row in lists('is_government', 'pf_eligible_salary', 'employee_contribution',
+                         'employer_epf_contribution', 'employer_eps_contribution',
+                         'total_employer_contribution', 'total_monthly_pf', 'basic_salary',
+                         'min_gpf_contribution', 'max_gpf_contribution', 'recommended_contribution'):
+            if row[0]:
+                records.append(GPFResult(*row[7:], note=GPF_NOTE))
+            else:
+                records.append(PFResult(*row[1:7]))
+        return records
+
+    if calc_type == 'esi':
+        reasons = {limit: ESI_LIMIT_REASON.format(limit) for limit in set(columns['wage_limit'].tolist())}
+        return [ESIResult(True, None, employee, employer, total) if eligible
+                else ESIResult(False, reasons[limit])
+                for eligible, employee, employer, total, limit in lists(
+                    'eligible', 'employee_contribution', 'employer_contribution', 'total_contribution', 'wage_limit')]
+
+    if calc_type == 'nps':
+        return [NPSResult(*row) for row in lists(
+            'nps_eligible_salary', 'employee_contribution', 'employer_contribution',
+            'total_contribution', 'employee_rate', 'employer_rate')]
+
+    raise ValueError(f'Unsupported batch calculation type: {calc_type}')
@@ -0,0 +1,70 @@
+"""
+Import-Time Benchmark for StatutoryCalc
+Measures cold import time with `python -X importtime` against a budget, and
+checks that headless entry points do not pull in the heavy dependencies
+
+Usage:
+    python benchmarks/bench_import_time.py [--repeat 5] [--scale 1.0]
+
+Each module is imported in fresh interpreters; the median cumulative import
+time is compared with its budget (multiplied by --scale for slower machines).
+Exits with status 1 if a budget is exceeded or a forbidden module is loaded.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# module: (budget in milliseconds, top-level packages it must not import)
+BUDGETS = {
+    # Process-pool workers and CLI batch jobs
+    'core_calculators': (50, ('flask', 'werkzeug', 'jinja2', 'reportlab', 'numpy')),
+    'calculations': (60, ('flask', 'werkzeug', 'jinja2', 'reportlab', 'numpy')),
+    'parallel': (80, ('flask', 'werkzeug', 'jinja2', 'reportlab', 'numpy')),
+    # Vectorized engine: NumPy, but no web or PDF stack
+    'batch_engine': (250, ('flask', 'reportlab')),
+    # Web application: ReportLab and NumPy load on first use (or in warm_up())
+    'app': (350, ('reportlab', 'numpy')),
+}
+
+def import_time_ms(module):
+    """Cumulative import time of a module in a fresh interpreter, in milliseconds"""
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                               cwd=ROOT, capture_output=True, text=True, check=True)
+    for line in reversed(completed.stderr.splitlines()):
+        parts = [part.strip() for part in line.split('|')]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1000
+    raise RuntimeError(f'No import time reported for {module}')
+
+def loaded_packages(module, packages):
+    """Which of the given top-level packages are imported along with a module"""
+    code = (f'import json, sys, {module}; '
+            f'print(json.dumps(sorted({{name.split(".")[0] for name in sys.modules}} & set({list(packages)!r}))))')
+    completed = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='Fresh interpreters per module')
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiply every budget by this factor')
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'module':<18}{'median ms':>11}{'budget ms':>11}  heavy imports")
+    for module, (budget, forbidden) in BUDGETS.items():
+        median = statistics.median(import_time_ms(module) for _ in range(args.repeat))
+        loaded = loaded_packages(module, forbidden)
+        over = median > budget * args.scale
+        failed = failed or over or bool(loaded)
+        print(f"{module:<18}{median:>11.1f}{budget * args.scale:>11.0f}  "
+              f"{', '.join(loaded) or '-'}{'  OVER BUDGET' if over else ''}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Parallel Scaling Benchmark for StatutoryCalc
+Throughput of the batch executor with 1, 2, 4 and 8 worker processes
+
+Usage:
+    python benchmarks/bench_parallel_scaling.py [--records 200000] [--workers 1 2 4 8]
+
+Speedup is bounded by the number of CPUs on the host (os.cpu_count() is printed);
+worker counts above it only add scheduling overhead.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculations import run_batch_record
+from parallel import BatchExecutor, DEFAULT_CHUNK_SIZE
+
+STATES = ['maharashtra', 'karnataka', 'tamil nadu', 'assam', 'general']
+INDUSTRIES = ['factory', 'it', 'services', 'retail']
+
+def make_records(count, seed=1):
+    """A mixed batch weighted towards the pure-Python compliance and leave calculators"""
+    rng = random.Random(seed)
+    records = []
+    for index in range(count):
+        kind = rng.random()
+        if kind < 0.35:
+            record = {'type': 'compliance', 'state': rng.choice(STATES),
+                      'num_employees': rng.randint(1, 500), 'industry_type': rng.choice(INDUSTRIES)}
+        elif kind < 0.65:
+            record = {'type': 'leave', 'days_worked': rng.randint(100, 300), 'state': rng.choice(STATES),
+                      'establishment_type': rng.choice(['factory', 'shop'])}
+        elif kind < 0.8:
+            record = {'type': 'pf', 'basic': rng.randint(8000, 90000), 'da': rng.randint(0, 15000)}
+        elif kind < 0.9:
+            record = {'type': 'esi', 'salary': rng.randint(8000, 40000)}
+        else:
+            record = {'type': 'gratuity', 'salary': rng.randint(15000, 150000), 'years': rng.randint(0, 35)}
+        records.append((index, record))
+    return records
+
+def run(records, workers, chunksize):
+    """Return records/sec for one pass (pool startup excluded via a warm-up batch)"""
+    executor = BatchExecutor(workers=workers, chunksize=chunksize, min_parallel=1)
+    try:
+        list(executor.map(run_batch_record, records[:workers * chunksize]))
+        started = time.perf_counter()
+        count = sum(1 for _ in executor.map(run_batch_record, records))
+        return count / (time.perf_counter() - started)
+    finally:
+        executor.shutdown()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--records', type=int, default=200000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    records = make_records(args.records)
+    print(f"{args.records:,} records, chunksize {args.chunksize}, {os.cpu_count()} CPUs")
+    print(f"{'workers':<10}{'records/sec':>14}{'speedup':>10}")
+    baseline = None
+    for workers in args.workers:
+        throughput = run(records, workers, args.chunksize)
+        baseline = baseline or throughput
+        print(f"{workers:<10}{throughput:>14,.0f}{throughput / baseline:>9.2f}x")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
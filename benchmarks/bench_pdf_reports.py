@@ -0,0 +1,113 @@
+"""
+PDF Report Rendering Benchmark for StatutoryCalc
+Measures per-report render time and memory allocations for every report type
+
+Usage:
+    python benchmarks/bench_pdf_reports.py [--repeat 50]
+    python benchmarks/bench_pdf_reports.py --json pdf.json            # results for run_benchmarks.py --baseline
+    python benchmarks/bench_pdf_reports.py --baseline-rev c5a6945^    # compare with an earlier commit
+
+--baseline-rev checks the given git revision out into a temporary worktree,
+runs this same benchmark against that code in a subprocess, and prints both
+runs side by side. c5a6945^ is the code from before the report styles were
+built once per process.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, REPO_DIR)
+
+from harness import compare, load_results, measure, print_comparison, save_results
+
+REPORT_PARAMS = {
+    'gratuity': {'salary': '50000', 'years': '12', 'sector': 'private'},
+    'pf': {'basic': '25000', 'da': '5000', 'sector': 'private'},
+    'gpf': {'basic': '40000', 'da': '8000'},
+    'nps': {'basic': '45000', 'da': '8000', 'employee_rate': '10'},
+    'esi': {'salary': '18000', 'state': 'general'},
+    'leave': {'days_worked': '300', 'state': 'maharashtra', 'establishment_type': 'factory'},
+    'compliance': {'state': 'Maharashtra', 'num_employees': '120', 'industry_type': 'Factory'}
+}
+
+def bench_report(calc_type, repeat):
+    """
+    Time one report type and measure its allocations
+
+    Returns:
+        dict: harness.measure() fields (p50_us, p99_us, ...) plus peak_kib, the
+              peak allocated while rendering one report
+    """
+    # Imported here so that --source decides which code is measured
+    from calculations import prepare_report
+    from pdf_generator import generate_report
+
+    data, result = prepare_report(calc_type, REPORT_PARAMS[calc_type])
+    row = measure(lambda: generate_report(calc_type, data, result), samples=repeat)
+
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    generate_report(calc_type, data, result)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    row['peak_kib'] = round((peak - baseline) / 1024, 1)
+    return row
+
+def run(repeat):
+    """Benchmark every report type, keyed as in run_benchmarks.py's pdf suite"""
+    return {f'pdf.{calc_type}': bench_report(calc_type, repeat) for calc_type in REPORT_PARAMS}
+
+def run_revision(revision, repeat):
+    """Run this benchmark against the code of an earlier git revision"""
+    with tempfile.TemporaryDirectory() as directory:
+        worktree = os.path.join(directory, 'tree')
+        subprocess.run(['git', '-C', REPO_DIR, 'worktree', 'add', '--detach', worktree, revision],
+                       check=True, capture_output=True)
+        try:
+            output = os.path.join(directory, 'baseline.json')
+            subprocess.run([sys.executable, os.path.abspath(__file__), '--source', worktree,
+                            '--repeat', str(repeat), '--json', output, '--quiet'], check=True)
+            return load_results(output)
+        finally:
+            subprocess.run(['git', '-C', REPO_DIR, 'worktree', 'remove', '--force', worktree],
+                           check=True, capture_output=True)
+
+def print_rows(results):
+    print(f"{'Report':<12}{'ms/report':>12}{'p50 ms':>12}{'peak KiB':>12}")
+    for calc_type in REPORT_PARAMS:
+        row = results.get(f'pdf.{calc_type}')
+        if row is not None:
+            print(f"{calc_type:<12}{row['mean_us'] / 1000:>12.2f}{row['p50_us'] / 1000:>12.2f}{row['peak_kib']:>12.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=50, help='Timed samples per report type')
+    parser.add_argument('--json', help='Write the results as JSON (readable by run_benchmarks.py --baseline)')
+    parser.add_argument('--baseline-rev', help='Git revision to run the same benchmark against for comparison')
+    parser.add_argument('--source', help=argparse.SUPPRESS)
+    parser.add_argument('--quiet', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.source:
+        sys.path.insert(0, args.source)
+    results = run(args.repeat)
+    if args.json:
+        save_results(args.json, results)
+    if args.quiet:
+        return
+    print_rows(results)
+
+    if args.baseline_rev:
+        baseline = run_revision(args.baseline_rev, args.repeat)
+        print(f'\nBaseline ({args.baseline_rev}):')
+        print_rows(baseline)
+        print_comparison(compare(results, baseline, tolerance=float('inf')))
+
+if __name__ == '__main__':
+    main()
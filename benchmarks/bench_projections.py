@@ -0,0 +1,50 @@
+"""
+Corpus Projection Benchmark for StatutoryCalc
+Times a 30-year (360-month) EPF/EPS/NPS projection for a whole workforce
+
+Usage:
+    python benchmarks/bench_projections.py [--employees 100000] [--years 30] [--chunk-size 4096]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from projections import DEFAULT_CHUNK_SIZE, project_corpus
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--employees', type=int, default=100000)
+    parser.add_argument('--years', type=int, default=30)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    basic = rng.integers(8000, 120000, args.employees).astype(float)
+    da_percent = rng.choice([0, 17, 38, 46, 50], args.employees)
+    sector = rng.choice(['private', 'government'], args.employees, p=[0.7, 0.3])
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    projection = project_corpus(basic, da_percent, sector, years=args.years, salary_growth=4, da_revision=3,
+                                chunk_size=args.chunk_size)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    cells = args.employees * args.years * 12
+    print(f"{args.employees:,} employees x {args.years * 12} months, chunk size {args.chunk_size}")
+    print(f"elapsed      {elapsed:8.2f} s")
+    print(f"throughput   {cells / elapsed / 1e6:8.1f} M employee-months/s")
+    print(f"peak memory  {peak / 2**20:8.1f} MiB")
+    print(f"total EPF corpus after {args.years} years: Rs. {projection['epf_balance'][:, -1].sum():,.0f}")
+    print(f"total NPS corpus after {args.years} years: Rs. {projection['nps_balance'][:, -1].sum():,.0f}")
+
+if __name__ == '__main__':
+    main()
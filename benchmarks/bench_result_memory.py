@@ -0,0 +1,52 @@
+"""
+Result Memory Benchmark for StatutoryCalc
+Compares the memory held by per-employee result dicts and slotted result records
+
+Usage:
+    python benchmarks/bench_result_memory.py [--employees 400000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch_engine import calculate_batch, to_records
+
+def measure_retained(build):
+    """Return (object, bytes retained) for the structure returned by build()"""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    value = build()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, after - before
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--employees', type=int, default=400000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    basic = [rng.randint(8000, 90000) for _ in range(args.employees)]
+    da = [rng.randint(0, 15000) for _ in range(args.employees)]
+    sector = [rng.choice(['private', 'government']) for _ in range(args.employees)]
+    years = [rng.randint(0, 35) for _ in range(args.employees)]
+    results = calculate_batch(basic, da, sector=sector, years_of_service=years)
+
+    print(f"{'Result':<10}{'dicts MiB':>12}{'records MiB':>14}{'saving':>9}")
+    for calc_type in ('pf', 'esi', 'nps', 'gratuity'):
+        # Both structures own their values (the records are discarded after to_dict)
+        dicts, dict_bytes = measure_retained(
+            lambda: [record.to_dict() for record in to_records(calc_type, results[calc_type])])
+        del dicts
+        records, record_bytes = measure_retained(lambda: to_records(calc_type, results[calc_type]))
+        saving = 1 - record_bytes / dict_bytes
+        print(f"{calc_type:<10}{dict_bytes / 2**20:>12.1f}{record_bytes / 2**20:>14.1f}{saving:>9.0%}")
+        del records
+
+if __name__ == '__main__':
+    main()
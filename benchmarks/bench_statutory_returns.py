@@ -0,0 +1,67 @@
+"""
+Statutory Returns Benchmark for StatutoryCalc
+Times ECR and ESI generation for a large roster read from CSV
+
+Usage:
+    python benchmarks/bench_statutory_returns.py [--members 200000] [--establishments 20]
+"""
+
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from statutory_returns import generate_returns, read_csv_rows
+
+COLUMNS = ['establishment', 'uan', 'ip_number', 'name', 'basic', 'da', 'ncp_days', 'eps_member']
+
+def write_roster(path, members, establishments):
+    rng = random.Random(1)
+    with open(path, 'w', newline='', encoding='utf-8') as output:
+        writer = csv.writer(output)
+        writer.writerow(COLUMNS)
+        for i in range(members):
+            basic = rng.randint(8000, 60000)
+            writer.writerow([
+                f'EST{i % establishments:09d}', f'{100000000000 + i}', f'{3100000000 + i}' if basic < 16000 else '',
+                f'Member {i}', basic, basic * rng.choice((0, 17, 38, 50)) // 100, rng.choice((0, 0, 0, 1, 2)),
+                'no' if i % 25 == 0 else 'yes'
+            ])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--members', type=int, default=200000)
+    parser.add_argument('--establishments', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        roster = os.path.join(directory, 'roster.csv')
+        write_roster(roster, args.members, args.establishments)
+
+        started = time.perf_counter()
+        with open(roster, newline='', encoding='utf-8') as source:
+            summary = generate_returns(read_csv_rows(source), os.path.join(directory, 'returns'), '2024-06')
+        elapsed = time.perf_counter() - started
+
+        # tracemalloc slows the pass down several times over, so memory is measured separately
+        tracemalloc.start()
+        with open(roster, newline='', encoding='utf-8') as source:
+            generate_returns(read_csv_rows(source), os.path.join(directory, 'traced'), '2024-06')
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    challan = sum(totals['ecr']['challan']['total'] for totals in summary['establishments'].values())
+    print(f"{args.members:,} members across {args.establishments} establishments ({summary['errors']} errors)")
+    print(f"elapsed      {elapsed:8.2f} s")
+    print(f"throughput   {args.members / elapsed:8,.0f} members/s")
+    print(f"peak memory  {peak / 2**20:8.1f} MiB")
+    print(f"EPF challan total: Rs. {challan:,}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark Harness for StatutoryCalc
+Timing, percentile reporting, JSON results and baseline comparison
+"""
+
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+# Aim for samples of at least this long so timer overhead stays negligible
+MIN_SAMPLE_SECONDS = 50e-6
+
+def _calibrate(func):
+    """Return how many calls make up one sample"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - start >= MIN_SAMPLE_SECONDS or number >= 1 << 16:
+            return number
+        number *= 2
+
+def _percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+def measure(func, samples=200, warmup=3):
+    """
+    Time a zero-argument callable
+
+    Args:
+        func: Callable to benchmark
+        samples: Number of timed samples
+        warmup: Untimed calls before measuring
+
+    Returns:
+        dict: p50_us, p99_us, mean_us, ops_per_sec, samples, calls_per_sample
+    """
+    for _ in range(warmup):
+        func()
+    number = _calibrate(func)
+
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+
+    timings.sort()
+    mean = statistics.fmean(timings)
+    return {
+        'p50_us': round(_percentile(timings, 0.50) * 1e6, 3),
+        'p99_us': round(_percentile(timings, 0.99) * 1e6, 3),
+        'mean_us': round(mean * 1e6, 3),
+        'ops_per_sec': round(1 / mean, 1) if mean else float('inf'),
+        'samples': samples,
+        'calls_per_sample': number
+    }
+
+def environment():
+    """Describe the machine the results were produced on"""
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'timestamp': datetime.now().isoformat(timespec='seconds')
+    }
+
+def save_results(path, results):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'environment': environment(), 'benchmarks': results}, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+def load_results(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)['benchmarks']
+
+def compare(results, baseline, tolerance=0.25):
+    """
+    Compare results against a baseline on p50 latency
+
+    Args:
+        results: {name: measurement} for the current run
+        baseline: {name: measurement} from the stored baseline
+        tolerance: Allowed slowdown as a fraction (0.25 = 25% slower)
+
+    Returns:
+        list: (name, baseline_p50_us, current_p50_us, ratio, regressed) per shared benchmark
+    """
+    rows = []
+    for name in sorted(results):
+        if name not in baseline:
+            continue
+        before = baseline[name]['p50_us']
+        after = results[name]['p50_us']
+        ratio = after / before if before else float('inf')
+        rows.append((name, before, after, ratio, ratio > 1 + tolerance))
+    return rows
+
+def print_results(results, stream=sys.stdout):
+    print(f"{'Benchmark':<44}{'p50 us':>12}{'p99 us':>12}{'ops/sec':>14}", file=stream)
+    for name in sorted(results):
+        row = results[name]
+        print(f"{name:<44}{row['p50_us']:>12.2f}{row['p99_us']:>12.2f}{row['ops_per_sec']:>14.1f}", file=stream)
+
+def print_comparison(rows, stream=sys.stdout):
+    print(f"\n{'Benchmark':<44}{'base p50':>12}{'p50':>12}{'ratio':>9}", file=stream)
+    for name, before, after, ratio, regressed in rows:
+        flag = '  REGRESSION' if regressed else ''
+        print(f"{name:<44}{before:>12.2f}{after:>12.2f}{ratio:>9.2f}{flag}", file=stream)
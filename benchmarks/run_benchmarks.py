@@ -0,0 +1,141 @@
+"""
+Benchmark Suite for StatutoryCalc
+Micro benchmarks for the calculators and holiday calendar, PDF rendering per
+report type, and end-to-end Flask throughput for /api/calculate and /download.
+
+Usage:
+    python benchmarks/run_benchmarks.py                       # run everything
+    python benchmarks/run_benchmarks.py --suite calculators   # one suite
+    python benchmarks/run_benchmarks.py --save-baseline       # store as the baseline
+    python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json --tolerance 0.25
+
+Results are written as JSON (p50/p99 latency in microseconds and ops/sec).
+When a baseline is given, the run exits with status 1 if any benchmark's p50
+is slower than the baseline by more than the tolerance.
+"""
+
+import argparse
+import os
+import sys
+from datetime import date
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+
+from harness import compare, load_results, measure, print_comparison, print_results, save_results
+from bench_pdf_reports import REPORT_PARAMS
+
+DEFAULT_RESULTS = os.path.join(BENCHMARK_DIR, 'results', 'latest.json')
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, 'baseline.json')
+
+API_RECORDS = {
+    'gratuity': {'type': 'gratuity', 'salary': 50000, 'years': 12, 'sector': 'private'},
+    'pf': {'type': 'pf', 'basic': 25000, 'da': 5000},
+    'gpf': {'type': 'gpf', 'basic': 40000, 'da': 8000},
+    'nps': {'type': 'nps', 'basic': 45000, 'da': 8000, 'employee_rate': 10},
+    'esi': {'type': 'esi', 'salary': 18000},
+    'leave': {'type': 'leave', 'days_worked': 300, 'state': 'maharashtra', 'establishment_type': 'factory'},
+    'compliance': {'type': 'compliance', 'state': 'Maharashtra', 'num_employees': 120, 'industry_type': 'Factory'}
+}
+
+def calculator_benchmarks():
+    from core_calculators import (
+        calculate_gratuity, calculate_pf_contribution, calculate_nps_contribution, is_esi_applicable,
+        calculate_leave_entitlement, generate_compliance_checklist
+    )
+    return {
+        'calculators.gratuity_private': lambda: calculate_gratuity(50000, 12, 'private'),
+        'calculators.gratuity_government': lambda: calculate_gratuity(50000, 25, 'government'),
+        'calculators.pf_private': lambda: calculate_pf_contribution(25000, 5000, 'private'),
+        'calculators.gpf_government': lambda: calculate_pf_contribution(40000, 8000, 'government'),
+        'calculators.nps': lambda: calculate_nps_contribution(45000, 8000, 10),
+        'calculators.esi': lambda: is_esi_applicable(18000),
+        'calculators.leave_private': lambda: calculate_leave_entitlement(300, 'maharashtra', 'shop'),
+        'calculators.leave_government': lambda: calculate_leave_entitlement(0, '', '', 'government'),
+        'calculators.compliance_checklist': lambda: generate_compliance_checklist('Maharashtra', 120, 'Factory')
+    }
+
+def holiday_benchmarks():
+    from holiday_calendar import (
+        count_working_days, count_working_days_between, get_all_holidays_2025, get_holidays_by_month, is_holiday
+    )
+    return {
+        'holidays.holidays_by_month_assam': lambda: get_holidays_by_month(2025, 'assam'),
+        'holidays.all_holidays_central': lambda: get_all_holidays_2025('central'),
+        'holidays.count_working_days_assam': lambda: count_working_days(2025, 'assam'),
+        'holidays.is_holiday': lambda: is_holiday(date(2025, 8, 15), 'assam'),
+        'holidays.working_days_between': lambda: count_working_days_between(date(2025, 3, 1), date(2025, 9, 30), 'assam')
+    }
+
+def pdf_benchmarks():
+    from calculations import prepare_report
+    from pdf_generator import generate_report
+
+    benchmarks = {}
+    for calc_type, params in REPORT_PARAMS.items():
+        data, result = prepare_report(calc_type, params)
+        benchmarks[f'pdf.{calc_type}'] = (lambda c=calc_type, d=data, r=result: generate_report(c, d, r))
+    return benchmarks
+
+def api_benchmarks():
+    from app import app
+
+    app.config['TESTING'] = True
+    # Measure real rendering, not report cache hits
+    app.config['REPORT_CACHE_MAX_BYTES'] = 0
+    app.extensions.pop('report_cache', None)
+    client = app.test_client()
+
+    benchmarks = {}
+    for calc_type, record in API_RECORDS.items():
+        benchmarks[f'api.calculate.{calc_type}'] = (lambda r=record: client.post('/api/calculate', json=r))
+    for calc_type, params in REPORT_PARAMS.items():
+        query = '&'.join(f'{key}={value}' for key, value in params.items())
+        url = f'/download/{calc_type}/pdf?{query}'
+        benchmarks[f'api.download.{calc_type}'] = (lambda u=url: client.get(u))
+    return benchmarks
+
+SUITES = {
+    'calculators': (calculator_benchmarks, 300),
+    'holidays': (holiday_benchmarks, 300),
+    'pdf': (pdf_benchmarks, 40),
+    'api': (api_benchmarks, 40)
+}
+
+def run(suites, sample_scale=1.0):
+    results = {}
+    for suite in suites:
+        factory, samples = SUITES[suite]
+        for name, func in factory().items():
+            results[name] = measure(func, samples=max(5, int(samples * sample_scale)))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the StatutoryCalc benchmark suite')
+    parser.add_argument('--suite', action='append', choices=sorted(SUITES),
+                        help='Suite to run (repeatable; default: all)')
+    parser.add_argument('--samples-scale', type=float, default=1.0,
+                        help='Multiply the number of samples per benchmark (e.g. 0.2 for a quick run)')
+    parser.add_argument('--output', default=DEFAULT_RESULTS, help='Where to write the JSON results')
+    parser.add_argument('--baseline', help='Baseline JSON to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help=f'Also save results to {DEFAULT_BASELINE}')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed p50 slowdown versus the baseline (fraction, default 0.25)')
+    args = parser.parse_args()
+
+    results = run(args.suite or list(SUITES), args.samples_scale)
+    print_results(results)
+    save_results(args.output, results)
+    print(f'\nResults written to {args.output}')
+    if args.save_baseline:
+        save_results(DEFAULT_BASELINE, results)
+        print(f'Baseline written to {DEFAULT_BASELINE}')
+
+    if args.baseline:
+        rows = compare(results, load_results(args.baseline), args.tolerance)
+        print_comparison(rows)
+        if any(row[-1] for row in rows):
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+"""
+Bulk PDF Report Generation for StatutoryCalc
+Renders statutory reports for a whole establishment across a process pool
+and streams them back as a ZIP archive while entries finish.
+"""
+
+import codecs
+import csv
+import json
+import re
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from calculations import CALCULATION_TYPES, prepare_report
+from parallel import pool_context
+from rates import ensure_rules, rules_source
+
+# Reports generated for a row that does not name any in its 'type' column
+DEFAULT_REPORT_TYPES = ('pf', 'esi')
+
+# Starting guess for the size of one rendered PDF, refined as reports finish
+INITIAL_REPORT_SIZE_ESTIMATE = 64 * 1024
+
+def read_employee_csv(stream):
+    """
+    Read employee rows from a CSV byte stream, one row at a time
+
+    Args:
+        stream: Binary file-like object or iterable of byte lines
+
+    Returns:
+        iterator: dict per employee row
+    """
+    return csv.DictReader(codecs.iterdecode(stream, 'utf-8-sig'))
+
+def read_employee_json(stream):
+    """
+    Read employee rows from a JSON array
+
+    Args:
+        stream: Binary file-like object containing a JSON array of objects
+
+    Returns:
+        list: dict per employee row
+    """
+    rows = json.load(stream)
+    if not isinstance(rows, list):
+        raise ValueError('Employee file must contain a JSON array')
+    return rows
+
+def plan_report_jobs(rows):
+    """
+    Expand employee rows into (entry_name, calc_type, params) report jobs
+
+    Each row may list several report types in its 'type' column, separated
+    by ';' (e.g. "pf;esi;gratuity"). Empty cells are treated as missing so
+    the calculators fall back to their usual defaults.
+
+    Args:
+        rows: Iterable of employee dicts
+
+    Returns:
+        iterator: (entry_name, calc_type, params) tuples
+    """
+    for number, row in enumerate(rows, 1):
+        params = {key: value for key, value in row.items()
+                  if key and value is not None and value != ''}
+        types = str(params.get('type', '')).split(';')
+        types = [calc_type.strip().lower() for calc_type in types if calc_type.strip()]
+        employee = str(params.get('employee_id') or params.get('name') or f'employee_{number}')
+        employee = re.sub(r'[^A-Za-z0-9_.-]+', '_', employee).strip('_') or f'employee_{number}'
+        for calc_type in types or DEFAULT_REPORT_TYPES:
+            yield f'{number:06d}_{employee}_{calc_type}.pdf', calc_type, params
+
+def render_report_entry(entry_name, calc_type, params):
+    """
+    Render one report (runs inside a pool worker)
+
+    Returns:
+        tuple: (entry_name, pdf_bytes, error) - exactly one of pdf_bytes / error is None
+    """
+    # ReportLab is imported by the pool workers that render, not by every importer of this module
+    from pdf_generator import generate_report
+    try:
+        if calc_type not in CALCULATION_TYPES:
+            raise ValueError('Invalid calculation type')
+        data, result = prepare_report(calc_type, params)
+        return entry_name, generate_report(calc_type, data, result).getvalue(), None
+    except Exception as e:
+        return entry_name, None, f'{type(e).__name__}: {e}'
+
+class _ZipChunkWriter:
+    """Write-only file object that collects ZIP output for streaming"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+def _run_in_process(jobs):
+    for job in jobs:
+        yield render_report_entry(*job)
+
+def _run_in_pool(jobs, workers, max_memory):
+    """Render jobs across a process pool, keeping in-flight output under max_memory"""
+    size_estimate = INITIAL_REPORT_SIZE_ESTIMATE
+    rendered_count = 0
+    pending = set()
+    jobs = iter(jobs)
+    exhausted = False
+
+    # Not forked from the threaded server (see parallel.pool_context); workers load the parent's rules
+    with ProcessPoolExecutor(max_workers=workers, mp_context=pool_context(),
+                             initializer=ensure_rules, initargs=(rules_source(),)) as pool:
+        while pending or not exhausted:
+            # Keep every worker busy, but never hold more reports than the ceiling allows
+            max_in_flight = max(1, min(workers * 2, max_memory // max(size_estimate, 1)))
+            while not exhausted and len(pending) < max_in_flight:
+                job = next(jobs, None)
+                if job is None:
+                    exhausted = True
+                    break
+                pending.add(pool.submit(render_report_entry, *job))
+            if not pending:
+                break
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                entry = future.result()
+                if entry[1] is not None:
+                    rendered_count += 1
+                    size_estimate += (len(entry[1]) - size_estimate) // rendered_count
+                yield entry
+
+def stream_reports_zip(rows, workers=1, max_memory=256 * 1024 * 1024):
+    """
+    Render a report per employee and report type, yielding ZIP archive bytes
+
+    Entries are added in completion order. Rows that fail are listed in an
+    'errors.txt' entry at the end instead of aborting the archive.
+
+    Args:
+        rows: Iterable of employee dicts
+        workers: Number of worker processes (1 renders in-process)
+        max_memory: Ceiling in bytes for rendered reports held in flight
+
+    Returns:
+        iterator: Chunks of the ZIP archive
+    """
+    jobs = plan_report_jobs(rows)
+    if workers > 1:
+        entries = _run_in_pool(jobs, workers, max_memory)
+    else:
+        entries = _run_in_process(jobs)
+
+    writer = _ZipChunkWriter()
+    errors = []
+    # PDF page streams are already compressed, so entries are stored as-is
+    with zipfile.ZipFile(writer, mode='w', compression=zipfile.ZIP_STORED) as archive:
+        for entry_name, pdf_bytes, error in entries:
+            if error is not None:
+                errors.append(f'{entry_name}: {error}')
+                continue
+            archive.writestr(entry_name, pdf_bytes)
+            yield writer.drain()
+        if errors:
+            archive.writestr('errors.txt', '\n'.join(errors) + '\n')
+    yield writer.drain()
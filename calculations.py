@@ -0,0 +1,160 @@
+"""
+Calculation Dispatch for Indian Labor Law Compliance System
+Maps API request records onto the core calculator functions
+"""
+
+from core_calculators import (
+    calculate_gratuity, calculate_pf_contribution, is_esi_applicable,
+    calculate_leave_entitlement, generate_compliance_checklist, calculate_nps_contribution
+)
+from instrumentation import stage
+from rates import as_pay_period
+
+CALCULATION_TYPES = ('gratuity', 'pf', 'nps', 'esi', 'leave', 'compliance', 'gpf')
+
+def run_calculation(data):
+    """
+    Run the calculator selected by the record's 'type' field
+
+    Args:
+        data: API record, e.g. {'type': 'pf', 'basic': 25000, 'da': 5000}; gratuity,
+              PF, NPS and ESI records may give a 'pay_period' (YYYY-MM or YYYY-MM-DD)
+              to use the rates in force then
+
+    Returns:
+        dict or list: Calculator result
+
+    Raises:
+        ValueError: If the calculation type is not supported
+        KeyError: If a required field is missing
+    """
+    calc_type = data.get('type')
+    pay_period = data.get('pay_period')
+
+    with stage('calculate', calc_type):
+        if calc_type == 'gratuity':
+            sector = data.get('sector', 'private')
+            return calculate_gratuity(data['salary'], data['years'], sector, pay_period=pay_period)
+        elif calc_type == 'pf':
+            sector = data.get('sector', 'private')
+            return calculate_pf_contribution(data['basic'], data.get('da', 0), sector, pay_period=pay_period)
+        elif calc_type == 'nps':
+            return calculate_nps_contribution(data['basic'], data.get('da', 0), data.get('employee_rate', 10),
+                                              pay_period=pay_period)
+        elif calc_type == 'esi':
+            return is_esi_applicable(data['salary'], data.get('state', 'general'), pay_period=pay_period)
+        elif calc_type == 'leave':
+            sector = data.get('sector', 'private')
+            if sector == 'government':
+                return calculate_leave_entitlement(0, '', '', 'government')
+            return calculate_leave_entitlement(
+                data['days_worked'],
+                data.get('state', 'general'),
+                data.get('establishment_type', 'factory'),
+                sector
+            )
+        elif calc_type == 'compliance':
+            return generate_compliance_checklist(
+                data['state'],
+                data['num_employees'],
+                data['industry_type']
+            )
+        elif calc_type == 'gpf':
+            return calculate_pf_contribution(data['basic'], data.get('da', 0), 'government')
+
+        raise ValueError('Invalid calculation type')
+
+def prepare_report(calc_type, params):
+    """
+    Parse report parameters and run the matching calculator
+
+    Args:
+        calc_type: Report type (one of CALCULATION_TYPES)
+        params: Mapping of raw parameter values (query string args, CSV row, ...);
+                an optional 'pay_period' selects the rates in force for that period
+
+    Returns:
+        tuple: (data, result) as expected by the PDF report generators
+
+    Raises:
+        ValueError: If the calculation type is not supported or a value is invalid
+    """
+    pay_period = params.get('pay_period') or None
+    if pay_period is not None:
+        pay_period = as_pay_period(pay_period).isoformat()
+
+    if calc_type == 'gratuity':
+        salary = float(params.get('salary', 0))
+        years = float(params.get('years', 0))
+        sector = params.get('sector', 'private')
+        data = {'salary': salary, 'years': years, 'sector': sector}
+        result = calculate_gratuity(salary, years, sector, pay_period=pay_period)
+    elif calc_type == 'pf':
+        basic = float(params.get('basic', 0))
+        da = float(params.get('da', 0))
+        sector = params.get('sector', 'private')
+        data = {'basic': basic, 'da': da, 'sector': sector}
+        result = calculate_pf_contribution(basic, da, sector, pay_period=pay_period)
+    elif calc_type == 'esi':
+        salary = float(params.get('salary', 0))
+        state = params.get('state', 'general')
+        data = {'salary': salary, 'state': state}
+        result = is_esi_applicable(salary, state, pay_period=pay_period)
+    elif calc_type == 'leave':
+        sector = params.get('sector', 'private')
+        if sector == 'government':
+            data = {'sector': sector}
+            result = calculate_leave_entitlement(0, '', '', 'government')
+        else:
+            days_worked = int(params.get('days_worked', 0))
+            state = params.get('state', 'general')
+            establishment_type = params.get('establishment_type', 'factory')
+            data = {'days_worked': days_worked, 'state': state, 'establishment_type': establishment_type, 'sector': sector}
+            result = calculate_leave_entitlement(days_worked, state, establishment_type, sector)
+    elif calc_type == 'nps':
+        basic = float(params.get('basic', 0))
+        da = float(params.get('da', 0))
+        employee_rate = int(params.get('employee_rate', 10))
+        data = {'basic': basic, 'da': da, 'employee_rate': employee_rate}
+        result = calculate_nps_contribution(basic, da, employee_rate, pay_period=pay_period)
+    elif calc_type == 'gpf':
+        basic = float(params.get('basic', 0))
+        da = float(params.get('da', 0))
+        data = {'basic': basic, 'da': da, 'sector': 'government'}
+        result = calculate_pf_contribution(basic, da, 'government')
+    elif calc_type == 'compliance':
+        state = params.get('state', '')
+        num_employees = int(params.get('num_employees', 0))
+        industry_type = params.get('industry_type', '')
+        data = {'state': state, 'num_employees': num_employees, 'industry_type': industry_type}
+        result = generate_compliance_checklist(state, num_employees, industry_type)
+    else:
+        raise ValueError('Invalid calculation type')
+
+    if pay_period is not None and calc_type in ('gratuity', 'pf', 'esi', 'nps'):
+        # Part of the report cache key: the same inputs give other results under other rates
+        data['pay_period'] = pay_period
+    return data, result
+
+def run_batch_record(index, record):
+    """
+    Run one record of a batch, turning any failure into an error entry
+
+    Args:
+        index: Position of the record in the batch
+        record: API record (anything; non-dict records are reported as errors,
+                and an exception, e.g. from parsing the record, is reported as-is)
+
+    Returns:
+        dict: {'index', 'success', 'result'} or {'index', 'success', 'error'}
+    """
+    try:
+        if isinstance(record, Exception):
+            raise record
+        if not isinstance(record, dict):
+            raise ValueError('Record must be a JSON object')
+        return {'index': index, 'success': True, 'result': run_calculation(record)}
+    except KeyError as e:
+        return {'index': index, 'success': False, 'error': f'Missing field: {e.args[0]}'}
+    except Exception as e:
+        return {'index': index, 'success': False, 'error': str(e)}
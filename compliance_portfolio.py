@@ -0,0 +1,114 @@
+"""
+Portfolio Compliance for Indian Labor Law Compliance System
+One compliance matrix for every branch of a multi-site employer
+
+Branches are reduced to their decision index key (state, industry, headcount
+band, see compliance_rules.compliance_key). Each distinct key - a compliance
+profile - is evaluated once, as a boolean row over COMPLIANCE_RULES, and the
+branch x requirement matrix is a single NumPy gather of those rows. Hundreds
+of branches usually fall into a handful of profiles.
+"""
+
+import numpy as np
+
+from compliance_rules import COMPLIANCE_INDEX, COMPLIANCE_RULES, compliance_key
+
+def _branch(position, establishment):
+    """Normalize one establishment record into (name, state, num_employees, industry_type)"""
+    if not isinstance(establishment, dict):
+        raise ValueError(f'Establishment {position} must be an object')
+    try:
+        name = str(establishment.get('name') or f'Branch {position + 1}')
+        state = str(establishment['state'])
+        num_employees = int(establishment['num_employees'])
+        industry_type = str(establishment['industry_type'])
+    except KeyError as e:
+        raise ValueError(f'Establishment {position}: missing field {e.args[0]}')
+    except (TypeError, ValueError):
+        raise ValueError(f'Establishment {position}: num_employees must be a whole number')
+    if num_employees < 0:
+        raise ValueError(f'Establishment {position}: num_employees must not be negative')
+    return name, state, num_employees, industry_type
+
+def evaluate_portfolio(establishments, compiled=COMPLIANCE_INDEX, rules=COMPLIANCE_RULES):
+    """
+    Evaluate the compliance requirements of every branch in one call
+
+    Args:
+        establishments: Sequence of dicts with 'state', 'num_employees',
+                        'industry_type' and optionally 'name'
+
+    Returns:
+        dict: {
+            'branches': [{'name', 'state', 'num_employees', 'industry_type', 'profile'}],
+            'requirements': [{'id', 'text'}] - every requirement that applies to
+                            at least one branch, in checklist order,
+            'matrix': bool array (branches x requirements),
+            'profiles': [(state, industry, band)] - distinct keys; branch['profile']
+                        indexes this list
+        }
+
+    Raises:
+        ValueError: If an establishment record is invalid
+    """
+    branches = []
+    profiles = {}
+    for position, establishment in enumerate(establishments):
+        name, state, num_employees, industry_type = _branch(position, establishment)
+        key = compliance_key(state, num_employees, industry_type, compiled)
+        branches.append({
+            'name': name,
+            'state': state,
+            'num_employees': num_employees,
+            'industry_type': industry_type,
+            'profile': profiles.setdefault(key, len(profiles))
+        })
+
+    # One row per profile, gathered into one row per branch
+    by_profile = np.zeros((len(profiles), len(rules)), dtype=bool)
+    for key, row in profiles.items():
+        by_profile[row, list(compiled['index'][key])] = True
+    matrix = by_profile[np.fromiter((branch['profile'] for branch in branches), dtype=np.intp, count=len(branches))]
+
+    # Drop requirements no branch has to meet
+    applicable = np.flatnonzero(by_profile.any(axis=0))
+    return {
+        'branches': branches,
+        'requirements': [{'id': rules[position]['id'], 'text': rules[position]['text']} for position in applicable],
+        'matrix': matrix[:, applicable],
+        'profiles': list(profiles)
+    }
+
+def portfolio_checklists(portfolio):
+    """
+    Group a portfolio's branches by compliance profile
+
+    Args:
+        portfolio: Output of evaluate_portfolio
+
+    Returns:
+        list: [{'branches': [branch dicts], 'checklist': [requirement texts]}] per profile,
+              in profile order
+    """
+    groups = [{'branches': [], 'checklist': None} for _ in portfolio['profiles']]
+    texts = [requirement['text'] for requirement in portfolio['requirements']]
+    for position, branch in enumerate(portfolio['branches']):
+        group = groups[branch['profile']]
+        if group['checklist'] is None:
+            group['checklist'] = [text for text, applies in zip(texts, portfolio['matrix'][position]) if applies]
+        group['branches'].append(branch)
+    return groups
+
+def portfolio_to_dict(portfolio):
+    """
+    JSON-ready form of a portfolio: the matrix as one '0'/'1' string per branch
+
+    Returns:
+        dict: {'branches', 'requirements', 'matrix', 'profiles'}
+    """
+    return {
+        'branches': portfolio['branches'],
+        'requirements': portfolio['requirements'],
+        'matrix': [''.join('1' if applies else '0' for applies in row) for row in portfolio['matrix'].tolist()],
+        'profiles': len(portfolio['profiles'])
+    }
@@ -0,0 +1,147 @@
+"""
+Compliance Rules Table for Indian Labor Law Compliance System
+Declarative compliance requirements, compiled at import into a decision index
+keyed by (state, industry, headcount band) so a checklist is a single lookup.
+"""
+
+from bisect import bisect_right
+from itertools import product
+
+# Every compliance requirement, in the order it appears on a checklist.
+#   min_employees: requirement applies from this headcount (None = always)
+#   industries:    industry types it is limited to (None = all)
+#   states:        states it is limited to (None = all)
+COMPLIANCE_RULES = (
+    # Basic registrations for all establishments
+    {'id': 'trade-license', 'text': "Obtain Trade License from local municipal authority",
+     'min_employees': None, 'industries': None, 'states': None},
+    {'id': 'gst-registration', 'text': "Register for GST if annual turnover exceeds Rs. 20 lakhs",
+     'min_employees': None, 'industries': None, 'states': None},
+
+    # Employee-based compliances
+    {'id': 'attendance-register', 'text': "Maintain attendance register for all employees",
+     'min_employees': 1, 'industries': None, 'states': None},
+    {'id': 'appointment-letters', 'text': "Issue appointment letters to all employees",
+     'min_employees': 1, 'industries': None, 'states': None},
+    {'id': 'shops-establishment-act', 'text': "Register under applicable Shops and Establishment Act",
+     'min_employees': 10, 'industries': None, 'states': None},
+    {'id': 'factories-act-registration', 'text': "Register under Factories Act, 1948",
+     'min_employees': 10, 'industries': ('factory',), 'states': None},
+    {'id': 'factory-license', 'text': "Obtain Factory License from State Factory Inspector",
+     'min_employees': 10, 'industries': ('factory',), 'states': None},
+    {'id': 'epf-registration', 'text': "Register for Employee Provident Fund (EPF)",
+     'min_employees': 20, 'industries': None, 'states': None},
+    {'id': 'esi-registration', 'text': "Register for Employee State Insurance (ESI)",
+     'min_employees': 20, 'industries': None, 'states': None},
+    {'id': 'gratuity-act', 'text': "Comply with Payment of Gratuity Act, 1972",
+     'min_employees': 20, 'industries': None, 'states': None},
+    {'id': 'posh-icc', 'text': "Constitute Internal Complaints Committee (ICC) for POSH Act",
+     'min_employees': 30, 'industries': None, 'states': None},
+    {'id': 'contract-labour-act', 'text': "Register under Contract Labour Act (if applicable)",
+     'min_employees': 100, 'industries': None, 'states': None},
+
+    # Industry-specific compliances
+    {'id': 'factory-registers', 'text': "Maintain factory registers as per Factories Act",
+     'min_employees': None, 'industries': ('factory',), 'states': None},
+    {'id': 'medical-examination', 'text': "Conduct annual medical examination of workers",
+     'min_employees': None, 'industries': ('factory',), 'states': None},
+    {'id': 'safety-officer', 'text': "Appoint Safety Officer",
+     'min_employees': 50, 'industries': ('factory',), 'states': None},
+    {'id': 'it-act-data-protection', 'text': "Comply with IT Act provisions for data protection",
+     'min_employees': None, 'industries': ('it', 'software', 'services'), 'states': None},
+    {'id': 'professional-tax-act', 'text': "Register under Professional Tax Act",
+     'min_employees': None, 'industries': ('it', 'software', 'services'), 'states': None},
+
+    # State-specific additions
+    {'id': 'maharashtra-shops-act', 'text': "Register under Maharashtra Shops and Establishment Act",
+     'min_employees': None, 'industries': None, 'states': ('maharashtra',)},
+    {'id': 'maharashtra-professional-tax', 'text': "Register for Professional Tax in Maharashtra",
+     'min_employees': 5, 'industries': None, 'states': ('maharashtra',)},
+    {'id': 'karnataka-shops-act', 'text': "Register under Karnataka Shops and Commercial Establishment Act",
+     'min_employees': None, 'industries': None, 'states': ('karnataka',)},
+    {'id': 'tamil-nadu-shops-act', 'text': "Register under Tamil Nadu Shops and Establishment Act",
+     'min_employees': None, 'industries': None, 'states': ('tamil nadu',)},
+)
+
+# Key used for any state / industry that no rule singles out
+OTHER = ''
+
+def compile_compliance_index(rules):
+    """
+    Compile a rules table into a decision index
+
+    Args:
+        rules: Sequence of rule dicts (see COMPLIANCE_RULES)
+
+    Returns:
+        dict: {
+            'thresholds': sorted headcount band boundaries,
+            'states': states named by any rule,
+            'industries': industries named by any rule,
+            'index': {(state, industry, band): tuple of rule positions},
+            'checklists': {(state, industry, band): tuple of requirement texts}
+        }
+    """
+    thresholds = sorted({rule['min_employees'] for rule in rules if rule['min_employees'] is not None})
+    states = sorted({state for rule in rules for state in rule['states'] or ()})
+    industries = sorted({industry for rule in rules for industry in rule['industries'] or ()})
+
+    index = {}
+    for state, industry, band in product([OTHER] + states, [OTHER] + industries, range(len(thresholds) + 1)):
+        # Band 0 is below every threshold; band b covers [thresholds[b-1], thresholds[b])
+        headcount = thresholds[band - 1] if band else None
+        index[(state, industry, band)] = tuple(
+            position for position, rule in enumerate(rules)
+            if (rule['min_employees'] is None or (headcount is not None and headcount >= rule['min_employees']))
+            and (rule['industries'] is None or industry in rule['industries'])
+            and (rule['states'] is None or state in rule['states'])
+        )
+
+    return {
+        'thresholds': thresholds,
+        'states': frozenset(states),
+        'industries': frozenset(industries),
+        'index': index,
+        'checklists': {key: tuple(rules[position]['text'] for position in positions)
+                       for key, positions in index.items()}
+    }
+
+COMPLIANCE_INDEX = compile_compliance_index(COMPLIANCE_RULES)
+
+def compliance_key(state, num_employees, industry_type, compiled=COMPLIANCE_INDEX):
+    """
+    Map establishment details onto a decision index key
+
+    Args:
+        state: State of operation
+        num_employees: Number of employees
+        industry_type: Type of industry
+
+    Returns:
+        tuple: (state, industry, headcount band)
+    """
+    state = state.lower()
+    industry = industry_type.lower()
+    return (
+        state if state in compiled['states'] else OTHER,
+        industry if industry in compiled['industries'] else OTHER,
+        bisect_right(compiled['thresholds'], num_employees)
+    )
+
+def lookup_requirements(state, num_employees, industry_type, compiled=COMPLIANCE_INDEX):
+    """
+    Return the positions (in COMPLIANCE_RULES) of every applicable requirement
+
+    Returns:
+        tuple: Rule positions in checklist order
+    """
+    return compiled['index'][compliance_key(state, num_employees, industry_type, compiled)]
+
+def lookup_checklist(state, num_employees, industry_type, compiled=COMPLIANCE_INDEX):
+    """
+    Return the precompiled checklist text for an establishment
+
+    Returns:
+        tuple: Requirement texts in checklist order
+    """
+    return compiled['checklists'][compliance_key(state, num_employees, industry_type, compiled)]
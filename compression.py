@@ -0,0 +1,85 @@
+"""
+Response Compression for Indian Labor Law Compliance System
+gzip and (when the brotli package is installed) Brotli encoding of response bodies
+
+Whole bodies are compressed in one call. Streamed bodies (payroll CSV, batch
+NDJSON) are compressed chunk by chunk with a sync flush after every chunk, so
+the client still receives rows as they are produced.
+"""
+
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Content types worth compressing; everything else (PDF, ZIP, Parquet...) is already compact
+COMPRESSIBLE_TYPES = frozenset((
+    'text/html', 'text/css', 'text/plain', 'text/csv', 'text/calendar', 'text/javascript',
+    'application/javascript', 'application/json', 'application/x-ndjson', 'application/xml',
+    'image/svg+xml'
+))
+
+def available_encodings():
+    """Encodings this server can produce, most preferred first"""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+def choose_encoding(accept_encodings):
+    """
+    Pick the content coding for a request
+
+    Args:
+        accept_encodings: The request's parsed Accept-Encoding header
+                          (werkzeug request.accept_encodings)
+
+    Returns:
+        str: 'br', 'gzip', or None to send the body as is
+    """
+    return accept_encodings.best_match(available_encodings())
+
+def _gzip_compressor(level):
+    # wbits 16 + MAX_WBITS writes a gzip header and trailer
+    return zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+def compress(body, encoding, level=6):
+    """
+    Compress a whole body
+
+    Args:
+        body: bytes
+        encoding: 'br' or 'gzip'
+        level: gzip level (1-9); Brotli quality is derived from it
+
+    Returns:
+        bytes
+    """
+    if encoding == 'br':
+        return brotli.compress(body, quality=min(level, 11))
+    compressor = _gzip_compressor(level)
+    return compressor.compress(body) + compressor.flush()
+
+def compress_stream(chunks, encoding, level=6):
+    """
+    Compress a streamed body, flushing after every chunk
+
+    Args:
+        chunks: Iterable of bytes
+        encoding: 'br' or 'gzip'
+        level: As for compress()
+
+    Returns:
+        iterator: Compressed bytes
+    """
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=min(level, 11))
+        for chunk in chunks:
+            if chunk:
+                yield compressor.process(chunk) + compressor.flush()
+        yield compressor.finish()
+        return
+    compressor = _gzip_compressor(level)
+    for chunk in chunks:
+        if chunk:
+            yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
@@ -3,7 +3,18 @@ Indian Labor Law Compliance System - Core Calculators
 Handles Gratuity, PF, ESI, and Leave calculations as per Indian labor laws
 """
 
-def calculate_gratuity(last_drawn_salary, years_of_service, sector='private', is_covered_establishment=True):
+from compliance_rules import lookup_checklist
+from memoize import memoized, set_key_version
+from rates import rates_on, rules_key
+
+# Wage ceilings, rates and caps come from the effective-dated registry in
+# rates.py. Memoized results are keyed on the rules in force (and, for calls
+# without a pay period, on today's date) so a reload never serves stale results.
+set_key_version(rules_key)
+
+@memoized
+def calculate_gratuity(last_drawn_salary, years_of_service, sector='private', is_covered_establishment=True,
+                       pay_period=None):
     """
     Calculate gratuity as per Payment of Gratuity Act, 1972 (Private) or CCS Rules (Government)
     
@@ -12,6 +23,7 @@ def calculate_gratuity(last_drawn_salary, years_of_service, sector='private', is
         years_of_service: Total years of service
         sector: 'private' or 'government'
         is_covered_establishment: True for establishments covered under the Act
+        pay_period: Date the gratuity becomes payable, for the cap in force (default: today)
     
     Returns:
         dict: Contains gratuity amount and eligibility status
@@ -28,9 +40,9 @@ def calculate_gratuity(last_drawn_salary, years_of_service, sector='private', is
         }
     
     # Formula: (Last Drawn Salary / 26) * 15 * Years of Service
-    # Maximum gratuity: Rs. 20,00,000 (as per 2018 amendment)
+    # Maximum gratuity: Rs. 20,00,000 since the 2018 amendment
     gratuity_amount = (last_drawn_salary / 26) * 15 * years_of_service
-    max_gratuity = 2000000  # Rs. 20 lakhs
+    max_gratuity = rates_on(pay_period)['gratuity_cap']
     
     if gratuity_amount > max_gratuity:
         gratuity_amount = max_gratuity
@@ -42,6 +54,7 @@ def calculate_gratuity(last_drawn_salary, years_of_service, sector='private', is
         'sector': 'private'
     }
 
+@memoized
 def calculate_government_gratuity(last_drawn_salary, years_of_service):
     """
     Calculate gratuity for government employees as per CCS (Pension) Rules
@@ -72,7 +85,9 @@ def calculate_government_gratuity(last_drawn_salary, years_of_service):
         'note': 'No maximum limit for government employees'
     }
 
-def calculate_pf_contribution(basic_salary, da=0, sector='private', employee_contribution_rate=12, employer_contribution_rate=12):
+@memoized
+def calculate_pf_contribution(basic_salary, da=0, sector='private', employee_contribution_rate=12, employer_contribution_rate=12,
+                              pay_period=None):
     """
     Calculate PF/GPF contribution as per applicable rules
     
@@ -82,6 +97,7 @@ def calculate_pf_contribution(basic_salary, da=0, sector='private', employee_con
         sector: 'private' or 'government'
         employee_contribution_rate: Employee contribution percentage (default 12%)
         employer_contribution_rate: Employer contribution percentage (default 12%)
+        pay_period: Month of the wages, for the ceiling and EPS rate in force (default: today)
     
     Returns:
         dict: PF/GPF contribution details
@@ -89,14 +105,16 @@ def calculate_pf_contribution(basic_salary, da=0, sector='private', employee_con
     if sector == 'government':
         return calculate_government_gpf(basic_salary, da)
     
-    # PF is calculated on Basic + DA, capped at Rs. 15,000
-    pf_eligible_salary = min(basic_salary + da, 15000)
+    rates = rates_on(pay_period)
+    
+    # PF is calculated on Basic + DA, capped at the wage ceiling (Rs. 15,000 since September 2014)
+    pf_eligible_salary = min(basic_salary + da, rates['pf_wage_ceiling'])
     
     employee_contribution = (pf_eligible_salary * employee_contribution_rate) / 100
     employer_contribution = (pf_eligible_salary * employer_contribution_rate) / 100
     
     # Employer contribution split: 8.33% to EPS, 3.67% to EPF
-    eps_contribution = (pf_eligible_salary * 8.33) / 100
+    eps_contribution = (pf_eligible_salary * rates['eps_rate']) / 100
     epf_contribution = employer_contribution - eps_contribution
     
     return {
@@ -109,6 +127,7 @@ def calculate_pf_contribution(basic_salary, da=0, sector='private', employee_con
         'sector': 'private'
     }
 
+@memoized
 def calculate_government_gpf(basic_salary, da=0):
     """
     Calculate GPF for government employees
@@ -133,7 +152,8 @@ def calculate_government_gpf(basic_salary, da=0):
         'note': 'GPF contribution is voluntary, minimum 6% of basic pay'
     }
 
-def calculate_nps_contribution(basic_salary, da=0, employee_rate=10, employer_rate=14):
+@memoized
+def calculate_nps_contribution(basic_salary, da=0, employee_rate=10, employer_rate=None, pay_period=None):
     """
     Calculate NPS contribution for government employees (post-2004 recruits)
     
@@ -141,11 +161,15 @@ def calculate_nps_contribution(basic_salary, da=0, employee_rate=10, employer_ra
         basic_salary: Basic pay
         da: Dearness allowance
         employee_rate: Employee contribution rate (default 10%)
-        employer_rate: Government contribution rate (default 14%)
+        employer_rate: Government contribution rate (default: the rate in force, 14% since April 2019)
+        pay_period: Month of the wages (default: today)
     
     Returns:
         dict: NPS contribution details
     """
+    if employer_rate is None:
+        employer_rate = rates_on(pay_period)['nps_employer_rate']
+    
     nps_eligible_salary = basic_salary + da
     
     employee_contribution = (nps_eligible_salary * employee_rate) / 100
@@ -161,19 +185,23 @@ def calculate_nps_contribution(basic_salary, da=0, employee_rate=10, employer_ra
         'sector': 'government'
     }
 
-def is_esi_applicable(monthly_salary, state='general'):
+@memoized
+def is_esi_applicable(monthly_salary, state='general', pay_period=None):
     """
     Check ESI eligibility as per Employees' State Insurance Act, 1948
     
     Args:
         monthly_salary: Monthly salary
         state: State (some states have different limits)
+        pay_period: Month of the wages, for the limit and rates in force (default: today)
     
     Returns:
         dict: ESI eligibility and contribution details
     """
-    # ESI wage limit: Rs. 21,000 per month (as of 2022)
-    esi_wage_limit = 21000
+    rates = rates_on(pay_period)
+    
+    # ESI wage limit: Rs. 21,000 per month since January 2017
+    esi_wage_limit = rates['esi_wage_limit']
     
     if monthly_salary > esi_wage_limit:
         return {
@@ -183,9 +211,9 @@ def is_esi_applicable(monthly_salary, state='general'):
             'employer_contribution': 0
         }
     
-    # ESI contribution rates: Employee 0.75%, Employer 3.25%
-    employee_rate = 0.75
-    employer_rate = 3.25
+    # ESI contribution rates: Employee 0.75%, Employer 3.25% since July 2019
+    employee_rate = rates['esi_employee_rate']
+    employer_rate = rates['esi_employer_rate']
     
     employee_contribution = (monthly_salary * employee_rate) / 100
     employer_contribution = (monthly_salary * employer_rate) / 100
@@ -197,6 +225,7 @@ def is_esi_applicable(monthly_salary, state='general'):
         'total_contribution': round(employee_contribution + employer_contribution, 2)
     }
 
+@memoized
 def calculate_leave_entitlement(days_worked_in_year, state='general', establishment_type='factory', sector='private'):
     """
     Calculate leave entitlement as per applicable laws
@@ -244,6 +273,7 @@ def calculate_leave_entitlement(days_worked_in_year, state='general', establishm
         'sector': 'private'
     }
 
+@memoized
 def calculate_government_leave_entitlement():
     """
     Calculate leave entitlement for government employees as per CCS (Leave) Rules
@@ -264,10 +294,14 @@ def calculate_government_leave_entitlement():
         'note': 'As per CCS (Leave) Rules, 1972'
     }
 
+@memoized
 def generate_compliance_checklist(state, num_employees, industry_type):
     """
     Generate compliance checklist based on establishment details
     
+    The requirements live in the rules table in compliance_rules.py, which is
+    compiled at import into an index keyed by (state, industry, headcount band).
+    
     Args:
         state: State of operation
         num_employees: Number of employees
@@ -276,57 +310,25 @@ def generate_compliance_checklist(state, num_employees, industry_type):
     Returns:
         list: Compliance requirements checklist
     """
-    checklist = []
-    
-    # Basic registrations for all establishments
-    checklist.append("Obtain Trade License from local municipal authority")
-    checklist.append("Register for GST if annual turnover exceeds Rs. 20 lakhs")
-    
-    # Employee-based compliances
-    if num_employees >= 1:
-        checklist.append("Maintain attendance register for all employees")
-        checklist.append("Issue appointment letters to all employees")
-    
-    if num_employees >= 10:
-        checklist.append("Register under applicable Shops and Establishment Act")
-        if industry_type.lower() == 'factory':
-            checklist.append("Register under Factories Act, 1948")
-            checklist.append("Obtain Factory License from State Factory Inspector")
-    
-    if num_employees >= 20:
-        checklist.append("Register for Employee Provident Fund (EPF)")
-        checklist.append("Register for Employee State Insurance (ESI)")
-        checklist.append("Comply with Payment of Gratuity Act, 1972")
-    
-    if num_employees >= 30:
-        checklist.append("Constitute Internal Complaints Committee (ICC) for POSH Act")
-    
-    if num_employees >= 100:
-        checklist.append("Register under Contract Labour Act (if applicable)")
-    
-    # Industry-specific compliances
-    if industry_type.lower() == 'factory':
-        checklist.append("Maintain factory registers as per Factories Act")
-        checklist.append("Conduct annual medical examination of workers")
-        if num_employees >= 50:
-            checklist.append("Appoint Safety Officer")
-    
-    if industry_type.lower() in ['it', 'software', 'services']:
-        checklist.append("Comply with IT Act provisions for data protection")
-        checklist.append("Register under Professional Tax Act")
-    
-    # State-specific additions
-    state_lower = state.lower()
-    if state_lower == 'maharashtra':
-        checklist.append("Register under Maharashtra Shops and Establishment Act")
-        if num_employees >= 5:
-            checklist.append("Register for Professional Tax in Maharashtra")
-    elif state_lower == 'karnataka':
-        checklist.append("Register under Karnataka Shops and Commercial Establishment Act")
-    elif state_lower == 'tamil nadu':
-        checklist.append("Register under Tamil Nadu Shops and Establishment Act")
-    
-    return checklist
+    return list(lookup_checklist(state, num_employees, industry_type))
+
+def generate_compliance_checklists(establishments):
+    """
+    Generate compliance checklists for many establishments in one call
+    
+    Args:
+        establishments: Iterable of (state, num_employees, industry_type) tuples
+                        or dicts with those keys (e.g. every branch of a company)
+    
+    Returns:
+        list: One checklist per establishment, in input order
+    """
+    checklists = []
+    for establishment in establishments:
+        if isinstance(establishment, dict):
+            establishment = (establishment['state'], establishment['num_employees'], establishment['industry_type'])
+        checklists.append(generate_compliance_checklist(*establishment))
+    return checklists
 
 # Test functions
 def run_tests():
@@ -0,0 +1,41 @@
+"""
+Gunicorn settings for running StatutoryCalc in production
+
+    gunicorn -c gunicorn.conf.py
+
+Every setting can be overridden with the environment variable named next to it.
+"""
+
+import multiprocessing
+import os
+
+wsgi_app = 'wsgi:application'
+
+# Address to listen on (BIND, or PORT on all interfaces)
+bind = os.environ.get('BIND', f"0.0.0.0:{os.environ.get('PORT', '5000')}")
+
+# Load and warm up the application in the master before forking (see wsgi.py)
+preload_app = True
+
+# Worker processes (WEB_CONCURRENCY) with threads each (GUNICORN_THREADS); threaded
+# workers keep streamed downloads (bulk ZIPs, payroll CSVs) from blocking a whole process
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# Bulk PDF and payroll downloads can stream for a while
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = 5
+
+# Recycle workers now and then; they are forked again from the warm master
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 10000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 1000))
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+def when_ready(server):
+    from app import app
+    server.log.info('StatutoryCalc warmed up: %s', app.extensions.get('warm_up'))
@@ -1,110 +1,429 @@
 """
 Government Holiday Calendar for Indian Labor Law Compliance System
-Contains Central Government and Assam-specific holidays
+Contains Central Government and state-specific holidays
+
+Holiday lists are loaded from data/holidays/<year>/<state>.json. Each
+(year, state) calendar is parsed once into date-keyed and per-month indexes
+and cached, so lookups never re-read, re-parse or re-sort the lists.
+NumPy is only imported by the working-day counts that use it.
 """
 
-from datetime import datetime, date
+import json
+import os
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import datetime, date, timedelta
+
+HOLIDAY_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'holidays')
+
+CENTRAL = 'central'
+
+class HolidayCalendar:
+    """
+    Preparsed holidays for one (year, state)
+
+    Attributes:
+        year: Calendar year
+        state: Normalized state key ('central' for central government only)
+        holidays: Tuple of (date, name, type) sorted by date
+        by_date: {date: tuple of (date, name, type)} for O(1) lookups
+        by_month: {month number: tuple of (date, name, type)}
+    """
+
+    def __init__(self, year, state, holidays):
+        self.year = year
+        self.state = state
+        # Stable sort keeps central holidays ahead of state ones on the same date
+        self.holidays = tuple(sorted(holidays, key=lambda holiday: holiday[0]))
+        self._dates = [holiday[0] for holiday in self.holidays]
+        by_date = {}
+        by_month = {}
+        for holiday in self.holidays:
+            by_date.setdefault(holiday[0], []).append(holiday)
+            by_month.setdefault(holiday[0].month, []).append(holiday)
+        self.by_date = {day: tuple(entries) for day, entries in by_date.items()}
+        self.by_month = {month: tuple(entries) for month, entries in by_month.items()}
+        self.holiday_dates = frozenset(self.by_date)
+
+    def is_holiday(self, day):
+        """Return True if the date is a holiday (constant time)"""
+        return day in self.holiday_dates
+
+    def holidays_on(self, day):
+        """Return the holidays falling on a date"""
+        return self.by_date.get(day, ())
+
+    def holidays_between(self, start, end):
+        """Return holidays with start <= date <= end (logarithmic time)"""
+        return self.holidays[bisect_left(self._dates, start):bisect_right(self._dates, end)]
+
+    def holidays_in_month(self, month):
+        """Return the holidays in a month (1-12)"""
+        return self.by_month.get(month, ())
+
+def _state_key(state):
+    return (state or CENTRAL).strip().lower().replace(' ', '_') or CENTRAL
+
+def _data_path(year, state_key):
+    return os.path.join(HOLIDAY_DATA_DIR, str(year), f'{state_key}.json')
+
+def _load_holiday_file(path):
+    """Parse a holiday data file into (date, name, type) tuples"""
+    with open(path, encoding='utf-8') as f:
+        entries = json.load(f)
+    return [(datetime.strptime(entry['date'], '%Y-%m-%d').date(), entry['name'], entry['type'])
+            for entry in entries]
+
+_calendars = {}
+_calendars_lock = threading.Lock()
+_available_files = None
+
+def _available_data_files():
+    """Return the set of (year, state_key) pairs that have a data file"""
+    global _available_files
+    if _available_files is None:
+        available = set()
+        if os.path.isdir(HOLIDAY_DATA_DIR):
+            for year in os.listdir(HOLIDAY_DATA_DIR):
+                year_dir = os.path.join(HOLIDAY_DATA_DIR, year)
+                if year.isdigit() and os.path.isdir(year_dir):
+                    available.update((int(year), name[:-5]) for name in os.listdir(year_dir)
+                                     if name.endswith('.json'))
+        _available_files = frozenset(available)
+    return _available_files
+
+def get_holiday_calendar(year=2025, state='central'):
+    """
+    Get the cached holiday calendar for a year and state
+
+    Central Government holidays apply everywhere; a state with its own data
+    file adds its holidays on top. States without a data file (and years
+    without data) fall back to the central list (or an empty calendar).
+
+    Args:
+        year: Calendar year
+        state: State name, or 'central'
+
+    Returns:
+        HolidayCalendar: Shared, read-only calendar
+    """
+    year = int(year)
+    state_key = _state_key(state)
+    if (year, state_key) not in _available_data_files():
+        state_key = CENTRAL
+
+    key = (year, state_key)
+    calendar = _calendars.get(key)
+    if calendar is None:
+        with _calendars_lock:
+            calendar = _calendars.get(key)
+            if calendar is None:
+                calendar = _build_calendar(*key)
+                _calendars[key] = calendar
+    return calendar
+
+def _build_calendar(year, state_key):
+    holidays = []
+    for source in (CENTRAL, state_key) if state_key != CENTRAL else (CENTRAL,):
+        if (year, source) in _available_data_files():
+            holidays.extend(_load_holiday_file(_data_path(year, source)))
+    return HolidayCalendar(year, state_key, holidays)
+
+def clear_holiday_cache():
+    """Drop all cached calendars (e.g. after updating the data files)"""
+    global _available_files
+    with _calendars_lock:
+        _calendars.clear()
+        _working_day_indexes.clear()
+        _summaries.clear()
+        _available_files = None
+
+def _as_dicts(holidays):
+    return [{'date': day.strftime('%Y-%m-%d'), 'name': name, 'type': holiday_type}
+            for day, name, holiday_type in holidays]
+
+def _load_unsorted(year, state_key):
+    path = _data_path(year, state_key)
+    return _as_dicts(_load_holiday_file(path)) if os.path.exists(path) else []
 
 def get_central_government_holidays_2025():
     """Get Central Government holidays for 2025"""
-    holidays = [
-        {'date': '2025-01-01', 'name': 'New Year\'s Day', 'type': 'Gazetted'},
-        {'date': '2025-01-26', 'name': 'Republic Day', 'type': 'Gazetted'},
-        {'date': '2025-03-14', 'name': 'Holi', 'type': 'Gazetted'},
-        {'date': '2025-04-14', 'name': 'Dr. Ambedkar Jayanti', 'type': 'Gazetted'},
-        {'date': '2025-04-18', 'name': 'Good Friday', 'type': 'Gazetted'},
-        {'date': '2025-05-01', 'name': 'May Day', 'type': 'Gazetted'},
-        {'date': '2025-08-15', 'name': 'Independence Day', 'type': 'Gazetted'},
-        {'date': '2025-10-02', 'name': 'Gandhi Jayanti', 'type': 'Gazetted'},
-        {'date': '2025-10-20', 'name': 'Dussehra', 'type': 'Gazetted'},
-        {'date': '2025-11-09', 'name': 'Diwali', 'type': 'Gazetted'},
-        {'date': '2025-11-10', 'name': 'Govardhan Puja', 'type': 'Gazetted'},
-        {'date': '2025-12-25', 'name': 'Christmas Day', 'type': 'Gazetted'},
-        
-        # Restricted holidays (employees can choose 2)
-        {'date': '2025-01-14', 'name': 'Makar Sankranti', 'type': 'Restricted'},
-        {'date': '2025-02-26', 'name': 'Maha Shivratri', 'type': 'Restricted'},
-        {'date': '2025-03-13', 'name': 'Holika Dahan', 'type': 'Restricted'},
-        {'date': '2025-04-13', 'name': 'Baisakhi', 'type': 'Restricted'},
-        {'date': '2025-04-17', 'name': 'Ram Navami', 'type': 'Restricted'},
-        {'date': '2025-05-12', 'name': 'Buddha Purnima', 'type': 'Restricted'},
-        {'date': '2025-08-12', 'name': 'Raksha Bandhan', 'type': 'Restricted'},
-        {'date': '2025-08-20', 'name': 'Janmashtami', 'type': 'Restricted'},
-        {'date': '2025-09-07', 'name': 'Ganesh Chaturthi', 'type': 'Restricted'},
-        {'date': '2025-10-21', 'name': 'Karva Chauth', 'type': 'Restricted'},
-        {'date': '2025-11-05', 'name': 'Dhanteras', 'type': 'Restricted'},
-        {'date': '2025-11-11', 'name': 'Bhai Dooj', 'type': 'Restricted'}
-    ]
-    return holidays
+    return _load_unsorted(2025, CENTRAL)
 
 def get_assam_specific_holidays_2025():
     """Get Assam-specific holidays for 2025"""
-    holidays = [
-        {'date': '2025-01-15', 'name': 'Magh Bihu/Bhogali Bihu', 'type': 'State'},
-        {'date': '2025-04-14', 'name': 'Bohag Bihu/Rongali Bihu (Day 1)', 'type': 'State'},
-        {'date': '2025-04-15', 'name': 'Bohag Bihu/Rongali Bihu (Day 2)', 'type': 'State'},
-        {'date': '2025-04-16', 'name': 'Bohag Bihu/Rongali Bihu (Day 3)', 'type': 'State'},
-        {'date': '2025-10-16', 'name': 'Kati Bihu/Kongali Bihu', 'type': 'State'},
-        {'date': '2025-11-01', 'name': 'Kali Puja', 'type': 'State'},
-        {'date': '2025-11-24', 'name': 'Guru Nanak Jayanti', 'type': 'State'},
-        {'date': '2025-12-23', 'name': 'Srimanta Sankardeva\'s Birthday', 'type': 'State'},
-        
-        # Additional Assam festivals
-        {'date': '2025-02-18', 'name': 'Saraswati Puja', 'type': 'State'},
-        {'date': '2025-03-31', 'name': 'Chaitra Sankranti', 'type': 'State'},
-        {'date': '2025-06-21', 'name': 'Ambubachi Mela (Start)', 'type': 'State'},
-        {'date': '2025-08-31', 'name': 'Manasa Puja', 'type': 'State'},
-        {'date': '2025-09-17', 'name': 'Vishwakarma Puja', 'type': 'State'}
-    ]
-    return holidays
+    return _load_unsorted(2025, 'assam')
+
+def get_all_holidays(year=2025, state='central'):
+    """Get all holidays for a year based on state, sorted by date"""
+    return _as_dicts(get_holiday_calendar(year, state).holidays)
 
 def get_all_holidays_2025(state='central'):
     """Get all holidays for 2025 based on state"""
-    central_holidays = get_central_government_holidays_2025()
-    
-    if state.lower() == 'assam':
-        assam_holidays = get_assam_specific_holidays_2025()
-        all_holidays = central_holidays + assam_holidays
-    else:
-        all_holidays = central_holidays
-    
-    # Sort by date
-    all_holidays.sort(key=lambda x: datetime.strptime(x['date'], '%Y-%m-%d'))
-    return all_holidays
+    return get_all_holidays(2025, state)
+
+def is_holiday(day, state='central'):
+    """Check whether a date is a holiday for the state"""
+    return get_holiday_calendar(day.year, state).is_holiday(day)
+
+def get_holidays_in_range(start, end, state='central'):
+    """Get holidays between two dates (inclusive), across years if needed"""
+    holidays = []
+    for year in range(start.year, end.year + 1):
+        holidays.extend(get_holiday_calendar(year, state).holidays_between(start, end))
+    return _as_dicts(holidays)
 
 def get_holidays_by_month(year=2025, state='central'):
     """Get holidays organized by month"""
-    holidays = get_all_holidays_2025(state)
+    calendar = get_holiday_calendar(year, state)
     months = {}
-    
-    for holiday in holidays:
-        holiday_date = datetime.strptime(holiday['date'], '%Y-%m-%d')
-        month_name = holiday_date.strftime('%B')
-        
-        if month_name not in months:
-            months[month_name] = []
-        
-        months[month_name].append({
-            'date': holiday_date.strftime('%d'),
-            'day': holiday_date.strftime('%A'),
-            'name': holiday['name'],
-            'type': holiday['type']
-        })
-    
+
+    for month in sorted(calendar.by_month):
+        holidays = calendar.by_month[month]
+        months[holidays[0][0].strftime('%B')] = [
+            {
+                'date': day.strftime('%d'),
+                'day': day.strftime('%A'),
+                'name': name,
+                'type': holiday_type
+            }
+            for day, name, holiday_type in holidays
+        ]
+
     return months
 
-def count_working_days(year=2025, state='central'):
-    """Calculate working days in a year excluding holidays and Sundays"""
-    holidays = get_all_holidays_2025(state)
-    holiday_dates = [datetime.strptime(h['date'], '%Y-%m-%d').date() for h in holidays]
-    
-    total_days = 365 if year % 4 != 0 else 366
-    sundays = 52 if year % 4 != 0 else 53  # Approximate
-    
-    working_days = total_days - len(holiday_dates) - sundays
+WEEKLY_OFF_POLICIES = ('sunday', 'sat_sun', 'second_fourth_saturday')
+
+def is_weekly_off(day, weekly_off='sunday'):
+    """
+    Check whether a date is a weekly off
+
+    Args:
+        day: Date to check
+        weekly_off: 'sunday' (Sundays only), 'sat_sun' (Saturdays and Sundays)
+                    or 'second_fourth_saturday' (Sundays plus 2nd and 4th Saturdays)
+    """
+    weekday = day.weekday()
+    if weekday == 6:
+        return True
+    if weekday == 5:
+        if weekly_off == 'sat_sun':
+            return True
+        if weekly_off == 'second_fourth_saturday':
+            return (day.day - 1) // 7 in (1, 3)
+    return False
+
+class WorkingDayIndex:
+    """
+    Precomputed working-day counts for one (year, state, weekly off policy)
+
+    prefix[i] is the number of working days among the first i days of the
+    year, so the working days in any date range within the year is a single
+    subtraction.
+    """
+
+    def __init__(self, calendar, weekly_off):
+        import numpy as np
+
+        self.year = calendar.year
+        first_day = date(calendar.year, 1, 1)
+        total_days = (date(calendar.year + 1, 1, 1) - first_day).days
+        self._first_ordinal = first_day.toordinal()
+        days = [first_day + timedelta(days=offset) for offset in range(total_days)]
+
+        weekly_offs = [is_weekly_off(day, weekly_off) for day in days]
+        holidays = [calendar.is_holiday(day) for day in days]
+        working = [not (off or holiday) for off, holiday in zip(weekly_offs, holidays)]
+
+        self.prefix = np.concatenate(([0], np.cumsum(working, dtype=np.int32)))
+        self.total_days = total_days
+        self.sundays = sum(1 for day in days if day.weekday() == 6)
+        self.weekly_offs = sum(weekly_offs)
+        # A holiday falling on a weekly off is only counted once
+        self.holidays = sum(1 for off, holiday in zip(weekly_offs, holidays) if holiday and not off)
+        self.holidays_on_weekly_off = sum(1 for off, holiday in zip(weekly_offs, holidays) if holiday and off)
+        self.working_days = int(self.prefix[-1])
+
+    def between(self, start, end):
+        """Working days from start to end inclusive (both within this year)"""
+        return int(self.prefix[end.toordinal() - self._first_ordinal + 1]
+                   - self.prefix[start.toordinal() - self._first_ordinal])
+
+_working_day_indexes = {}
+
+def get_working_day_index(year=2025, state='central', weekly_off='sunday'):
+    """Get the cached working-day index for a year, state and weekly off policy"""
+    if weekly_off not in WEEKLY_OFF_POLICIES:
+        raise ValueError(f'Unknown weekly off policy: {weekly_off}')
+    calendar = get_holiday_calendar(year, state)
+    key = (calendar.year, calendar.state, weekly_off)
+    index = _working_day_indexes.get(key)
+    if index is None:
+        with _calendars_lock:
+            index = _working_day_indexes.get(key)
+            if index is None:
+                index = WorkingDayIndex(calendar, weekly_off)
+                _working_day_indexes[key] = index
+    return index
+
+def count_working_days_between(start, end, state='central', weekly_off='sunday'):
+    """
+    Count working days between two dates (inclusive)
+
+    Args:
+        start: First date of the range
+        end: Last date of the range
+        state: State whose holidays apply
+        weekly_off: Weekly off policy (see WEEKLY_OFF_POLICIES)
+
+    Returns:
+        int: Working days (0 if end is before start)
+    """
+    if isinstance(start, datetime):
+        start = start.date()
+    if isinstance(end, datetime):
+        end = end.date()
+    if end < start:
+        return 0
+    if start.year == end.year:
+        return get_working_day_index(start.year, state, weekly_off).between(start, end)
+
+    working_days = get_working_day_index(start.year, state, weekly_off).between(start, date(start.year, 12, 31))
+    for year in range(start.year + 1, end.year):
+        working_days += get_working_day_index(year, state, weekly_off).working_days
+    working_days += get_working_day_index(end.year, state, weekly_off).between(date(end.year, 1, 1), end)
+    return working_days
+
+def count_working_days_bulk(starts, ends, state='central', weekly_off='sunday'):
+    """
+    Count working days for many date ranges at once
+
+    Args:
+        starts: Sequence/array of range start dates (date objects or datetime64)
+        ends: Sequence/array of range end dates (inclusive)
+        state: State whose holidays apply
+        weekly_off: Weekly off policy (see WEEKLY_OFF_POLICIES)
+
+    Returns:
+        numpy.ndarray: Working days per range (0 where end is before start)
+    """
+    import numpy as np
+
+    starts = np.asarray(starts, dtype='datetime64[D]')
+    ends = np.asarray(ends, dtype='datetime64[D]')
+    if starts.size == 0:
+        return np.zeros(starts.shape, dtype=np.int64)
+
+    first_year = int(min(starts.min(), ends.min()).astype('datetime64[Y]').astype(int)) + 1970
+    last_year = int(max(starts.max(), ends.max()).astype('datetime64[Y]').astype(int)) + 1970
+
+    # Chain the per-year prefix sums into one running count over the whole span
+    daily = [np.diff(get_working_day_index(year, state, weekly_off).prefix)
+             for year in range(first_year, last_year + 1)]
+    prefix = np.concatenate(([0], np.cumsum(np.concatenate(daily), dtype=np.int64)))
+
+    origin = np.datetime64(f'{first_year:04d}-01-01', 'D')
+    start_offsets = (starts - origin).astype(np.int64)
+    end_offsets = (ends - origin).astype(np.int64)
+    counts = prefix[end_offsets + 1] - prefix[start_offsets]
+    return np.where(end_offsets >= start_offsets, counts, 0)
+
+def count_working_days(year=2025, state='central', weekly_off='sunday'):
+    """Calculate working days in a year excluding holidays and weekly offs"""
+    index = get_working_day_index(year, state, weekly_off)
     return {
-        'total_days': total_days,
-        'holidays': len(holiday_dates),
-        'sundays': sundays,
-        'working_days': working_days
-    }
\ No newline at end of file
+        'total_days': index.total_days,
+        'holidays': index.holidays,
+        'sundays': index.sundays,
+        'weekly_offs': index.weekly_offs,
+        'holidays_on_weekly_off': index.holidays_on_weekly_off,
+        'working_days': index.working_days
+    }
+
+def available_holiday_calendars():
+    """Return the sorted (year, state) pairs that have holiday data"""
+    return sorted(_available_data_files())
+
+_summaries = {}
+
+def get_holiday_summary(year=2025, state='central'):
+    """
+    Get the precomputed holiday listing for a year and state
+
+    Built once per calendar and shared, so callers must not modify it.
+
+    Returns:
+        dict: {'year', 'state', 'holidays' (sorted, ISO dates), 'months'
+               (as get_holidays_by_month), 'working_days' (as count_working_days)}
+    """
+    calendar = get_holiday_calendar(year, state)
+    key = (calendar.year, calendar.state)
+    summary = _summaries.get(key)
+    if summary is None:
+        summary = {
+            'year': calendar.year,
+            'state': calendar.state,
+            'holidays': get_all_holidays(*key),
+            'months': get_holidays_by_month(*key),
+            'working_days': count_working_days(*key)
+        }
+        with _calendars_lock:
+            _summaries[key] = summary
+    return summary
+
+def warm_holiday_cache():
+    """Precompute the calendar and summary for every (year, state) with data"""
+    for year, state in available_holiday_calendars():
+        get_holiday_summary(year, state)
+
+def _ics_text(value):
+    return value.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\n', '\\n')
+
+def _ics_fold(line):
+    # Content lines are limited to 75 octets; continuation lines start with a space
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line
+    parts = []
+    while encoded:
+        limit = 75 if not parts else 74
+        cut = min(limit, len(encoded))
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode('utf-8'))
+        encoded = encoded[cut:]
+    return '\r\n '.join(parts)
+
+def holidays_to_ics(year=2025, state='central'):
+    """
+    Export a holiday calendar as an iCalendar (RFC 5545) document
+
+    The output depends only on the holiday data, so it can be cached and
+    served with a strong ETag.
+
+    Returns:
+        str: VCALENDAR text with one all-day VEVENT per holiday
+    """
+    calendar = get_holiday_calendar(year, state)
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//StatutoryCalc//Holiday Calendar//EN',
+        'CALSCALE:GREGORIAN',
+        f'X-WR-CALNAME:Holidays {calendar.year} ({calendar.state})'
+    ]
+    for day, name, holiday_type in calendar.holidays:
+        uid_name = ''.join(ch if ch.isalnum() else '-' for ch in name.lower())
+        lines.extend([
+            'BEGIN:VEVENT',
+            f'UID:{day:%Y%m%d}-{uid_name}-{calendar.state}@statutorycalc',
+            f'DTSTAMP:{calendar.year}0101T000000Z',
+            f'DTSTART;VALUE=DATE:{day:%Y%m%d}',
+            f'DTEND;VALUE=DATE:{day + timedelta(days=1):%Y%m%d}',
+            f'SUMMARY:{_ics_text(name)}',
+            f'CATEGORIES:{_ics_text(holiday_type)}',
+            'TRANSP:TRANSPARENT',
+            'END:VEVENT'
+        ])
+    lines.append('END:VCALENDAR')
+    return ''.join(_ics_fold(line) + '\r\n' for line in lines)
@@ -0,0 +1,262 @@
+"""
+Request Instrumentation for StatutoryCalc
+Opt-in per-stage timings, Prometheus metrics and on-demand profiling
+
+Code marks its hot paths with stage():
+
+    with stage('calculate', 'pf'):
+        result = calculate_pf_contribution(basic, da)
+
+stage() only records anything while a request is being timed, so the
+calculators and the PDF generator can use it without depending on Flask;
+outside a timed request it costs a context-variable lookup.
+
+init_instrumentation(app) adds the Flask side: request and stage histograms
+exposed at /metrics in the Prometheus text format, a Server-Timing header,
+and cProfile (or pyinstrument) captures for requests flagged with an
+'X-Profile' header or a '_profile' query parameter.
+"""
+
+import contextlib
+import contextvars
+import os
+import threading
+import time
+from datetime import datetime
+
+# Upper bounds (seconds) of the histogram buckets
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUEST_METRIC = 'statutorycalc_request_duration_seconds'
+STAGE_METRIC = 'statutorycalc_stage_duration_seconds'
+
+class RequestTimings:
+    """Stage timings collected for one request"""
+
+    __slots__ = ('stages', 'calc_type')
+
+    def __init__(self):
+        self.stages = []
+        self.calc_type = None
+
+_current = contextvars.ContextVar('statutorycalc_request_timings', default=None)
+
+@contextlib.contextmanager
+def stage(name, calc_type=None):
+    """
+    Time a block as one stage of the current request
+
+    Args:
+        name: Stage name (e.g. 'parse', 'calculate', 'render', 'pdf_build')
+        calc_type: Calculation type the stage belongs to, if known
+    """
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    if calc_type and timings.calc_type is None:
+        timings.calc_type = calc_type
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.stages.append((name, time.perf_counter() - started))
+
+def start_timing():
+    """Start collecting stage timings in the current context; returns a token for stop_timing()"""
+    return _current.set(RequestTimings())
+
+def stop_timing(token):
+    """Stop collecting and return the RequestTimings"""
+    timings = _current.get()
+    _current.reset(token)
+    return timings
+
+class MetricsRegistry:
+    """Thread-safe histograms rendered in the Prometheus text exposition format"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._help = {}
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name, help_text):
+        self._help[name] = help_text
+
+    def observe(self, name, labels, value):
+        """
+        Record one observation
+
+        Args:
+            name: Metric name
+            labels: dict of label names to values
+            value: Observed value in seconds
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            counts = series[0]
+            for position, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[position] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        """Return all series as Prometheus text (cumulative buckets, _sum and _count)"""
+        with self._lock:
+            snapshot = sorted((key, ([*counts], total, count)) for key, (counts, total, count) in self._series.items())
+
+        lines = []
+        described = set()
+        for (name, labels), (counts, total, count) in snapshot:
+            if name not in described:
+                described.add(name)
+                if name in self._help:
+                    lines.append(f'# HELP {name} {self._help[name]}')
+                lines.append(f'# TYPE {name} histogram')
+            label_text = ','.join(f'{label}="{_escape(value)}"' for label, value in labels)
+            prefix = label_text + ',' if label_text else ''
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {count}')
+            lines.append(f'{name}_sum{{{label_text}}} {total}')
+            lines.append(f'{name}_count{{{label_text}}} {count}')
+        return '\n'.join(lines) + '\n'
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _profile_mode(request):
+    """'cprofile', 'pyinstrument' or None, from the X-Profile header or _profile query parameter"""
+    flag = (request.headers.get('X-Profile') or request.args.get('_profile') or '').lower()
+    if not flag or flag in ('0', 'false', 'no'):
+        return None
+    return 'pyinstrument' if flag == 'pyinstrument' else 'cprofile'
+
+def _start_profiler(mode):
+    if mode == 'pyinstrument':
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            mode = 'cprofile'
+        else:
+            profiler = Profiler()
+            profiler.start()
+            return mode, profiler
+    import cProfile
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Another profiler is already running (e.g. a concurrent profiled request)
+        return None
+    return mode, profiler
+
+def _save_profile(directory, mode, profiler, endpoint):
+    """Stop a profiler and write its output; returns the file name"""
+    os.makedirs(directory, exist_ok=True)
+    stem = f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}-{endpoint or 'unmatched'}"
+    if mode == 'pyinstrument':
+        profiler.stop()
+        filename = stem + '.html'
+        with open(os.path.join(directory, filename), 'w', encoding='utf-8') as output:
+            output.write(profiler.output_html())
+    else:
+        profiler.disable()
+        filename = stem + '.prof'
+        profiler.dump_stats(os.path.join(directory, filename))
+    return filename
+
+def init_instrumentation(app):
+    """
+    Register timing, metrics and profiling hooks on a Flask app
+
+    Settings are read per request, so they can be changed at runtime:
+        INSTRUMENTATION_ENABLED: time every request and serve /metrics
+        PROFILING_ENABLED: allow flagged requests to be profiled
+        PROFILE_DIR: directory that profiles are written to
+    """
+    # Flask is only needed by the web application, not by code calling stage()
+    from flask import Response, abort, g, request, before_render_template, template_rendered
+
+    registry = MetricsRegistry()
+    registry.describe(REQUEST_METRIC, 'Request duration in seconds by route and calc_type')
+    registry.describe(STAGE_METRIC, 'Duration of request stages in seconds by route, stage and calc_type')
+    app.extensions['metrics'] = registry
+
+    @app.before_request
+    def _start_request_instrumentation():
+        if app.config['PROFILING_ENABLED']:
+            mode = _profile_mode(request)
+            if mode:
+                profiler = _start_profiler(mode)
+                if profiler is not None:
+                    g._profiler = profiler
+        if not app.config['INSTRUMENTATION_ENABLED'] or request.endpoint == 'metrics':
+            return
+        g._timing_token = start_timing()
+        g._request_started = time.perf_counter()
+        if request.mimetype in ('application/x-www-form-urlencoded', 'multipart/form-data'):
+            # Parse the form here so it is timed as its own stage
+            with stage('parse'):
+                request.form
+
+    @app.after_request
+    def _finish_request_instrumentation(response):
+        profiler = g.pop('_profiler', None)
+        if profiler is not None:
+            filename = _save_profile(app.config['PROFILE_DIR'], *profiler, request.endpoint)
+            response.headers['X-Profile-File'] = filename
+
+        token = g.pop('_timing_token', None)
+        if token is None:
+            return response
+        elapsed = time.perf_counter() - g.pop('_request_started')
+        timings = stop_timing(token)
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        calc_type = timings.calc_type or (request.view_args or {}).get('calc_type') or ''
+        registry.observe(REQUEST_METRIC, {'route': route, 'method': request.method,
+                                          'status': str(response.status_code), 'calc_type': calc_type}, elapsed)
+        for name, seconds in timings.stages:
+            registry.observe(STAGE_METRIC, {'route': route, 'stage': name, 'calc_type': calc_type}, seconds)
+        response.headers['Server-Timing'] = ', '.join(
+            [f'{name};dur={seconds * 1000:.3f}' for name, seconds in timings.stages] +
+            [f'total;dur={elapsed * 1000:.3f}']
+        )
+        return response
+
+    @app.teardown_request
+    def _discard_request_instrumentation(error=None):
+        # Requests that raised skip after_request; make sure nothing leaks
+        profiler = g.pop('_profiler', None)
+        if profiler is not None:
+            _save_profile(app.config['PROFILE_DIR'], *profiler, request.endpoint)
+        token = g.pop('_timing_token', None)
+        if token is not None:
+            stop_timing(token)
+
+    def _template_started(sender, template, context, **extra):
+        g._render_started = time.perf_counter()
+
+    def _template_finished(sender, template, context, **extra):
+        started = g.pop('_render_started', None)
+        timings = _current.get()
+        if started is not None and timings is not None:
+            timings.stages.append(('render', time.perf_counter() - started))
+
+    before_render_template.connect(_template_started, app, weak=False)
+    template_rendered.connect(_template_finished, app, weak=False)
+
+    @app.route('/metrics')
+    def metrics():
+        """Prometheus metrics (only while instrumentation is enabled)"""
+        if not app.config['INSTRUMENTATION_ENABLED']:
+            abort(404)
+        return Response(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
\ No newline at end of file
@@ -0,0 +1,367 @@
+"""
+Background Job Queue for StatutoryCalc
+SQLite-backed queue with in-process worker threads for long-running work
+(bulk PDF reports, large calculation batches)
+
+A job is submitted, gets an id, reports progress while it runs and leaves an
+artifact file to download. Jobs are retried with backoff when they fail and
+are deleted, with their files, once they expire. Everything lives in one
+directory (jobs.sqlite3 plus input/output files), so no broker is needed and
+queued jobs survive a restart.
+"""
+
+import contextlib
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+
+from bulk_reports import read_employee_csv, read_employee_json, stream_reports_zip
+from calculations import CALCULATION_TYPES, prepare_report, run_batch_record
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    done INTEGER NOT NULL DEFAULT 0,
+    total INTEGER,
+    error TEXT,
+    filename TEXT,
+    mimetype TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    run_after REAL NOT NULL,
+    finished_at REAL,
+    expires_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, run_after, created_at);
+"""
+
+class JobError(Exception):
+    """A job failure that should not be retried (e.g. invalid input)"""
+
+class JobQueue:
+    """
+    Persistent job queue with a fixed pool of worker threads
+
+    Handlers are looked up by job kind and called as
+    handler(params, input_path, output, progress) where output is a binary file
+    for the artifact and progress(done, total=None) reports progress. They
+    return (filename, mimetype) for the download. Raising JobError fails the
+    job at once; any other exception is retried up to max_attempts times.
+    """
+
+    def __init__(self, directory, handlers, workers=2, max_attempts=3, retention_seconds=24 * 3600,
+                 retry_delay=2.0, poll_interval=1.0, stale_after=600):
+        self.directory = directory
+        self.handlers = dict(handlers)
+        self.workers = max(1, workers)
+        self.max_attempts = max(1, max_attempts)
+        self.retention_seconds = retention_seconds
+        self.retry_delay = retry_delay
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.database = os.path.join(directory, 'jobs.sqlite3')
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads = []
+        self._next_purge = 0.0
+
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as db:
+            db.execute('PRAGMA journal_mode=WAL')
+            db.executescript(_SCHEMA)
+            # Jobs left running by a process that died are queued again. A live
+            # worker keeps its job's updated_at fresh (see _heartbeat), so jobs
+            # running in a sibling process are never taken over
+            now = time.time()
+            db.execute("UPDATE jobs SET status = ?, run_after = ?, updated_at = ? WHERE status = ? AND updated_at < ?",
+                       (QUEUED, now, now, RUNNING, now - stale_after))
+
+    @contextlib.contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.database, timeout=30, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def _path(self, job_id, suffix):
+        return os.path.join(self.directory, f'{job_id}.{suffix}')
+
+    def start(self):
+        """Start the worker threads (idempotent)"""
+        if self._threads:
+            return
+        self._stopping.clear()
+        for number in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f'job-worker-{number}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=None):
+        """Ask the workers to stop once their current job is finished, and wait for them"""
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, kind, params=None, input_stream=None):
+        """
+        Queue a job
+
+        Args:
+            kind: Handler name
+            params: JSON-serializable parameters for the handler
+            input_stream: Optional binary stream (e.g. an upload) saved as the job's input file
+
+        Returns:
+            str: Job id
+        """
+        if kind not in self.handlers:
+            raise ValueError(f'Unknown job kind: {kind}')
+        job_id = uuid.uuid4().hex
+        if input_stream is not None:
+            with open(self._path(job_id, 'input'), 'wb') as target:
+                shutil.copyfileobj(input_stream, target)
+
+        now = time.time()
+        with self._connect() as db:
+            db.execute("INSERT INTO jobs (id, kind, params, status, created_at, updated_at, run_after) "
+                       "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                       (job_id, kind, json.dumps(params or {}), QUEUED, now, now, now))
+        self._wakeup.set()
+        return job_id
+
+    def get(self, job_id):
+        """
+        Get a job's status
+
+        Returns:
+            dict: {'id', 'kind', 'status', 'attempts', 'progress', 'error',
+                   'created_at', 'finished_at', 'expires_at'} or None if unknown or expired
+        """
+        with self._connect() as db:
+            row = db.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        if row is None or (row['expires_at'] is not None and row['expires_at'] < time.time()):
+            return None
+        return {
+            'id': row['id'],
+            'kind': row['kind'],
+            'status': row['status'],
+            'attempts': row['attempts'],
+            'progress': {'done': row['done'], 'total': row['total']},
+            'error': row['error'],
+            'created_at': row['created_at'],
+            'finished_at': row['finished_at'],
+            'expires_at': row['expires_at']
+        }
+
+    def artifact(self, job_id):
+        """
+        Get a finished job's output file
+
+        Returns:
+            tuple: (path, filename, mimetype), or None if the job has not succeeded
+        """
+        with self._connect() as db:
+            row = db.execute('SELECT status, filename, mimetype, expires_at FROM jobs WHERE id = ?',
+                             (job_id,)).fetchone()
+        if row is None or row['status'] != SUCCEEDED or row['expires_at'] < time.time():
+            return None
+        return self._path(job_id, 'output'), row['filename'], row['mimetype']
+
+    def stats(self):
+        """Count jobs by status"""
+        with self._connect() as db:
+            rows = db.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status').fetchall()
+        return {status: count for status, count in rows}
+
+    def _claim(self):
+        """Atomically move the oldest runnable job to running"""
+        now = time.time()
+        with self._connect() as db:
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                row = db.execute("SELECT * FROM jobs WHERE status = ? AND run_after <= ? "
+                                 "ORDER BY created_at LIMIT 1", (QUEUED, now)).fetchone()
+                if row is not None:
+                    db.execute("UPDATE jobs SET status = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                               (RUNNING, now, row['id']))
+                db.execute('COMMIT')
+            except BaseException:
+                db.execute('ROLLBACK')
+                raise
+        return row
+
+    def _work(self):
+        while not self._stopping.is_set():
+            self._wakeup.clear()
+            job = self._claim()
+            if job is None:
+                self._purge_expired()
+                self._wakeup.wait(self.poll_interval)
+                continue
+            self._run(job)
+
+    def _run(self, job):
+        job_id = job['id']
+        last_update = [0.0]
+
+        def progress(done, total=None):
+            # Throttled so a fast handler does not turn into a stream of SQLite writes
+            now = time.time()
+            if now - last_update[0] < 0.5 and (total is None or done < total):
+                return
+            last_update[0] = now
+            with self._connect() as db:
+                db.execute('UPDATE jobs SET done = ?, total = COALESCE(?, total), updated_at = ? WHERE id = ?',
+                           (done, total, now, job_id))
+
+        finished = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job_id, finished),
+                                     name=f'job-heartbeat-{job_id}', daemon=True)
+        heartbeat.start()
+        input_path = self._path(job_id, 'input')
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as output:
+                filename, mimetype = self.handlers[job['kind']](
+                    json.loads(job['params']),
+                    input_path if os.path.exists(input_path) else None,
+                    output,
+                    progress
+                )
+            os.replace(temp_path, self._path(job_id, 'output'))
+        except Exception as e:
+            _remove(temp_path)
+            retry = not isinstance(e, JobError) and job['attempts'] + 1 < self.max_attempts
+            self._finish(job_id, QUEUED if retry else FAILED, error=str(e) or e.__class__.__name__,
+                         retry_after=self.retry_delay * 2 ** job['attempts'] if retry else None)
+            return
+        finally:
+            finished.set()
+            heartbeat.join()
+        self._finish(job_id, SUCCEEDED, filename=filename, mimetype=mimetype)
+
+    def _heartbeat(self, job_id, finished):
+        """Refresh a running job's updated_at until it finishes, so it never looks stale"""
+        while not finished.wait(self.stale_after / 3):
+            with self._connect() as db:
+                db.execute('UPDATE jobs SET updated_at = ? WHERE id = ? AND status = ?',
+                           (time.time(), job_id, RUNNING))
+
+    def _finish(self, job_id, status, error=None, filename=None, mimetype=None, retry_after=None):
+        now = time.time()
+        with self._connect() as db:
+            if status == QUEUED:
+                db.execute('UPDATE jobs SET status = ?, error = ?, run_after = ?, updated_at = ? WHERE id = ?',
+                           (status, error, now + retry_after, now, job_id))
+                self._wakeup.set()
+                return
+            db.execute("UPDATE jobs SET status = ?, error = ?, filename = ?, mimetype = ?, "
+                       "finished_at = ?, expires_at = ?, updated_at = ? WHERE id = ?",
+                       (status, error, filename, mimetype, now, now + self.retention_seconds, now, job_id))
+        _remove(self._path(job_id, 'input'))
+
+    def _purge_expired(self):
+        """Delete expired jobs and their files (at most once a minute)"""
+        now = time.time()
+        if now < self._next_purge:
+            return
+        self._next_purge = now + 60
+        with self._connect() as db:
+            expired = [row[0] for row in db.execute('SELECT id FROM jobs WHERE expires_at < ?', (now,))]
+            db.executemany('DELETE FROM jobs WHERE id = ?', [(job_id,) for job_id in expired])
+        for job_id in expired:
+            _remove(self._path(job_id, 'output'))
+            _remove(self._path(job_id, 'input'))
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+# Handlers for the jobs the web application offloads
+
+def run_report_job(params, input_path, output, progress):
+    """Render one PDF report: params {'calc_type', 'params'}"""
+    from pdf_generator import generate_report
+    calc_type = params.get('calc_type')
+    if calc_type not in CALCULATION_TYPES:
+        raise JobError('Invalid calculation type')
+    try:
+        data, result = prepare_report(calc_type, params.get('params', {}))
+    except (TypeError, ValueError) as e:
+        raise JobError(str(e))
+    output.write(generate_report(calc_type, data, result).getvalue())
+    progress(1, 1)
+    return f'{calc_type}_report.pdf', 'application/pdf'
+
+def run_bulk_reports_job(params, input_path, output, progress):
+    """Render a ZIP of PDF reports from an uploaded employee CSV/JSON file"""
+    if input_path is None:
+        raise JobError('Bulk report job has no input file')
+    with open(input_path, 'rb') as stream:
+        try:
+            if params.get('format') == 'json':
+                rows = read_employee_json(stream)
+            else:
+                rows = list(read_employee_csv(stream))
+        except ValueError as e:
+            raise JobError(f'Invalid employee file: {e}')
+
+    def track(rows):
+        for number, row in enumerate(rows, 1):
+            progress(number, len(rows))
+            yield row
+
+    for chunk in stream_reports_zip(track(rows), workers=params.get('workers', 1),
+                                    max_memory=params.get('max_memory', 256 * 1024 * 1024)):
+        output.write(chunk)
+    return 'statutory_reports.zip', 'application/zip'
+
+def run_batch_job(params, input_path, output, progress):
+    """Run a calculation batch: params {'records': [...]}, artifact is NDJSON"""
+    records = params.get('records')
+    if not isinstance(records, list):
+        raise JobError('Batch job needs a list of records')
+    for index, record in enumerate(records):
+        output.write((json.dumps(run_batch_record(index, record)) + '\n').encode('utf-8'))
+        progress(index + 1, len(records))
+    return 'batch_results.ndjson', 'application/x-ndjson'
+
+def run_returns_job(params, input_path, output, progress):
+    """Generate monthly ECR and ESI files from an uploaded roster: params {'pay_period', 'format'}"""
+    from statutory_returns import read_csv_rows, read_xlsx_rows, write_returns_zip
+    if input_path is None:
+        raise JobError('Returns job has no input file')
+    with open(input_path, 'rb') as stream:
+        try:
+            rows = read_xlsx_rows(stream) if params.get('format') == 'xlsx' else read_csv_rows(stream)
+            write_returns_zip(rows, output, params.get('pay_period'), progress=progress)
+        except ValueError as e:
+            raise JobError(str(e))
+    return 'statutory_returns.zip', 'application/zip'
+
+JOB_HANDLERS = {
+    'report': run_report_job,
+    'bulk_reports': run_bulk_reports_job,
+    'batch': run_batch_job,
+    'returns': run_returns_job
+}
\ No newline at end of file
@@ -0,0 +1,143 @@
+"""
+Memoization Layer for Indian Labor Law Compliance System
+Opt-in, bounded LRU caching for the pure calculator functions in core_calculators
+
+Memoization is off by default. Enable it with the STATUTORYCALC_MEMOIZE_SIZE
+environment variable (entries per function) or configure_memoization().
+Cached results are copied on the way in and out, so callers can modify what
+they get back without corrupting the cache.
+"""
+
+import functools
+import os
+import threading
+from collections import OrderedDict
+
+_settings = {
+    'maxsize': int(os.environ.get('STATUTORYCALC_MEMOIZE_SIZE', 0)),
+    # Callable whose value is part of every key (see set_key_version)
+    'key_version': None
+}
+
+_registry = []
+
+_MISSING = object()
+
+def _copy_result(value):
+    """Copy dict/list results (recursively) so cached values cannot be mutated"""
+    if isinstance(value, dict):
+        return {key: _copy_result(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_result(item) for item in value]
+    return value
+
+def _make_key(args, kwargs):
+    # Include argument types: 300 and 300.0 hash alike but give different results
+    key = tuple((type(arg), arg) for arg in args)
+    if kwargs:
+        key += tuple((name, type(value), value) for name, value in sorted(kwargs.items()))
+    return key
+
+class MemoizedFunction:
+    """Wraps a pure function with a bounded LRU cache and hit/miss/eviction counters"""
+
+    def __init__(self, function):
+        functools.update_wrapper(self, function)
+        self.function = function
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.uncacheable = 0
+
+    def __call__(self, *args, **kwargs):
+        maxsize = _settings['maxsize']
+        if maxsize <= 0:
+            return self.function(*args, **kwargs)
+
+        key = _make_key(args, kwargs)
+        if _settings['key_version'] is not None:
+            key = (_settings['key_version'](), key)
+        try:
+            with self._lock:
+                cached = self._cache.get(key, _MISSING)
+                if cached is not _MISSING:
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+                    return _copy_result(cached)
+                self.misses += 1
+        except TypeError:
+            # Unhashable arguments (e.g. a list) cannot be cached
+            with self._lock:
+                self.uncacheable += 1
+            return self.function(*args, **kwargs)
+
+        result = self.function(*args, **kwargs)
+        with self._lock:
+            self._cache[key] = _copy_result(result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > maxsize:
+                self._cache.popitem(last=False)
+                self.evictions += 1
+        return result
+
+    def cache_clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'uncacheable': self.uncacheable,
+                'size': len(self._cache),
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+def memoized(function):
+    """Decorator: make a pure calculator function memoizable"""
+    wrapper = MemoizedFunction(function)
+    _registry.append(wrapper)
+    return wrapper
+
+def configure_memoization(maxsize):
+    """
+    Enable (maxsize > 0) or disable (maxsize = 0) memoization
+
+    Args:
+        maxsize: Maximum cached results per function
+    """
+    _settings['maxsize'] = int(maxsize)
+    clear_memoization()
+
+def set_key_version(source):
+    """
+    Make every cache key include a version, so results computed under other
+    rules are never returned
+
+    Args:
+        source: Callable returning a hashable version (None to remove)
+    """
+    _settings['key_version'] = source
+
+def clear_memoization():
+    """Drop all cached results (counters are kept)"""
+    for wrapper in _registry:
+        wrapper.cache_clear()
+
+def memoization_stats():
+    """
+    Get cache counters for every memoized function
+
+    Returns:
+        dict: {'enabled', 'maxsize', 'functions': {name: counters}}
+    """
+    return {
+        'enabled': _settings['maxsize'] > 0,
+        'maxsize': _settings['maxsize'],
+        'functions': {wrapper.__name__: wrapper.stats() for wrapper in _registry}
+    }
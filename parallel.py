@@ -0,0 +1,135 @@
+"""
+Parallel Batch Executor for Indian Labor Law Compliance System
+Shards batch calculations across a process pool
+
+Records are sent to worker processes in chunks, so the cost of pickling and
+inter-process messaging is paid once per chunk rather than once per record.
+Results always come back in input order. The first min_parallel records of
+a batch are run in-process as they arrive, where starting a pool would cost
+more than it saves; only the records after them go to the pool.
+"""
+
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from rates import ensure_rules, rules_source
+
+DEFAULT_CHUNK_SIZE = 500
+DEFAULT_MIN_PARALLEL = 5000
+
+def pool_context():
+    """
+    multiprocessing context for worker pools
+
+    The web server runs requests on threads, and forking a multi-threaded
+    process copies any lock another thread holds (the rates reload lock,
+    SQLite's) into the child, where nothing will ever release it. forkserver
+    workers are forked from a clean single-threaded server process instead;
+    spawn is used where forkserver is not available (Windows).
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+def _run_chunk(function, chunk, rules=None):
+    """
+    Worker entry point: apply function to every argument tuple in a chunk
+
+    rules is the parent's rules_source(); a worker started before a reload,
+    or with the default rules, loads the same rules as the parent before computing.
+    """
+    if rules is not None:
+        ensure_rules(rules)
+    return [function(*arguments) for arguments in chunk]
+
+def _chunks(items, size):
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+class BatchExecutor:
+    """Runs a function over many argument tuples, in-process or across a process pool"""
+
+    def __init__(self, workers=None, chunksize=DEFAULT_CHUNK_SIZE, min_parallel=DEFAULT_MIN_PARALLEL):
+        """
+        Args:
+            workers: Worker processes (default: one per CPU; 1 always runs in-process)
+            chunksize: Records sent to a worker at a time
+            min_parallel: Records run in-process before the rest of a batch goes to the pool
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.chunksize = max(1, chunksize)
+        self.min_parallel = min_parallel
+        self._pool = None
+
+    def _get_pool(self):
+        # Started on first use and reused, so each batch does not pay for process startup
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=pool_context())
+        return self._pool
+
+    def map(self, function, items):
+        """
+        Apply function to every argument tuple, yielding results in input order
+
+        Args:
+            function: Picklable top-level function
+            items: Iterable of argument tuples
+
+        Returns:
+            iterator: function(*arguments) for each item, in order
+        """
+        items = iter(items)
+        if self.workers <= 1:
+            return (function(*arguments) for arguments in items)
+        return self._map(function, items)
+
+    def _map(self, function, items):
+        # The first min_parallel items run in-process as they are read, so a
+        # streaming consumer gets its first results straight away; only a batch
+        # that goes past them is worth sending to the pool
+        for arguments in islice(items, self.min_parallel):
+            yield function(*arguments)
+        yield from self._map_parallel(function, items)
+
+    def _map_parallel(self, function, items):
+        # Enough chunks in flight to keep every worker busy without reading
+        # the whole input ahead of the consumer
+        max_in_flight = self.workers * 2
+        pending = deque()
+        rules = rules_source()
+        for chunk in _chunks(items, self.chunksize):
+            pending.append(self._get_pool().submit(_run_chunk, function, chunk, rules))
+            if len(pending) >= max_in_flight:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+    def shutdown(self):
+        """Stop the worker processes (a later map() starts a new pool)"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+def parallel_map(function, items, workers=None, chunksize=DEFAULT_CHUNK_SIZE, min_parallel=DEFAULT_MIN_PARALLEL):
+    """
+    One-off parallel map with a temporary pool
+
+    Args:
+        function: Picklable top-level function
+        items: Iterable of argument tuples
+        workers, chunksize, min_parallel: See BatchExecutor
+
+    Returns:
+        list: Results in input order
+    """
+    executor = BatchExecutor(workers, chunksize, min_parallel)
+    try:
+        return list(executor.map(function, items))
+    finally:
+        executor.shutdown()
\ No newline at end of file
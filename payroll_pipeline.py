@@ -0,0 +1,377 @@
+"""
+Streaming Payroll Pipeline for Indian Labor Law Compliance System
+parse -> validate -> compute PF/ESI/NPS/Gratuity -> write CSV
+
+Rows flow through generators in fixed-size chunks, and each chunk is computed
+with the vectorized batch engine, so memory use does not grow with file size.
+
+Usage:
+    python payroll_pipeline.py payroll.csv statutory.csv
+    python payroll_pipeline.py payroll.xlsx statutory.csv --chunk-size 10000
+    python payroll_pipeline.py payroll.csv pf.parquet --format parquet --calc-type pf
+
+Input columns: employee_id, basic, da, salary, years, sector, state
+(only basic is required; salary defaults to basic + da, sector to private).
+"""
+
+import argparse
+import codecs
+import csv
+import io
+import math
+import sys
+import time
+
+from batch_engine import calculate_batch
+from rates import as_pay_period
+
+OUTPUT_COLUMNS = [
+    'row', 'employee_id', 'sector', 'basic', 'da', 'salary', 'years',
+    'pf_eligible_salary', 'pf_employee_contribution', 'pf_employer_epf_contribution',
+    'pf_employer_eps_contribution', 'pf_total_monthly',
+    'gpf_min_contribution', 'gpf_recommended_contribution', 'gpf_max_contribution',
+    'esi_eligible', 'esi_employee_contribution', 'esi_employer_contribution', 'esi_total_contribution',
+    'nps_employee_contribution', 'nps_employer_contribution', 'nps_total_contribution',
+    'gratuity_eligible', 'gratuity_amount',
+    'error'
+]
+
+DEFAULT_CHUNK_SIZE = 5000
+
+def read_csv_rows(stream):
+    """
+    Parse CSV rows one at a time
+
+    Args:
+        stream: Text stream, binary stream or iterable of byte lines
+
+    Returns:
+        iterator: dict per row
+    """
+    if isinstance(stream, io.TextIOBase):
+        return csv.DictReader(stream)
+    return csv.DictReader(codecs.iterdecode(stream, 'utf-8-sig'))
+
+def read_xlsx_rows(source):
+    """
+    Parse XLSX rows one at a time through openpyxl's read-only iterator
+
+    Args:
+        source: Path or seekable binary file object
+
+    Returns:
+        iterator: dict per row (first row is the header)
+    """
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValueError('Reading XLSX files requires the openpyxl package')
+
+    try:
+        workbook = load_workbook(source, read_only=True, data_only=True)
+    except Exception as e:
+        raise ValueError(f'Could not read XLSX file: {e}')
+    return _iter_worksheet(workbook)
+
+def _iter_worksheet(workbook):
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(cell).strip() if cell is not None else '' for cell in next(rows, ())]
+        for values in rows:
+            if values and any(value is not None for value in values):
+                yield dict(zip(header, values))
+    finally:
+        workbook.close()
+
+def parse_amount(value, field, default=None):
+    """
+    Parse a non-negative amount from a raw CSV/XLSX cell
+
+    Args:
+        value: Cell value (str, int, float or None)
+        field: Column name, for the error message
+        default: Value for an empty cell; None makes the field required
+
+    Returns:
+        float
+
+    Raises:
+        ValueError: If the field is required and empty, or not a non-negative number
+    """
+    if value is None or (isinstance(value, str) and not value.strip()):
+        if default is None:
+            raise ValueError(f'{field} is required')
+        return default
+    number = float(value)
+    if math.isnan(number) or number < 0:
+        raise ValueError(f'{field} must be a non-negative number')
+    return number
+
+def validate_rows(rows):
+    """
+    Validate and normalize rows
+
+    Args:
+        rows: Iterable of raw row dicts
+
+    Returns:
+        iterator: (row_number, employee_id, employee, error) - employee is None
+                  when error is set; employee_id is kept either way, so a
+                  rejected row can still be traced to its employee
+    """
+    for number, row in enumerate(rows, 1):
+        employee_id = str(row.get('employee_id') or '').strip()
+        try:
+            basic = parse_amount(row.get('basic'), 'basic')
+            da = parse_amount(row.get('da'), 'da', 0.0)
+            salary = parse_amount(row.get('salary'), 'salary', basic + da)
+            years = row.get('years')
+            years = None if years is None or str(years).strip() == '' else parse_amount(years, 'years')
+            sector = str(row.get('sector') or 'private').strip().lower()
+            if sector not in ('private', 'government'):
+                raise ValueError("sector must be 'private' or 'government'")
+            employee = {
+                'employee_id': employee_id,
+                'basic': basic,
+                'da': da,
+                'salary': salary,
+                'years': years,
+                'sector': sector,
+                'state': str(row.get('state') or 'general').strip()
+            }
+            yield number, employee_id, employee, None
+        except (TypeError, ValueError) as e:
+            yield number, employee_id, None, str(e)
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _cell(value):
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ''
+    return value
+
+def compute_chunks(validated, chunk_size=DEFAULT_CHUNK_SIZE, pay_period=None):
+    """
+    Run the batch engine over validated rows, one chunk at a time
+
+    Args:
+        validated: Output of validate_rows
+        chunk_size: Rows computed per vectorized batch
+        pay_period: Month of the payroll, for the rates in force (default: today)
+
+    Returns:
+        iterator: (chunk, employees, results) - chunk is the list of validated
+                  tuples, employees the valid rows' (row_number, employee) in
+                  order, results the calculate_batch() arrays for them (None if
+                  the chunk has no valid rows)
+    """
+    for chunk in _chunks(validated, chunk_size):
+        employees = [(number, employee) for number, _, employee, _ in chunk if employee is not None]
+        results = None
+        if employees:
+            results = calculate_batch(
+                [employee['basic'] for _, employee in employees],
+                [employee['da'] for _, employee in employees],
+                [employee['salary'] for _, employee in employees],
+                [employee['sector'] for _, employee in employees],
+                [employee['state'] for _, employee in employees],
+                years_of_service=[employee['years'] or 0 for _, employee in employees],
+                pay_period=pay_period
+            )
+        yield chunk, employees, results
+
+def compute_rows(validated, chunk_size=DEFAULT_CHUNK_SIZE, pay_period=None):
+    """
+    Compute PF/GPF, ESI, NPS and gratuity for validated rows, chunk by chunk
+
+    Args:
+        validated: Output of validate_rows
+        chunk_size: Rows computed per vectorized batch
+        pay_period: Month of the payroll, for the rates in force (default: today)
+
+    Returns:
+        iterator: Output row dicts (keys from OUTPUT_COLUMNS), in input order
+    """
+    for chunk, _, results in compute_chunks(validated, chunk_size, pay_period):
+        columns = {}
+        if results is not None:
+            columns = {f'{calc_type}.{key}': values.tolist()
+                       for calc_type, arrays in results.items() for key, values in arrays.items()}
+
+        position = 0
+        for number, employee_id, employee, error in chunk:
+            if employee is None:
+                yield {'row': number, 'employee_id': employee_id, 'error': error}
+                continue
+
+            def value(key):
+                return columns[key][position]
+
+            government = employee['sector'] == 'government'
+            output = {
+                'row': number,
+                'employee_id': employee['employee_id'],
+                'sector': employee['sector'],
+                'basic': employee['basic'],
+                'da': employee['da'],
+                'salary': employee['salary'],
+                'years': employee['years'],
+                'esi_eligible': value('esi.eligible'),
+                'esi_employee_contribution': value('esi.employee_contribution'),
+                'esi_employer_contribution': value('esi.employer_contribution'),
+                'esi_total_contribution': value('esi.total_contribution')
+            }
+            if government:
+                output.update({
+                    'gpf_min_contribution': value('pf.min_gpf_contribution'),
+                    'gpf_recommended_contribution': value('pf.recommended_contribution'),
+                    'gpf_max_contribution': value('pf.max_gpf_contribution'),
+                    # NPS applies to government employees only
+                    'nps_employee_contribution': value('nps.employee_contribution'),
+                    'nps_employer_contribution': value('nps.employer_contribution'),
+                    'nps_total_contribution': value('nps.total_contribution')
+                })
+            else:
+                output.update({
+                    'pf_eligible_salary': value('pf.pf_eligible_salary'),
+                    'pf_employee_contribution': value('pf.employee_contribution'),
+                    'pf_employer_epf_contribution': value('pf.employer_epf_contribution'),
+                    'pf_employer_eps_contribution': value('pf.employer_eps_contribution'),
+                    'pf_total_monthly': value('pf.total_monthly_pf')
+                })
+            if employee['years'] is not None:
+                output['gratuity_eligible'] = value('gratuity.eligible')
+                output['gratuity_amount'] = value('gratuity.gratuity_amount')
+            position += 1
+            yield output
+
+def iter_csv_output(rows):
+    """
+    Format output rows as CSV text, one chunk of lines at a time
+
+    Returns:
+        iterator: CSV text chunks (header first)
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=OUTPUT_COLUMNS, lineterminator='\n')
+    writer.writeheader()
+    for chunk in _chunks(rows, 1000):
+        writer.writerows({key: _cell(value) for key, value in row.items()} for row in chunk)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+class PipelineProgress:
+    """Counts rows as they pass and reports throughput"""
+
+    def __init__(self, callback=None, every=50000):
+        self.callback = callback
+        self.every = every
+        self.rows = 0
+        self.errors = 0
+        self.started = time.perf_counter()
+
+    def track(self, rows):
+        for row in rows:
+            self.rows += 1
+            if row.get('error'):
+                self.errors += 1
+            if self.callback and self.rows % self.every == 0:
+                self.callback(self.summary())
+            yield row
+
+    def add(self, rows, errors=0):
+        """Count a block of rows at once (e.g. one Arrow record batch)"""
+        reported = self.rows // self.every
+        self.rows += rows
+        self.errors += errors
+        if self.callback and self.rows // self.every > reported:
+            self.callback(self.summary())
+
+    def summary(self):
+        elapsed = time.perf_counter() - self.started
+        return {
+            'rows': self.rows,
+            'errors': self.errors,
+            'seconds': round(elapsed, 3),
+            'rows_per_sec': round(self.rows / elapsed, 1) if elapsed else 0.0
+        }
+
+def process_payroll(rows, chunk_size=DEFAULT_CHUNK_SIZE, progress=None, pay_period=None):
+    """
+    Run the full pipeline over raw rows
+
+    Args:
+        rows: Iterable of raw row dicts (from read_csv_rows / read_xlsx_rows)
+        chunk_size: Rows computed per vectorized batch
+        progress: Optional PipelineProgress
+        pay_period: Month of the payroll, for the rates in force (default: today)
+
+    Returns:
+        iterator: CSV text chunks
+    """
+    computed = compute_rows(validate_rows(rows), chunk_size, pay_period)
+    if progress is not None:
+        computed = progress.track(computed)
+    return iter_csv_output(computed)
+
+def main():
+    parser = argparse.ArgumentParser(description='Stream a payroll file through the statutory calculators')
+    parser.add_argument('input', help='Payroll CSV or XLSX file')
+    parser.add_argument('output', help="Output CSV file ('-' for stdout)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Rows per vectorized batch')
+    parser.add_argument('--progress-every', type=int, default=50000, help='Report progress every N rows')
+    parser.add_argument('--pay-period', type=as_pay_period, default=None,
+                        help='Payroll month (YYYY-MM) whose statutory rates apply (default: today)')
+    parser.add_argument('--format', choices=('csv', 'arrow', 'parquet'), default='csv',
+                        help='Output format; arrow and parquet write one calculation type (see --calc-type)')
+    parser.add_argument('--calc-type', choices=('pf', 'esi', 'nps', 'gratuity'), default='pf',
+                        help='Calculation type for arrow / parquet output')
+    args = parser.parse_args()
+
+    def report(summary):
+        print(f"{summary['rows']:,} rows ({summary['errors']:,} errors) "
+              f"in {summary['seconds']:.1f}s - {summary['rows_per_sec']:,.0f} rows/sec", file=sys.stderr)
+
+    progress = PipelineProgress(report, args.progress_every)
+    if args.input.lower().endswith('.xlsx'):
+        source = None
+        rows = read_xlsx_rows(args.input)
+    else:
+        source = open(args.input, newline='', encoding='utf-8-sig')
+        rows = read_csv_rows(source)
+
+    if args.format != 'csv':
+        from arrow_export import write_export
+        try:
+            summary = write_export(rows, args.output, args.calc_type, args.format, args.chunk_size,
+                                   args.pay_period, progress)
+        finally:
+            if source is not None:
+                source.close()
+        print(f"{summary['rows']:,} rows written ({summary['errors']:,} errors skipped)", file=sys.stderr)
+        return
+
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding='utf-8')
+    try:
+        for chunk in process_payroll(rows, args.chunk_size, progress, args.pay_period):
+            output.write(chunk)
+    finally:
+        if source is not None:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+    report(progress.summary())
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -9,33 +9,108 @@ from reportlab.lib.units import inch
 from reportlab.lib import colors
 from datetime import datetime
 import io
+from xml.sax.saxutils import escape
+from instrumentation import stage
+from rates import rates_on
 
-def generate_calculation_report(calc_type, data, result):
+# Report theme: the stylesheet, paragraph styles and table styles are built once
+# at import and shared by every report instead of being rebuilt on each call.
+STYLES = getSampleStyleSheet()
+TITLE_STYLE = ParagraphStyle('CustomTitle', parent=STYLES['Heading1'],
+                             fontSize=18, spaceAfter=30, alignment=1)
+
+INFO_COLUMN_WIDTHS = [2*inch, 4*inch]
+TWO_COLUMN_WIDTHS = [3*inch, 2*inch]
+THREE_COLUMN_WIDTHS = [2.5*inch, 1.5*inch, 1*inch]
+CHECKLIST_COLUMN_WIDTHS = [0.5*inch, 4.5*inch, 1*inch]
+
+INFO_TABLE_STYLE = TableStyle([
+    ('FONTNAME', (0,0), (-1,-1), 'Helvetica'),
+    ('FONTSIZE', (0,0), (-1,-1), 10),
+    ('GRID', (0,0), (-1,-1), 1, colors.lightgrey)
+])
+
+INPUT_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0,0), (-1,0), colors.grey),
+    ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
+    ('FONTNAME', (0,0), (-1,-1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0,0), (-1,-1), 12),
+    ('GRID', (0,0), (-1,-1), 1, colors.black)
+])
+
+# Result tables differ only in their header colour
+RESULT_TABLE_STYLES = {
+    name: TableStyle([
+        ('BACKGROUND', (0,0), (-1,0), getattr(colors, name)),
+        ('FONTNAME', (0,0), (-1,-1), 'Helvetica'),
+        ('FONTSIZE', (0,0), (-1,-1), 11),
+        ('GRID', (0,0), (-1,-1), 1, colors.black)
+    ])
+    for name in ('lightblue', 'lightgreen', 'lightcoral')
+}
+
+CHECKLIST_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0,0), (-1,0), colors.grey),
+    ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
+    ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+    ('FONTNAME', (0,1), (-1,-1), 'Helvetica'),
+    ('FONTSIZE', (0,0), (-1,-1), 10),
+    ('GRID', (0,0), (-1,-1), 1, colors.black),
+    ('VALIGN', (0,0), (-1,-1), 'TOP')
+])
+
+def _generated_on_text(generated_on):
+    """
+    Format the 'Generated On' value of a report
+
+    With generated_on=None the current time is used. Passing a date (or
+    datetime) gives a deterministic report: the same inputs produce the same
+    PDF bytes, which is what the report cache relies on.
+    """
+    if generated_on is None:
+        return datetime.now().strftime('%d %B %Y at %I:%M %p')
+    return generated_on.strftime('%d %B %Y')
+
+def _indian_grouping(amount):
+    """Format whole rupees with Indian digit grouping (20,00,000)"""
+    digits = str(int(amount))
+    head, groups = digits[:-3], [digits[-3:]]
+    while head:
+        groups.insert(0, head[-2:])
+        head = head[:-2]
+    return ','.join(groups)
+
+def _new_document(buffer, generated_on):
+    # invariant=1 drops ReportLab's creation timestamp and random document ID
+    return SimpleDocTemplate(buffer, pagesize=A4, invariant=1 if generated_on is not None else None)
+
+def generate_report(calc_type, data, result, generated_on=None):
+    """Generate the PDF report for any calculation type, including compliance"""
+    if calc_type == 'compliance':
+        return generate_compliance_report(data['state'], data['num_employees'], data['industry_type'], result,
+                                          generated_on=generated_on)
+    return generate_calculation_report(calc_type, data, result, generated_on=generated_on)
+
+def generate_calculation_report(calc_type, data, result, generated_on=None):
     """Generate PDF report for calculations"""
     buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4)
-    styles = getSampleStyleSheet()
+    doc = _new_document(buffer, generated_on)
+    styles = STYLES
     story = []
     
     # Title
-    title_style = ParagraphStyle('CustomTitle', parent=styles['Heading1'], 
-                                fontSize=18, spaceAfter=30, alignment=1)
+    title_style = TITLE_STYLE
     story.append(Paragraph("StatutoryCalc - Statutory Benefits Report", title_style))
     story.append(Spacer(1, 12))
     
     # Report info
     info_data = [
         ['Report Type:', calc_type.title() + ' Calculator'],
-        ['Generated On:', datetime.now().strftime('%d %B %Y at %I:%M %p')],
+        ['Generated On:', _generated_on_text(generated_on)],
         ['System:', 'StatutoryCalc'],
         ['Developer:', 'Prasant Kumar']
     ]
-    info_table = Table(info_data, colWidths=[2*inch, 4*inch])
-    info_table.setStyle(TableStyle([
-        ('FONTNAME', (0,0), (-1,-1), 'Helvetica'),
-        ('FONTSIZE', (0,0), (-1,-1), 10),
-        ('GRID', (0,0), (-1,-1), 1, colors.lightgrey)
-    ]))
+    info_table = Table(info_data, colWidths=INFO_COLUMN_WIDTHS, style=INFO_TABLE_STYLE)
     story.append(info_table)
     story.append(Spacer(1, 20))
     
@@ -60,7 +135,8 @@ def generate_calculation_report(calc_type, data, result):
     developer_text = "Developed by Prasant Kumar | StatutoryCalc"
     story.append(Paragraph(developer_text, styles['Normal']))
     
-    doc.build(story)
+    with stage('pdf_build'):
+        doc.build(story)
     buffer.seek(0)
     return buffer
 
@@ -81,14 +157,7 @@ def _generate_gratuity_content(data, result, styles):
         ['Sector', sector.title()]
     ]
     
-    input_table = Table(input_data, colWidths=[3*inch, 2*inch])
-    input_table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.grey),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
-        ('FONTNAME', (0,0), (-1,-1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0,0), (-1,-1), 12),
-        ('GRID', (0,0), (-1,-1), 1, colors.black)
-    ]))
+    input_table = Table(input_data, colWidths=TWO_COLUMN_WIDTHS, style=INPUT_TABLE_STYLE)
     content.append(input_table)
     content.append(Spacer(1, 20))
     
@@ -107,7 +176,8 @@ def _generate_gratuity_content(data, result, styles):
         ]
         
         if result.get('capped_at_maximum'):
-            result_data.append(['Note', 'Amount capped at maximum ₹20,00,000'])
+            cap = rates_on(data.get('pay_period'))['gratuity_cap']
+            result_data.append(['Note', f'Amount capped at maximum ₹{_indian_grouping(cap)}'])
         elif sector == 'government':
             result_data.append(['Note', result.get('note', 'No maximum limit for government employees')])
     else:
@@ -118,13 +188,7 @@ def _generate_gratuity_content(data, result, styles):
             ['Reason', result['reason']]
         ]
     
-    result_table = Table(result_data, colWidths=[3*inch, 2*inch])
-    result_table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.lightblue),
-        ('FONTNAME', (0,0), (-1,-1), 'Helvetica'),
-        ('FONTSIZE', (0,0), (-1,-1), 11),
-        ('GRID', (0,0), (-1,-1), 1, colors.black)
-    ]))
+    result_table = Table(result_data, colWidths=TWO_COLUMN_WIDTHS, style=RESULT_TABLE_STYLES['lightblue'])
     content.append(result_table)
     
     return content
@@ -143,14 +207,7 @@ def _generate_pf_content(data, result, styles):
         ['PF Eligible Salary', f"₹{result['pf_eligible_salary']:,.2f}"]
     ]
     
-    input_table = Table(input_data, colWidths=[3*inch, 2*inch])
-    input_table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.grey),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
-        ('FONTNAME', (0,0), (-1,-1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0,0), (-1,-1), 12),
-        ('GRID', (0,0), (-1,-1), 1, colors.black)
-    ]))
+    input_table = Table(input_data, colWidths=TWO_COLUMN_WIDTHS, style=INPUT_TABLE_STYLE)
     content.append(input_table)
     content.append(Spacer(1, 20))
     
@@ -163,13 +220,7 @@ def _generate_pf_content(data, result, styles):
         ['Total Monthly PF', f"₹{result['total_monthly_pf']:,.2f}", '24%']
     ]
     
-    result_table = Table(result_data, colWidths=[2.5*inch, 1.5*inch, 1*inch])
-    result_table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.lightblue),
-        ('FONTNAME', (0,0), (-1,-1), 'Helvetica'),
-        ('FONTSIZE', (0,0), (-1,-1), 11),
-        ('GRID', (0,0), (-1,-1), 1, colors.black)
-    ]))
+    result_table = Table(result_data, colWidths=THREE_COLUMN_WIDTHS, style=RESULT_TABLE_STYLES['lightblue'])
     content.append(result_table)
     
     return content
@@ -188,14 +239,7 @@ def _generate_gpf_content(data, result, styles):
         ['Sector', 'Government']
     ]
     
-    input_table = Table(input_data, colWidths=[3*inch, 2*inch])
-    input_table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.grey),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
-        ('FONTNAME', (0,0), (-1,-1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0,0), (-1,-1), 12),
-        ('GRID', (0,0), (-1,-1), 1, colors.black)
-    ]))
+    input_table = Table(input_data, colWidths=TWO_COLUMN_WIDTHS, style=INPUT_TABLE_STYLE)
     content.append(input_table)
     content.append(Spacer(1, 20))
     
@@ -207,13 +251,7 @@ def _generate_gpf_content(data, result, styles):
         ['Maximum Contribution', f"₹{result['max_gpf_contribution']:,.2f}", '100%']
     ]
     
-    result_table = Table(result_data, colWidths=[2.5*inch, 1.5*inch, 1*inch])
-    result_table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.lightgreen),
-        ('FONTNAME', (0,0), (-1,-1), 'Helvetica'),
-        ('FONTSIZE', (0,0), (-1,-1), 11),
-        ('GRID', (0,0), (-1,-1), 1, colors.black)
-    ]))
+    result_table = Table(result_data, colWidths=THREE_COLUMN_WIDTHS, style=RESULT_TABLE_STYLES['lightgreen'])
     content.append(result_table)
     
     # Note
@@ -238,14 +276,7 @@ def _generate_nps_content(data, result, styles):
         ['Employee Contribution Rate', f"{data.get('employee_rate', 10)}%"]
     ]
     
-    input_table = Table(input_data, colWidths=[3*inch, 2*inch])
-    input_table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.grey),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
-        ('FONTNAME', (0,0), (-1,-1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0,0), (-1,-1), 12),
-        ('GRID', (0,0), (-1,-1), 1, colors.black)
-    ]))
+    input_table = Table(input_data, colWidths=TWO_COLUMN_WIDTHS, style=INPUT_TABLE_STYLE)
     content.append(input_table)
     content.append(Spacer(1, 20))
     
@@ -257,13 +288,7 @@ def _generate_nps_content(data, result, styles):
         ['Total Monthly NPS', f"₹{result['total_contribution']:,.2f}", f"{result['employee_rate'] + result['employer_rate']}%"]
     ]
     
-    result_table = Table(result_data, colWidths=[2.5*inch, 1.5*inch, 1*inch])
-    result_table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.lightcoral),
-        ('FONTNAME', (0,0), (-1,-1), 'Helvetica'),
-        ('FONTSIZE', (0,0), (-1,-1), 11),
-        ('GRID', (0,0), (-1,-1), 1, colors.black)
-    ]))
+    result_table = Table(result_data, colWidths=THREE_COLUMN_WIDTHS, style=RESULT_TABLE_STYLES['lightcoral'])
     content.append(result_table)
     
     # Note
@@ -286,24 +311,19 @@ def _generate_esi_content(data, result, styles):
         ['State', data.get('state', 'General').title()]
     ]
     
-    input_table = Table(input_data, colWidths=[3*inch, 2*inch])
-    input_table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.grey),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
-        ('FONTNAME', (0,0), (-1,-1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0,0), (-1,-1), 12),
-        ('GRID', (0,0), (-1,-1), 1, colors.black)
-    ]))
+    input_table = Table(input_data, colWidths=TWO_COLUMN_WIDTHS, style=INPUT_TABLE_STYLE)
     content.append(input_table)
     content.append(Spacer(1, 20))
     
     # Results
     if result['eligible']:
+        rates = rates_on(data.get('pay_period'))
+        employee_rate, employer_rate = rates['esi_employee_rate'], rates['esi_employer_rate']
         result_data = [
             ['Contribution Type', 'Amount', 'Rate'],
-            ['Employee ESI', f"{result['employee_contribution']:,.2f}", '0.75%'],
-            ['Employer ESI', f"{result['employer_contribution']:,.2f}", '3.25%'],
-            ['Total ESI', f"{result['total_contribution']:,.2f}", '4.00%'],
+            ['Employee ESI', f"{result['employee_contribution']:,.2f}", f'{employee_rate:.2f}%'],
+            ['Employer ESI', f"{result['employer_contribution']:,.2f}", f'{employer_rate:.2f}%'],
+            ['Total ESI', f"{result['total_contribution']:,.2f}", f'{employee_rate + employer_rate:.2f}%'],
             ['Status', 'Eligible', '']
         ]
     else:
@@ -313,13 +333,7 @@ def _generate_esi_content(data, result, styles):
             ['Reason', result['reason']]
         ]
     
-    result_table = Table(result_data, colWidths=[2.5*inch, 1.5*inch, 1*inch])
-    result_table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.lightblue),
-        ('FONTNAME', (0,0), (-1,-1), 'Helvetica'),
-        ('FONTSIZE', (0,0), (-1,-1), 11),
-        ('GRID', (0,0), (-1,-1), 1, colors.black)
-    ]))
+    result_table = Table(result_data, colWidths=THREE_COLUMN_WIDTHS, style=RESULT_TABLE_STYLES['lightblue'])
     content.append(result_table)
     
     return content
@@ -348,14 +362,7 @@ def _generate_leave_content(data, result, styles):
             ['Sector', 'Private']
         ]
     
-    input_table = Table(input_data, colWidths=[3*inch, 2*inch])
-    input_table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.grey),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
-        ('FONTNAME', (0,0), (-1,-1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0,0), (-1,-1), 12),
-        ('GRID', (0,0), (-1,-1), 1, colors.black)
-    ]))
+    input_table = Table(input_data, colWidths=TWO_COLUMN_WIDTHS, style=INPUT_TABLE_STYLE)
     content.append(input_table)
     content.append(Spacer(1, 20))
     
@@ -382,13 +389,7 @@ def _generate_leave_content(data, result, styles):
             ['Total Annual Leave', f"{result['total_annual_leave']} days"]
         ])
     
-    result_table = Table(result_data, colWidths=[3*inch, 2*inch])
-    result_table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.lightblue),
-        ('FONTNAME', (0,0), (-1,-1), 'Helvetica'),
-        ('FONTSIZE', (0,0), (-1,-1), 11),
-        ('GRID', (0,0), (-1,-1), 1, colors.black)
-    ]))
+    result_table = Table(result_data, colWidths=TWO_COLUMN_WIDTHS, style=RESULT_TABLE_STYLES['lightblue'])
     content.append(result_table)
     
     # Add note for government employees
@@ -399,16 +400,21 @@ def _generate_leave_content(data, result, styles):
     
     return content
 
-def generate_compliance_report(state, num_employees, industry_type, checklist):
+def _checklist_table(checklist):
+    checklist_data = [['S.No.', 'Compliance Requirement', 'Status']]
+    for i, item in enumerate(checklist, 1):
+        checklist_data.append([str(i), item, '☐ Pending'])
+    return Table(checklist_data, colWidths=CHECKLIST_COLUMN_WIDTHS, style=CHECKLIST_TABLE_STYLE)
+
+def generate_compliance_report(state, num_employees, industry_type, checklist, generated_on=None):
     """Generate PDF report for compliance checklist"""
     buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4)
-    styles = getSampleStyleSheet()
+    doc = _new_document(buffer, generated_on)
+    styles = STYLES
     story = []
     
     # Title
-    title_style = ParagraphStyle('CustomTitle', parent=styles['Heading1'], 
-                                fontSize=18, spaceAfter=30, alignment=1)
+    title_style = TITLE_STYLE
     story.append(Paragraph("Compliance Checklist Report", title_style))
     story.append(Spacer(1, 12))
     
@@ -417,16 +423,11 @@ def generate_compliance_report(state, num_employees, industry_type, checklist):
         ['State:', state],
         ['Number of Employees:', str(num_employees)],
         ['Industry Type:', industry_type],
-        ['Generated On:', datetime.now().strftime('%d %B %Y at %I:%M %p')],
+        ['Generated On:', _generated_on_text(generated_on)],
         ['Total Requirements:', str(len(checklist))],
         ['Developer:', 'Prasant Kumar']
     ]
-    info_table = Table(info_data, colWidths=[2*inch, 4*inch])
-    info_table.setStyle(TableStyle([
-        ('FONTNAME', (0,0), (-1,-1), 'Helvetica'),
-        ('FONTSIZE', (0,0), (-1,-1), 10),
-        ('GRID', (0,0), (-1,-1), 1, colors.lightgrey)
-    ]))
+    info_table = Table(info_data, colWidths=INFO_COLUMN_WIDTHS, style=INFO_TABLE_STYLE)
     story.append(info_table)
     story.append(Spacer(1, 20))
     
@@ -434,21 +435,7 @@ def generate_compliance_report(state, num_employees, industry_type, checklist):
     story.append(Paragraph("Compliance Requirements Checklist", styles['Heading2']))
     story.append(Spacer(1, 12))
     
-    checklist_data = [['S.No.', 'Compliance Requirement', 'Status']]
-    for i, item in enumerate(checklist, 1):
-        checklist_data.append([str(i), item, '☐ Pending'])
-    
-    checklist_table = Table(checklist_data, colWidths=[0.5*inch, 4.5*inch, 1*inch])
-    checklist_table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.grey),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
-        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-        ('FONTNAME', (0,1), (-1,-1), 'Helvetica'),
-        ('FONTSIZE', (0,0), (-1,-1), 10),
-        ('GRID', (0,0), (-1,-1), 1, colors.black),
-        ('VALIGN', (0,0), (-1,-1), 'TOP')
-    ]))
-    story.append(checklist_table)
+    story.append(_checklist_table(checklist))
     
     # Footer
     story.append(Spacer(1, 30))
@@ -458,6 +445,71 @@ def generate_compliance_report(state, num_employees, industry_type, checklist):
     developer_text = "Developed by Prasant Kumar | StatutoryCalc"
     story.append(Paragraph(developer_text, styles['Normal']))
     
-    doc.build(story)
+    with stage('pdf_build'):
+        doc.build(story)
     buffer.seek(0)
-    return buffer
\ No newline at end of file
+    return buffer
+
+
+def generate_portfolio_compliance_report(portfolio, generated_on=None):
+    """
+    Generate one PDF for every branch of a portfolio (see compliance_portfolio.py)
+
+    Branches with the same compliance profile share a checklist, so the report
+    has one checklist section per profile, listing the branches it covers.
+    """
+    from compliance_portfolio import portfolio_checklists
+    buffer = io.BytesIO()
+    doc = _new_document(buffer, generated_on)
+    styles = STYLES
+    story = []
+    
+    story.append(Paragraph("Portfolio Compliance Report", TITLE_STYLE))
+    story.append(Spacer(1, 12))
+    
+    groups = portfolio_checklists(portfolio)
+    info_data = [
+        ['Branches:', str(len(portfolio['branches']))],
+        ['Compliance Profiles:', str(len(groups))],
+        ['Requirements:', str(len(portfolio['requirements']))],
+        ['Generated On:', _generated_on_text(generated_on)],
+        ['Developer:', 'Prasant Kumar']
+    ]
+    story.append(Table(info_data, colWidths=INFO_COLUMN_WIDTHS, style=INFO_TABLE_STYLE))
+    story.append(Spacer(1, 20))
+    
+    # How many branches each requirement applies to
+    story.append(Paragraph("Requirement Coverage", styles['Heading2']))
+    story.append(Spacer(1, 12))
+    coverage_data = [['S.No.', 'Compliance Requirement', 'Branches']]
+    for i, (requirement, count) in enumerate(zip(portfolio['requirements'], portfolio['matrix'].sum(axis=0).tolist()), 1):
+        coverage_data.append([str(i), Paragraph(requirement['text'], styles['Normal']), str(count)])
+    story.append(Table(coverage_data, colWidths=CHECKLIST_COLUMN_WIDTHS, style=CHECKLIST_TABLE_STYLE))
+    
+    for number, group in enumerate(groups, 1):
+        branches = group['branches']
+        headcounts = [branch['num_employees'] for branch in branches]
+        # A profile can cover several states or industries that no rule singles out
+        states = {branch['state'] for branch in branches}
+        industries = {branch['industry_type'] for branch in branches}
+        story.append(Spacer(1, 20))
+        # Names, states and industries are user input; escape them for Paragraph markup
+        story.append(Paragraph(
+            f"Profile {number}: {escape(states.pop()) if len(states) == 1 else 'Other states'}, "
+            f"{escape(industries.pop()) if len(industries) == 1 else 'Other industries'}, "
+            f"{min(headcounts)}-{max(headcounts)} employees", styles['Heading2']))
+        story.append(Paragraph(f"Branches ({len(branches)}): " + ', '.join(escape(branch['name']) for branch in branches),
+                               styles['Normal']))
+        story.append(Spacer(1, 12))
+        story.append(_checklist_table(group['checklist']))
+    
+    story.append(Spacer(1, 30))
+    footer_text = "This checklist is based on general compliance requirements. Specific requirements may vary. Please consult with legal experts for complete compliance guidance."
+    story.append(Paragraph(footer_text, styles['Normal']))
+    story.append(Spacer(1, 10))
+    story.append(Paragraph("Developed by Prasant Kumar | StatutoryCalc", styles['Normal']))
+    
+    with stage('pdf_build'):
+        doc.build(story)
+    buffer.seek(0)
+    return buffer
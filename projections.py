@@ -0,0 +1,157 @@
+"""
+Corpus Projections for Indian Labor Law Compliance System
+Long-range EPF/EPS/NPS corpus projections for a whole workforce
+
+Monthly contributions are computed as one (employees x months) array per
+chunk of employees, with salary growth and DA revisions applied as step
+functions of the month. Balances use the closed form of each fund's
+recurrence, evaluated with cumulative products and sums, so there is no
+Python loop over employees or months:
+
+    NPS (monthly compounding):  B[m+1] = B[m] * (1 + i[m]) + c[m]
+        =>  B[M] = P[M] * (B[0] + sum(c[m] / P[m+1]))        P[m] = prod(1 + i[k], k < m)
+
+    EPF (EPFO method: interest on the monthly running balance, credited at year end):
+        B[y+1] = B[y] * (1 + r[y]) + C[y] + r[y] / 12 * W[y]
+        C[y] = contributions in year y
+        W[y] = sum(c[y, k] * (11 - k))  (month k's deposit earns interest for the rest of the year)
+
+EPS is a defined-benefit scheme, so only cumulative EPS contributions are projected.
+Monthly contributions use the same formulas and rounding as
+calculate_pf_contribution() and calculate_nps_contribution(), with the PF wage
+ceiling and EPS rate in force today (see rates.py) held for the whole horizon.
+"""
+
+import numpy as np
+
+from batch_engine import broadcast, column, round_currency
+from rates import rates_on
+
+DEFAULT_CHUNK_SIZE = 4096
+
+def _per_period(rate, periods):
+    """Expand a scalar or per-year sequence of percentages into an array of fractions"""
+    rate = np.asarray(rate, dtype=float) / 100
+    if rate.ndim == 0:
+        return np.full(periods, float(rate))
+    if len(rate) != periods:
+        raise ValueError(f'Expected one rate per year ({periods}), got {len(rate)}')
+    return rate
+
+def _monthly_salaries(basic, da_percent, years, salary_growth, da_revision, da_revision_months):
+    """Return (basic, DA) as (employees x months) arrays"""
+    months = np.arange(years * 12)
+    # Increments on every 12-month anniversary, DA revised every da_revision_months
+    growth = (1 + salary_growth / 100) ** (months // 12)
+    da_steps = da_revision * (months // da_revision_months)
+    monthly_basic = basic[:, None] * growth[None, :]
+    monthly_da = monthly_basic * (da_percent[:, None] + da_steps[None, :]) / 100
+    return monthly_basic, monthly_da
+
+def _epf_year_end_balances(contributions, opening, interest):
+    """
+    Year-end EPF balances for (employees x months) contributions
+
+    Args:
+        contributions: Monthly deposits, shape (n, years * 12)
+        opening: Opening balances, shape (n,)
+        interest: Annual rates as fractions, shape (years,)
+
+    Returns:
+        numpy.ndarray: Balances at the end of each year, shape (n, years)
+    """
+    n, months = contributions.shape
+    by_year = contributions.reshape(n, months // 12, 12)
+    annual = by_year.sum(axis=2)
+    weighted = by_year @ np.arange(11, -1, -1, dtype=float)
+    deposits = annual + weighted * (interest / 12)
+    # B[y] = P[y] * (B[0] + sum(d[j] / P[j+1], j < y)),  P[y] = prod(1 + r[k], k < y)
+    growth = np.cumprod(1 + interest)
+    return growth * (opening[:, None] + np.cumsum(deposits / growth, axis=1))
+
+def _nps_balances(contributions, opening, monthly_rates):
+    """Balances after every month for (employees x months) contributions"""
+    growth = np.cumprod(1 + monthly_rates)
+    return growth * (opening[:, None] + np.cumsum(contributions / growth, axis=1))
+
+def project_corpus(basic, da_percent=0, sector='private', years=30, salary_growth=0, da_revision=0,
+                   da_revision_months=6, epf_interest_rate=8.25, nps_return=10, nps_employee_rate=10,
+                   nps_employer_rate=None, opening_epf=0, opening_nps=0, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Project EPF, EPS and NPS accumulation month by month for every employee
+
+    Private sector employees contribute to EPF/EPS and government employees to NPS.
+
+    Args:
+        basic: Array of current monthly basic pay
+        da_percent: Current DA as a percentage of basic (array or single value)
+        sector: Array (or single value) of 'private' / 'government'
+        years: Projection horizon in years
+        salary_growth: Annual increment of basic pay, in percent
+        da_revision: Percentage points added to DA at each revision
+        da_revision_months: Months between DA revisions
+        epf_interest_rate: Annual EPF interest rate in percent (single value or one per year)
+        nps_return: Annual NPS return in percent, compounded monthly (single value or one per year)
+        nps_employee_rate: NPS employee contribution rate
+        nps_employer_rate: NPS government contribution rate (default: the rate in force today)
+        opening_epf: Current EPF balances
+        opening_nps: Current NPS balances
+        chunk_size: Employees projected per block (bounds memory use)
+
+    Returns:
+        dict: (employees x years) arrays of year-end values:
+              'epf_balance', 'eps_contributions', 'nps_balance',
+              'employee_contributions', 'employer_contributions',
+              plus 'year' (1..years)
+    """
+    basic = column(basic)
+    size = max(len(basic), np.size(da_percent), np.size(sector), np.size(opening_epf), np.size(opening_nps))
+    basic, da_percent, opening_epf, opening_nps = broadcast(
+        size, basic, column(da_percent), column(opening_epf), column(opening_nps))
+    is_government = broadcast(size, column(sector, dtype=object) == 'government')[0]
+
+    epf_interest = _per_period(epf_interest_rate, years)
+    nps_annual = _per_period(nps_return, years)
+    nps_monthly = np.repeat((1 + nps_annual) ** (1 / 12) - 1, 12)
+
+    results = {name: np.zeros((size, years)) for name in (
+        'epf_balance', 'eps_contributions', 'nps_balance', 'employee_contributions', 'employer_contributions')}
+    year_ends = np.arange(11, years * 12, 12)
+    rates = rates_on()
+    pf_ceiling, eps_rate = rates['pf_wage_ceiling'], rates['eps_rate']
+    if nps_employer_rate is None:
+        nps_employer_rate = rates['nps_employer_rate']
+
+    for start in range(0, size, chunk_size):
+        rows = slice(start, min(start + chunk_size, size))
+        monthly_basic, monthly_da = _monthly_salaries(
+            basic[rows], da_percent[rows], years, salary_growth, da_revision, da_revision_months)
+        government = is_government[rows][:, None]
+
+        # EPF/EPS on Basic + DA capped at the wage ceiling (private sector)
+        pf_salary = np.where(government, 0.0, np.minimum(monthly_basic + monthly_da, pf_ceiling))
+        pf_employee = round_currency((pf_salary * 12) / 100)
+        pf_employer = (pf_salary * 12) / 100
+        eps = round_currency((pf_salary * eps_rate) / 100)
+        epf_employer = round_currency(pf_employer - (pf_salary * eps_rate) / 100)
+        del pf_salary
+
+        # NPS on Basic + DA (government sector)
+        nps_salary = np.where(government, monthly_basic + monthly_da, 0.0)
+        del monthly_basic, monthly_da
+        nps_employee = (nps_salary * nps_employee_rate) / 100
+        nps_employer = (nps_salary * nps_employer_rate) / 100
+        nps_total = round_currency(nps_employee + nps_employer)
+        nps_employee, nps_employer = round_currency(nps_employee), round_currency(nps_employer)
+        del nps_salary
+
+        results['epf_balance'][rows] = _epf_year_end_balances(pf_employee + epf_employer, opening_epf[rows], epf_interest)
+        results['nps_balance'][rows] = _nps_balances(nps_total, opening_nps[rows], nps_monthly)[:, year_ends]
+        results['eps_contributions'][rows] = np.cumsum(eps, axis=1)[:, year_ends]
+        results['employee_contributions'][rows] = np.cumsum(pf_employee + nps_employee, axis=1)[:, year_ends]
+        results['employer_contributions'][rows] = np.cumsum(epf_employer + eps + nps_employer, axis=1)[:, year_ends]
+
+    for name in ('epf_balance', 'nps_balance'):
+        results[name] = round_currency(results[name])
+    results['year'] = np.arange(1, years + 1)
+    return results
\ No newline at end of file
@@ -0,0 +1,282 @@
+"""
+Statutory Rate Registry for Indian Labor Law Compliance System
+Effective-dated wage ceilings, contribution rates and caps
+
+Rates live in data/rates.json, one list of {'from': 'YYYY-MM-DD', 'value': ...}
+entries per rate. The file is parsed once into an immutable RuleSet; the
+calculators look rates up by pay-period date, so history can be re-run with
+the rates of the time:
+
+    rates_on(date(2016, 4, 1))['pf_wage_ceiling']   # 15000
+    rates_on(date(2014, 8, 1))['pf_wage_ceiling']   # 6500
+
+reload_rates() parses and validates the file before swapping the active
+RuleSet in a single assignment, so a worker picks up new rates without a
+restart and a calculation never sees half of an update. Calculators take one
+rates_on() snapshot per call for the same reason. rules_version() identifies
+the active rules for cache keys.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
+from types import MappingProxyType
+
+RATES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'rates.json')
+
+# Rates every rule file must define
+REQUIRED_RATES = (
+    'pf_wage_ceiling', 'eps_rate', 'esi_wage_limit', 'esi_employee_rate',
+    'esi_employer_rate', 'gratuity_cap', 'nps_employer_rate'
+)
+
+def as_pay_period(value):
+    """
+    Convert a pay period to a date
+
+    Args:
+        value: date, datetime, 'YYYY-MM-DD' or 'YYYY-MM' (first of the month);
+               None means today
+
+    Returns:
+        datetime.date
+    """
+    if value is None:
+        return date.today()
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value).strip()
+    try:
+        if len(text) == 7:
+            return datetime.strptime(text, '%Y-%m').date()
+        return datetime.strptime(text, '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError(f'Invalid pay period: {value!r} (expected YYYY-MM or YYYY-MM-DD)')
+
+class RateTable:
+    """Values of one rate with the dates they took effect, sorted by date"""
+
+    __slots__ = ('name', 'starts', 'values')
+
+    def __init__(self, name, entries):
+        self.name = name
+        self.starts = tuple(start for start, value in entries)
+        self.values = tuple(value for start, value in entries)
+
+    def on(self, day):
+        """Value in force on a date, or None before the first entry"""
+        position = bisect_right(self.starts, day)
+        return self.values[position - 1] if position else None
+
+class _RatesInForce(dict):
+    """Rates in force on a date; looking up one not yet in force raises ValueError"""
+
+    def __init__(self, day, rates):
+        super().__init__(rates)
+        self.day = day
+
+    def __missing__(self, name):
+        raise ValueError(f'No {name} in force on {self.day.isoformat()}')
+
+class RuleSet:
+    """
+    Immutable, parsed contents of a rates file
+
+    Attributes:
+        version: Version declared in the file
+        digest: SHA-256 of the file contents
+        tables: Read-only {rate name: RateTable}
+    """
+
+    def __init__(self, version, digest, tables):
+        self.version = version
+        self.digest = digest
+        self.tables = MappingProxyType(tables)
+        # The digest invalidates caches even if an edit forgets to bump the version
+        self.rules_version = f'{version}-{digest[:12]}'
+        self._snapshots = {}
+        self._lock = threading.Lock()
+        # (next local midnight as a timestamp, today, today's snapshot)
+        self._today = None
+
+    def rates_on(self, day):
+        """Read-only {rate name: value} in force on a date (cached per date)"""
+        snapshot = self._snapshots.get(day)
+        if snapshot is None:
+            values = ((name, table.on(day)) for name, table in self.tables.items())
+            snapshot = MappingProxyType(_RatesInForce(day, {name: value for name, value in values if value is not None}))
+            with self._lock:
+                if len(self._snapshots) >= 4096:
+                    self._snapshots.clear()
+                self._snapshots[day] = snapshot
+        return snapshot
+
+    def today(self):
+        """(today, rates_on(today)), without looking up the date on every call"""
+        today = self._today
+        if today is None or time.time() >= today[0]:
+            day = date.today()
+            midnight = datetime.combine(day + timedelta(days=1), datetime.min.time()).timestamp()
+            today = self._today = (midnight, day, self.rates_on(day))
+        return today[1:]
+
+def parse_rules(content):
+    """
+    Parse and validate the contents of a rates file
+
+    Args:
+        content: File contents (bytes)
+
+    Returns:
+        RuleSet
+
+    Raises:
+        ValueError: If the file is not valid
+    """
+    try:
+        document = json.loads(content)
+        version = str(document['version'])
+        rates = document['rates']
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f'Invalid rates file: {e}')
+
+    missing = [name for name in REQUIRED_RATES if name not in rates]
+    if missing:
+        raise ValueError(f"Rates file is missing: {', '.join(missing)}")
+
+    tables = {}
+    for name, entries in rates.items():
+        parsed = []
+        try:
+            for entry in entries:
+                value = entry['value']
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    raise ValueError(f'value must be a number, got {value!r}')
+                parsed.append((datetime.strptime(entry['from'], '%Y-%m-%d').date(), value))
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f'Invalid {name} entry: {e}')
+        if not parsed:
+            raise ValueError(f'No entries for {name}')
+        parsed.sort()
+        if len({start for start, value in parsed}) != len(parsed):
+            raise ValueError(f'Duplicate effective dates for {name}')
+        tables[name] = RateTable(name, parsed)
+
+    return RuleSet(version, hashlib.sha256(content).hexdigest(), tables)
+
+_state = {
+    'rules': None,
+    'path': RATES_FILE,
+    'mtime': None
+}
+_reload_lock = threading.Lock()
+
+def reload_rates(path=None):
+    """
+    Load a rates file and make it active
+
+    The file is fully parsed before the active rules are replaced; if it is
+    invalid, a ValueError is raised and the current rules stay in force.
+
+    Args:
+        path: Rates file (default: the file loaded last, initially data/rates.json)
+
+    Returns:
+        RuleSet: The rules now in force
+    """
+    with _reload_lock:
+        path = path or _state['path']
+        with open(path, 'rb') as source:
+            mtime = os.fstat(source.fileno()).st_mtime_ns
+            rules = parse_rules(source.read())
+        _state['path'] = path
+        _state['mtime'] = mtime
+        _state['rules'] = rules
+        return rules
+
+def reload_if_changed():
+    """
+    Reload the rates file if it was modified since it was loaded
+
+    Returns:
+        bool: True if new rules were loaded
+    """
+    try:
+        mtime = os.stat(_state['path']).st_mtime_ns
+    except OSError:
+        return False
+    if mtime == _state['mtime']:
+        return False
+    try:
+        reload_rates()
+    except ValueError:
+        # The rules in force stay; do not retry until the file changes again
+        _state['mtime'] = mtime
+        raise
+    return True
+
+def active_rules():
+    """The RuleSet in force (loaded on first use)"""
+    rules = _state['rules']
+    if rules is None:
+        rules = reload_rates()
+    return rules
+
+def rates_on(pay_period=None):
+    """
+    Rates in force for a pay period
+
+    Args:
+        pay_period: See as_pay_period() (default: today)
+
+    Returns:
+        Read-only mapping of rate name to value; looking up a rate that was not
+        yet in force raises ValueError
+    """
+    rules = _state['rules'] or active_rules()
+    if pay_period is None:
+        return rules.today()[1]
+    return rules.rates_on(as_pay_period(pay_period))
+
+def rate(name, pay_period=None):
+    """Value of one rate for a pay period"""
+    return rates_on(pay_period)[name]
+
+def rules_version():
+    """Identifier of the rules in force, for cache keys"""
+    return active_rules().rules_version
+
+def rules_source():
+    """(path, rules_version) of the rules in force, for other processes to load the same rules"""
+    rules = active_rules()
+    return _state['path'], rules.rules_version
+
+def ensure_rules(source):
+    """
+    Make the rules described by rules_source() active in this process
+
+    Pool workers call this before each chunk, so they follow reloads made in
+    the parent process.
+
+    Args:
+        source: (path, rules_version) from rules_source()
+    """
+    path, version = source
+    rules = _state['rules']
+    if rules is None or rules.rules_version != version or _state['path'] != path:
+        reload_rates(path)
+
+def rules_key():
+    """
+    Cache key component for results computed without an explicit pay period:
+    changes when the rules are reloaded and at midnight, when another rate may
+    come into force
+    """
+    rules = _state['rules'] or active_rules()
+    return rules.rules_version, rules.today()[0]
@@ -0,0 +1,157 @@
+"""
+Rendered PDF Report Cache for StatutoryCalc
+Size-bounded LRU cache of PDF bytes with an optional on-disk tier
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+def report_cache_key(calc_type, data, rules_version, generated_on=None):
+    """
+    Build the cache key for a rendered report
+
+    Args:
+        calc_type: Report type
+        data: Normalized report inputs (as returned by calculations.prepare_report)
+        rules_version: Version of the statutory rules used for the calculation
+        generated_on: Date printed on the report (None for undated)
+
+    Returns:
+        str: Hex digest identifying the report; also usable as a strong ETag
+    """
+    canonical = json.dumps(
+        [calc_type, data, rules_version, generated_on.isoformat() if generated_on else None],
+        sort_keys=True, separators=(',', ':'), default=str
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+class ReportCache:
+    """
+    LRU cache for rendered reports, bounded by total bytes
+
+    The memory tier holds up to max_bytes of PDFs. If a directory is given,
+    every report is also written there (bounded by max_disk_bytes) so the
+    cache survives restarts; disk hits are promoted back into memory.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, directory=None, max_disk_bytes=1024 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._disk_size = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._prune_disk()
+
+    def get(self, key):
+        """Return cached PDF bytes for key, or None"""
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+
+        data = self._read_disk(key)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._store(key, data)
+        return data
+
+    def put(self, key, data):
+        """Cache PDF bytes under key"""
+        with self._lock:
+            self._store(key, data)
+        self._write_disk(key, data)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'directory': self.directory
+            }
+
+    def _store(self, key, data):
+        if len(data) > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous)
+        self._entries[key] = data
+        self._size += len(data)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+            self.evictions += 1
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.pdf')
+
+    def _read_disk(self, key):
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_disk(self, key, data):
+        if not self.directory:
+            return
+        # Write to a temporary file first so readers never see a partial PDF
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, self._path(key))
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+        with self._lock:
+            self._disk_size += len(data)
+            over_budget = self._disk_size > self.max_disk_bytes
+        if over_budget:
+            self._prune_disk()
+
+    def _prune_disk(self):
+        """Remove the least recently written reports once the disk tier is over budget"""
+        try:
+            files = [entry for entry in os.scandir(self.directory)
+                     if entry.is_file() and entry.name.endswith('.pdf')]
+        except OSError:
+            return
+        total = sum(entry.stat().st_size for entry in files)
+        if total > self.max_disk_bytes:
+            for entry in sorted(files, key=lambda e: e.stat().st_mtime):
+                try:
+                    size = entry.stat().st_size
+                    os.remove(entry.path)
+                except OSError:
+                    continue
+                total -= size
+                if total <= self.max_disk_bytes:
+                    break
+        with self._lock:
+            self._disk_size = total
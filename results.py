@@ -0,0 +1,114 @@
+"""
+Result Records for Indian Labor Law Compliance System
+Compact, immutable slotted records for calculator results
+
+A dict per result costs several hundred bytes; these records store the same
+values in fixed slots, which matters when hundreds of thousands of results are
+held in memory (e.g. batch reconciliation). Fields that do not apply to a
+result are None and left out of to_dict(), so to_dict() returns exactly the
+dict produced by the matching core_calculators function.
+"""
+
+from dataclasses import dataclass, fields
+
+class _ResultRecord:
+    __slots__ = ()
+
+    def to_dict(self):
+        """Return the result as the dict used by the templates and JSON API"""
+        return {field.name: getattr(self, field.name) for field in fields(self)
+                if getattr(self, field.name) is not None}
+
+    @classmethod
+    def from_dict(cls, result):
+        """Build a record from a calculator result dict"""
+        return cls(**result)
+
+@dataclass(frozen=True, slots=True)
+class GratuityResult(_ResultRecord):
+    eligible: bool
+    gratuity_amount: float
+    capped_at_maximum: bool = None
+    reason: str = None
+    sector: str = 'private'
+    note: str = None
+
+@dataclass(frozen=True, slots=True)
+class PFResult(_ResultRecord):
+    pf_eligible_salary: float
+    employee_contribution: float
+    employer_epf_contribution: float
+    employer_eps_contribution: float
+    total_employer_contribution: float
+    total_monthly_pf: float
+    sector: str = 'private'
+
+@dataclass(frozen=True, slots=True)
+class GPFResult(_ResultRecord):
+    basic_salary: float
+    min_gpf_contribution: float
+    max_gpf_contribution: float
+    recommended_contribution: float
+    sector: str = 'government'
+    note: str = None
+
+@dataclass(frozen=True, slots=True)
+class ESIResult(_ResultRecord):
+    eligible: bool
+    reason: str = None
+    employee_contribution: float = 0
+    employer_contribution: float = 0
+    total_contribution: float = None
+
+@dataclass(frozen=True, slots=True)
+class NPSResult(_ResultRecord):
+    nps_eligible_salary: float
+    employee_contribution: float
+    employer_contribution: float
+    total_contribution: float
+    employee_rate: float
+    employer_rate: float
+    sector: str = 'government'
+
+@dataclass(frozen=True, slots=True)
+class LeaveEntitlement(_ResultRecord):
+    earned_leave: int
+    casual_leave: int
+    sick_leave: int
+    maternity_leave: int = None
+    paternity_leave: int = None
+    child_care_leave: int = None
+    study_leave: str = None
+    total_annual_leave: int = 0
+    establishment_type: str = None
+    state: str = None
+    sector: str = 'private'
+    note: str = None
+
+RECORD_TYPES = {
+    'gratuity': GratuityResult,
+    'pf': PFResult,
+    'gpf': GPFResult,
+    'esi': ESIResult,
+    'nps': NPSResult,
+    'leave': LeaveEntitlement
+}
+
+def as_record(calc_type, result):
+    """
+    Convert a calculator result dict into its record type
+
+    Args:
+        calc_type: 'gratuity', 'pf', 'gpf', 'esi', 'nps' or 'leave'
+        result: Result dict from core_calculators
+
+    Returns:
+        Record instance
+    """
+    if calc_type in ('pf', 'gpf'):
+        record_type = GPFResult if result.get('sector') == 'government' else PFResult
+    elif calc_type in RECORD_TYPES:
+        record_type = RECORD_TYPES[calc_type]
+    else:
+        raise ValueError(f'No result record for calculation type: {calc_type}')
+    return record_type.from_dict(result)
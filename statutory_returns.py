@@ -0,0 +1,400 @@
+"""
+Statutory Returns for Indian Labor Law Compliance System
+Monthly EPF Electronic Challan-cum-Return (ECR) and ESI contribution files
+for whole establishments
+
+The roster (CSV or XLSX, one row per member) is read in a single pass. Each
+row produces its ECR line and ESI row straight away, written to the files of
+its establishment, and adds to that establishment's running totals. Totals
+and challan amounts are ready when the last row has been read. No list of
+members is ever held in memory: output is buffered in small blocks per file
+and appended, so no file handle stays open between blocks.
+
+Roster columns:
+    establishment   Establishment code (optional, default from the caller)
+    uan             12-digit UAN (members without one are left out of the ECR)
+    ip_number       10-digit ESI IP number (members without one are left out of the ESI file)
+    name            Member name
+    basic, da       Basic pay and DA earned for the month
+    gross_wages     Gross wages (default basic + da)
+    ncp_days        Non-contributing (absent) days, default 0
+    days_paid       Days wages were paid for, for ESI (default days in month - ncp_days)
+    eps_member      'no' for members not in the EPS (e.g. past 58), default yes
+    refund          Refund of advances, default 0
+    reason_code, last_working_day
+                    ESI reason code for zero days and last working day (optional)
+
+ECR: one line per member, 11 fields separated by '#~#': UAN, name, gross,
+EPF, EPS and EDLI wages, EE share, EPS share, ER share (EPF-EPS
+difference), NCP days, refund. All amounts are whole rupees. EPF, EPS and
+EDLI wages are capped at the PF wage ceiling, as in
+calculate_pf_contribution(), and shares are rounded to the nearest rupee.
+
+ESI: the columns of the ESIC monthly contribution upload template, as CSV.
+Members whose wages exceed the ESI wage limit are left out and counted.
+Contributions are rounded up to the next rupee, as ESIC computes them.
+
+Wage ceilings, rates and challan charges are the ones in force for the pay
+period (see rates.py).
+"""
+
+import argparse
+import calendar
+import csv
+import io
+import json
+import math
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+
+from payroll_pipeline import parse_amount, read_csv_rows, read_xlsx_rows
+from rates import as_pay_period, rates_on
+
+ECR_SEPARATOR = '#~#'
+
+ESI_COLUMNS = [
+    'IP Number',
+    'IP Name',
+    'No of Days for which wages paid/payable during the month',
+    'Total Monthly Wages',
+    'Reason Code for Zero workings days',
+    'Last Working Day'
+]
+
+# Rows that failed validation kept in the summary (all of them are counted)
+MAX_REPORTED_ERRORS = 100
+
+# Output buffered per file before it is appended to disk
+WRITE_BUFFER_BYTES = 16384
+
+def _rupees(value):
+    """Round half up to whole rupees"""
+    return int(math.floor(value + 0.5))
+
+def _basis_points(rate):
+    return int(round(rate * 100))
+
+def _share(wages, basis_points):
+    """Share of whole-rupee wages, rounded to the nearest rupee (integer arithmetic)"""
+    return (wages * basis_points + 5000) // 10000
+
+def _share_rounded_up(wages, basis_points):
+    """Share of whole-rupee wages, rounded up to the next rupee"""
+    return -(-wages * basis_points // 10000)
+
+def _amount(row, field, default=None):
+    return parse_amount(row.get(field), field, default)
+
+def _digits(row, field, length):
+    value = row.get(field)
+    if value is None:
+        return ''
+    # Spreadsheets hand numbers back as int/float
+    text = str(int(value)) if isinstance(value, (int, float)) else str(value).strip()
+    if text and (not text.isdigit() or len(text) != length):
+        raise ValueError(f'{field} must be {length} digits')
+    return text
+
+def _member_name(value):
+    """Upper-case letters, dots and single spaces (the separator can never appear)"""
+    return ' '.join(re.sub(r'[^A-Za-z. ]+', ' ', str(value or '')).upper().split())
+
+def _filename_part(value):
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', value).strip('_') or 'establishment'
+
+class _BufferedFile:
+    """
+    Text file written in blocks of WRITE_BUFFER_BYTES
+
+    The file is opened only to append a full block, so a roster with hundreds
+    of establishments never holds more than one output file open.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.buffer = io.StringIO()
+        open(path, 'w', encoding='utf-8', newline='').close()
+
+    def write(self, text):
+        self.buffer.write(text)
+        if self.buffer.tell() >= WRITE_BUFFER_BYTES:
+            self.flush()
+
+    def flush(self):
+        if self.buffer.tell():
+            with open(self.path, 'a', encoding='utf-8', newline='') as output:
+                output.write(self.buffer.getvalue())
+            self.buffer = io.StringIO()
+
+class EstablishmentTotals:
+    """Running ECR and ESI totals for one establishment"""
+
+    __slots__ = (
+        'ecr_members', 'gross_wages', 'epf_wages', 'eps_wages', 'edli_wages',
+        'ee_share', 'eps_share', 'er_share', 'ncp_days', 'refunds',
+        'esi_members', 'esi_days', 'esi_wages', 'esi_employee', 'esi_employer', 'esi_above_limit'
+    )
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    def to_dict(self, rates):
+        """
+        Totals plus the challan amounts due
+
+        Args:
+            rates: Rates in force for the pay period (for the challan charges)
+        """
+        admin = 0
+        if self.ecr_members:
+            admin = max(_share(self.epf_wages, _basis_points(rates['epf_admin_rate'])), rates.get('epf_admin_minimum', 0))
+        edli = _share(self.edli_wages, _basis_points(rates['edli_rate']))
+        return {
+            'ecr': {
+                'members': self.ecr_members,
+                'gross_wages': self.gross_wages,
+                'epf_wages': self.epf_wages,
+                'eps_wages': self.eps_wages,
+                'edli_wages': self.edli_wages,
+                'ee_share': self.ee_share,
+                'eps_share': self.eps_share,
+                'er_share': self.er_share,
+                'ncp_days': self.ncp_days,
+                'refunds': self.refunds,
+                'challan': {
+                    'ac_1': self.ee_share + self.er_share,
+                    'ac_2': admin,
+                    'ac_10': self.eps_share,
+                    'ac_21': edli,
+                    'ac_22': 0,
+                    'total': self.ee_share + self.er_share + admin + self.eps_share + edli
+                }
+            },
+            'esi': {
+                'members': self.esi_members,
+                'days': self.esi_days,
+                'wages': self.esi_wages,
+                'employee_contribution': self.esi_employee,
+                'employer_contribution': self.esi_employer,
+                'total_contribution': self.esi_employee + self.esi_employer,
+                'above_wage_limit': self.esi_above_limit
+            }
+        }
+
+class ReturnGenerator:
+    """
+    Single-pass ECR and ESI file writer
+
+    Call add() for every roster row, then close() for the summary. Output
+    files are created the first time an establishment appears:
+    <establishment>_ECR_<YYYYMM>.txt and <establishment>_ESI_<YYYYMM>.csv.
+    Codes whose file names would clash get a numeric suffix (MH_001_2_...).
+    """
+
+    def __init__(self, directory, pay_period=None, establishment='ESTABLISHMENT'):
+        self.directory = directory
+        self.pay_period = as_pay_period(pay_period).replace(day=1)
+        self.default_establishment = establishment
+        self.rates = rates_on(self.pay_period)
+        self.days_in_month = calendar.monthrange(self.pay_period.year, self.pay_period.month)[1]
+        self.rows = 0
+        self.errors = 0
+        self.error_rows = []
+        self.started = time.perf_counter()
+        self._establishments = {}
+        self._stems = set()
+        self._files = []
+
+        rates = self.rates
+        self._ceiling = rates['pf_wage_ceiling']
+        self._eps_rate = _basis_points(rates['eps_rate'])
+        self._esi_limit = rates['esi_wage_limit']
+        self._esi_employee_rate = _basis_points(rates['esi_employee_rate'])
+        self._esi_employer_rate = _basis_points(rates['esi_employer_rate'])
+        os.makedirs(directory, exist_ok=True)
+
+    def _establishment(self, code):
+        entry = self._establishments.get(code)
+        if entry is None:
+            # Different codes can sanitize to the same name ('MH/001', 'MH 001'): number the repeats
+            part = base = _filename_part(code)
+            suffix = 1
+            while part in self._stems:
+                suffix += 1
+                part = f'{base}_{suffix}'
+            self._stems.add(part)
+            stem = f"{part}_{{}}_{self.pay_period.strftime('%Y%m')}"
+            ecr = _BufferedFile(os.path.join(self.directory, stem.format('ECR') + '.txt'))
+            esi = _BufferedFile(os.path.join(self.directory, stem.format('ESI') + '.csv'))
+            self._files += [ecr, esi]
+            esi_writer = csv.writer(esi, lineterminator='\r\n')
+            esi_writer.writerow(ESI_COLUMNS)
+            entry = self._establishments[code] = (EstablishmentTotals(), ecr, esi_writer,
+                                                  [os.path.basename(ecr.path), os.path.basename(esi.path)])
+        return entry
+
+    def add(self, row):
+        """Add one roster row (a dict of raw values)"""
+        self.rows += 1
+        try:
+            self._add(row)
+        except (TypeError, ValueError) as e:
+            self.errors += 1
+            if len(self.error_rows) < MAX_REPORTED_ERRORS:
+                self.error_rows.append({'row': self.rows, 'error': str(e)})
+
+    def _add(self, row):
+        uan = _digits(row, 'uan', 12)
+        ip_number = _digits(row, 'ip_number', 10)
+        if not uan and not ip_number:
+            raise ValueError('uan or ip_number is required')
+        basic = _amount(row, 'basic')
+        da = _amount(row, 'da', 0.0)
+        gross = _rupees(_amount(row, 'gross_wages', basic + da))
+        # Parse every field before anything is written, so a rejected row leaves no trace
+        ncp_days = int(_amount(row, 'ncp_days', 0.0))
+        if ncp_days > self.days_in_month:
+            raise ValueError('ncp_days is more than the days in the month')
+        refund = _rupees(_amount(row, 'refund', 0.0))
+        days = int(_amount(row, 'days_paid', float(self.days_in_month - ncp_days)))
+        if days > self.days_in_month:
+            raise ValueError('days_paid is more than the days in the month')
+        name = _member_name(row.get('name'))
+        code = str(row.get('establishment') or '').strip() or self.default_establishment
+        totals, ecr, esi_writer, _ = self._establishment(code)
+
+        if uan:
+            epf_wages = min(_rupees(basic + da), self._ceiling)
+            eps_member = str(row.get('eps_member') or 'yes').strip().lower() not in ('no', 'n', 'false', '0')
+            eps_wages = epf_wages if eps_member else 0
+            ee_share = _share(epf_wages, 1200)
+            eps_share = _share(eps_wages, self._eps_rate)
+            er_share = ee_share - eps_share
+            ecr.write(ECR_SEPARATOR.join((
+                uan, name, str(gross), str(epf_wages), str(eps_wages), str(epf_wages),
+                str(ee_share), str(eps_share), str(er_share), str(ncp_days), str(refund)
+            )) + '\n')
+            totals.ecr_members += 1
+            totals.gross_wages += gross
+            totals.epf_wages += epf_wages
+            totals.eps_wages += eps_wages
+            totals.edli_wages += epf_wages
+            totals.ee_share += ee_share
+            totals.eps_share += eps_share
+            totals.er_share += er_share
+            totals.ncp_days += ncp_days
+            totals.refunds += refund
+
+        if ip_number:
+            if gross > self._esi_limit:
+                totals.esi_above_limit += 1
+                return
+            reason = str(row.get('reason_code') or '').strip() or ('0' if days == 0 else '')
+            esi_writer.writerow([ip_number, name, days, gross, reason, str(row.get('last_working_day') or '').strip()])
+            totals.esi_members += 1
+            totals.esi_days += days
+            totals.esi_wages += gross
+            totals.esi_employee += _share_rounded_up(gross, self._esi_employee_rate)
+            totals.esi_employer += _share_rounded_up(gross, self._esi_employer_rate)
+
+    def close(self):
+        """
+        Write out the buffered output and summary.json
+
+        Returns:
+            dict: {'pay_period', 'rows', 'errors', 'error_rows', 'seconds', 'rows_per_sec',
+                   'establishments': {code: {'ecr': totals and challan, 'esi': totals, 'files'}}}
+        """
+        for output in self._files:
+            output.flush()
+        self._files = []
+        elapsed = time.perf_counter() - self.started
+        summary = {
+            'pay_period': self.pay_period.strftime('%Y-%m'),
+            'rows': self.rows,
+            'errors': self.errors,
+            'error_rows': self.error_rows,
+            'seconds': round(elapsed, 3),
+            'rows_per_sec': round(self.rows / elapsed, 1) if elapsed else 0.0,
+            'establishments': {
+                code: dict(totals.to_dict(self.rates), files=files)
+                for code, (totals, _, _, files) in sorted(self._establishments.items())
+            }
+        }
+        with open(os.path.join(self.directory, 'summary.json'), 'w', encoding='utf-8') as output:
+            json.dump(summary, output, indent=2)
+        return summary
+
+def generate_returns(rows, directory, pay_period=None, establishment='ESTABLISHMENT', progress=None):
+    """
+    Write ECR and ESI files for a roster in one pass
+
+    Args:
+        rows: Iterable of raw roster row dicts (see read_csv_rows / read_xlsx_rows in payroll_pipeline)
+        directory: Output directory
+        pay_period: Wage month (default: the current month)
+        establishment: Establishment code for rows without one
+        progress: Optional callable(rows_done) called every 10,000 rows
+
+    Returns:
+        dict: Summary (see ReturnGenerator.close)
+    """
+    generator = ReturnGenerator(directory, pay_period, establishment)
+    try:
+        for row in rows:
+            generator.add(row)
+            if progress is not None and generator.rows % 10000 == 0:
+                progress(generator.rows)
+    finally:
+        summary = generator.close()
+    return summary
+
+def write_returns_zip(rows, output, pay_period=None, establishment='ESTABLISHMENT', progress=None):
+    """
+    Generate the returns and write them, with summary.json, as a ZIP archive
+
+    Args:
+        output: Writable binary file object
+        (other arguments as for generate_returns)
+
+    Returns:
+        dict: Summary
+    """
+    directory = tempfile.mkdtemp(prefix='returns-')
+    try:
+        summary = generate_returns(rows, directory, pay_period, establishment, progress)
+        with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for name in sorted(os.listdir(directory)):
+                archive.write(os.path.join(directory, name), name)
+        return summary
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate monthly ECR and ESI files from a roster')
+    parser.add_argument('input', help='Roster CSV or XLSX file')
+    parser.add_argument('output', help='Output directory')
+    parser.add_argument('--pay-period', type=as_pay_period, default=None, help='Wage month (YYYY-MM), default this month')
+    parser.add_argument('--establishment', default='ESTABLISHMENT', help='Code for rows without an establishment')
+    args = parser.parse_args()
+
+    if args.input.lower().endswith('.xlsx'):
+        summary = generate_returns(read_xlsx_rows(args.input), args.output, args.pay_period, args.establishment)
+    else:
+        with open(args.input, newline='', encoding='utf-8-sig') as source:
+            summary = generate_returns(read_csv_rows(source), args.output, args.pay_period, args.establishment)
+
+    print(f"{summary['rows']:,} rows ({summary['errors']:,} errors) in {summary['seconds']:.1f}s - "
+          f"{summary['rows_per_sec']:,.0f} rows/sec", file=sys.stderr)
+    for code, totals in summary['establishments'].items():
+        print(f"{code}: {totals['ecr']['members']:,} ECR members, challan Rs. {totals['ecr']['challan']['total']:,}; "
+              f"{totals['esi']['members']:,} ESI members, Rs. {totals['esi']['total_contribution']:,}", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Tests for the incremental accrual ledger
+"""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from accrual_ledger import AccrualLedger, service_years
+from core_calculators import calculate_gratuity, calculate_leave_entitlement
+
+@pytest.mark.parametrize('state, establishment_type', [
+    ('general', 'factory'), ('general', 'shop'), ('maharashtra', 'shop'),
+    ('tamil nadu', 'shop'), ('karnataka', 'factory'), ('assam', 'office')
+])
+def test_daily_attendance_matches_leave_calculator(state, establishment_type):
+    ledger = AccrualLedger()
+    ledger.add_employee('E1', date(2020, 1, 1), 20000, state=state, establishment_type=establishment_type)
+    day = date(2025, 1, 1)
+    for days in range(1, 366):
+        ledger.record_attendance('E1', day)
+        expected = calculate_leave_entitlement(days, state, establishment_type)['earned_leave']
+        assert ledger.employee('E1')['earned_leave'] == expected
+        day += timedelta(days=1)
+
+def test_service_years_round_part_years_of_six_months():
+    joined = date(2018, 3, 15)
+    assert service_years(joined, date(2023, 3, 14)) == (4, 5)
+    assert service_years(joined, date(2023, 9, 14)) == (5, 5)
+    assert service_years(joined, date(2023, 9, 15)) == (5, 6)
+    assert service_years(date(2016, 2, 29), date(2021, 3, 1)) == (5, 5)
+
+@pytest.mark.parametrize('sector, salary', [
+    ('private', 45000), ('private', 400000), ('government', 80000),
+    # Amounts where a different operation order rounds to another paisa
+    ('private', 47989.63), ('government', 47989.63)
+])
+def test_vested_liability_matches_gratuity_calculator(sector, salary):
+    ledger = AccrualLedger()
+    ledger.add_employee('E1', date(2010, 7, 1), salary, sector=sector)
+    ledger.advance('E1', date(2025, 6, 30))
+    account = ledger.employee('E1')
+    assert account['gratuity_vested']
+    assert account['gratuity_liability'] == calculate_gratuity(salary, account['gratuity_years'], sector)['gratuity_amount']
+
+def test_running_totals_equal_sum_of_employees():
+    rng = random.Random(7)
+    ledger = AccrualLedger()
+    for number in range(50):
+        ledger.add_employee(number, date(2015, 1, 1) + timedelta(days=rng.randint(0, 3000)), rng.randint(10000, 90000),
+                            sector=rng.choice(['private', 'government']),
+                            establishment_type=rng.choice(['factory', 'shop']), state='karnataka')
+    for month in range(1, 13):
+        for number in range(50):
+            ledger.record_attendance(number, date(2024, month, 28), rng.randint(15, 26))
+            if rng.random() < 0.05:
+                ledger.update_salary(number, rng.randint(10000, 90000), date(2024, month, 28))
+    for number in range(50):
+        ledger.record_attendance(number, date(2025, 1, 31), 20)
+
+    totals = ledger.provisioning_report()['totals']
+    accounts = [ledger.employee(number) for number in range(50)]
+    assert totals['earned_leave'] == sum(account['earned_leave'] for account in accounts)
+    assert totals['gratuity_liability'] == pytest.approx(sum(account['gratuity_liability'] for account in accounts))
+    assert totals['leave_liability'] == pytest.approx(sum(account['leave_liability'] for account in accounts))
+    assert totals['vested_employees'] == sum(account['gratuity_vested'] for account in accounts)
+    # January only charges the new year's accruals; last year's leave was closed out
+    january = ledger.provisioning_report(2025, 1)['month']
+    assert january['earned_leave'] == totals['earned_leave']
+
+def test_attendance_for_a_closed_leave_year_is_rejected():
+    ledger = AccrualLedger()
+    ledger.add_employee('E1', date(2024, 1, 1), 20000)
+    ledger.record_attendance('E1', date(2025, 1, 2))
+    with pytest.raises(ValueError):
+        ledger.record_attendance('E1', date(2024, 12, 31))
+    with pytest.raises(KeyError):
+        ledger.record_attendance('E2', date(2025, 1, 2))
+def test_gratuity_cap_is_the_one_in_force_at_the_valuation_date():
+    ledger = AccrualLedger()
+    ledger.add_employee('E1', date(1990, 1, 1), 400000)
+    # Before the first cap on record: the earliest one applies
+    ledger.advance('E1', date(1996, 1, 1))
+    assert ledger.employee('E1')['gratuity_liability'] == 350000
+
+    ledger.advance('E1', date(2019, 1, 1))
+    # A back-dated salary change is valued at the ledger's date, not the event's
+    ledger.update_salary('E1', 500000, date(2017, 6, 1))
+    assert ledger.employee('E1')['gratuity_liability'] == 2000000
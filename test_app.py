@@ -0,0 +1,230 @@
+"""
+Application tests for the Flask routes
+"""
+
+import gzip
+import json
+import os
+import runpy
+import sys
+
+from app import LAZY_MODULES, app, warm_up
+
+def _client():
+    app.config['TESTING'] = True
+    return app.test_client()
+
+def test_api_calculate():
+    response = _client().post('/api/calculate', json={'type': 'pf', 'basic': 25000, 'da': 5000})
+    assert response.status_code == 200
+    assert response.get_json()['result']['total_monthly_pf'] == 3600.0
+
+    response = _client().post('/api/calculate', json={'type': 'unknown'})
+    assert response.status_code == 400
+
+def test_api_calculate_batch_json_array():
+    records = [
+        {'type': 'gratuity', 'salary': 50000, 'years': 6},
+        {'type': 'esi'},
+        {'type': 'bogus'},
+        'not a record',
+        {'type': 'compliance', 'state': 'Maharashtra', 'num_employees': 25, 'industry_type': 'Factory'}
+    ]
+    response = _client().post('/api/calculate/batch', json=records)
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [line['index'] for line in lines] == [0, 1, 2, 3, 4]
+    assert [line['success'] for line in lines] == [True, False, False, False, True]
+    assert lines[0]['result']['gratuity_amount'] == 173076.92
+    assert lines[1]['error'] == 'Missing field: salary'
+
+def test_api_calculate_batch_ndjson():
+    body = '\n'.join([
+        json.dumps({'type': 'nps', 'basic': 45000, 'da': 8000}),
+        '{broken',
+        '',
+        json.dumps({'type': 'leave', 'sector': 'government'})
+    ])
+    response = _client().post('/api/calculate/batch', data=body, content_type='application/x-ndjson')
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [line['success'] for line in lines] == [True, False, True]
+    assert lines[2]['result']['earned_leave'] == 30
+
+def test_api_calculate_batch_rejects_non_array():
+    response = _client().post('/api/calculate/batch', json={'type': 'pf'})
+    assert response.status_code == 400
+
+def test_download_report():
+    response = _client().get('/download/gratuity/pdf?salary=50000&years=6&sector=private')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/pdf'
+    assert response.data.startswith(b'%PDF')
+
+    response = _client().get('/download/compliance/pdf?state=Assam&num_employees=12&industry_type=Factory')
+    assert response.data.startswith(b'%PDF')
+
+def test_download_bulk_reports_zip():
+    import io
+    import zipfile
+
+    body = (
+        'employee_id,type,basic,da,salary,years,sector\n'
+        'E001,pf;esi,25000,5000,18000,,private\n'
+        'E002,gratuity,,,60000,12,government\n'
+        'E003,bogus,1,,,,\n'
+    )
+    workers = app.config['BULK_REPORT_WORKERS']
+    app.config['BULK_REPORT_WORKERS'] = 2
+    try:
+        response = _client().post('/download/bulk', data=body, content_type='text/csv')
+    finally:
+        app.config['BULK_REPORT_WORKERS'] = workers
+    assert response.mimetype == 'application/zip'
+
+    archive = zipfile.ZipFile(io.BytesIO(response.data))
+    names = sorted(archive.namelist())
+    assert names == ['000001_E001_esi.pdf', '000001_E001_pf.pdf', '000002_E002_gratuity.pdf', 'errors.txt']
+    assert archive.read('000001_E001_pf.pdf').startswith(b'%PDF')
+    assert b'000003_E003_bogus.pdf' in archive.read('errors.txt')
+
+def test_download_bulk_reports_rejects_bad_json():
+    client = _client()
+    response = client.post('/download/bulk', data='{"employee_id": "E001"', content_type='application/json')
+    assert response.status_code == 400
+    response = client.post('/download/bulk', json={'employee_id': 'E001'})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Employee file must contain a JSON array'
+
+def test_download_report_cache_and_etag():
+    client = _client()
+    url = '/download/pf/pdf?basic=25000&da=5000&sector=private'
+    first = client.get(url)
+    etag = first.headers['ETag']
+    assert etag
+
+    # Same normalized inputs in a different spelling hit the same cache entry
+    second = client.get('/download/pf/pdf?sector=private&da=5000.0&basic=25000')
+    assert second.headers['ETag'] == etag
+    assert second.data == first.data
+
+    revalidated = client.get(url, headers={'If-None-Match': etag})
+    assert revalidated.status_code == 304
+    assert revalidated.data == b''
+    assert 'private' in revalidated.headers['Cache-Control'] and 'no-cache' in revalidated.headers['Cache-Control']
+
+def test_cache_stats_endpoint():
+    stats = _client().get('/api/cache/stats').get_json()
+    assert 'calculate_gratuity' in stats['memoization']['functions']
+    assert 'hits' in stats['report_cache']
+
+def test_holiday_pages_are_cached_with_strong_etags():
+    client = _client()
+    page = client.get('/holidays?state=assam')
+    assert page.status_code == 200
+    assert page.headers['ETag'] and 'max-age=' in page.headers['Cache-Control']
+    assert client.get('/holidays?state=assam', headers={'If-None-Match': page.headers['ETag']}).status_code == 304
+
+    summary = client.get('/api/holidays?state=assam').get_json()
+    assert summary['state'] == 'assam' and summary['working_days']['working_days'] == 282
+    assert summary['holidays'][0] == {'date': '2025-01-01', 'name': "New Year's Day", 'type': 'Gazetted'}
+
+    calendar = client.get('/holidays.ics?state=assam')
+    assert calendar.mimetype == 'text/calendar'
+    body = calendar.get_data(as_text=True)
+    assert body.startswith('BEGIN:VCALENDAR\r\n') and body.count('BEGIN:VEVENT') == len(summary['holidays'])
+
+    assert client.get('/api/holidays?year=1999').status_code == 404
+
+def test_holiday_pages_follow_cleared_holiday_cache(tmp_path, monkeypatch):
+    import shutil
+    import holiday_calendar
+
+    data_dir = tmp_path / 'holidays'
+    shutil.copytree(holiday_calendar.HOLIDAY_DATA_DIR, data_dir)
+    monkeypatch.setattr(holiday_calendar, 'HOLIDAY_DATA_DIR', str(data_dir))
+    holiday_calendar.clear_holiday_cache()
+    client = _client()
+    try:
+        first = client.get('/holidays.ics?year=2025&state=central')
+        (data_dir / '2025' / 'central.json').write_text(
+            '[{"date": "2025-01-01", "name": "Founders Day", "type": "Gazetted"}]', encoding='utf-8')
+        assert client.get('/holidays.ics?year=2025&state=central').data == first.data
+
+        holiday_calendar.clear_holiday_cache()
+        reloaded = client.get('/holidays.ics?year=2025&state=central')
+        assert reloaded.headers['ETag'] != first.headers['ETag']
+        assert b'Founders Day' in reloaded.data
+    finally:
+        monkeypatch.undo()
+        holiday_calendar.clear_holiday_cache()
+
+def test_readiness_follows_warm_up():
+    client = _client()
+    assert client.get('/healthz').get_json() == {'status': 'ok'}
+
+    app.extensions.pop('warm_up', None)
+    assert client.get('/readyz').status_code == 503
+    warmed = warm_up()
+    assert warmed['templates'] == len(app.jinja_env.list_templates())
+    assert all(module in sys.modules for module in LAZY_MODULES)
+    ready = client.get('/readyz')
+    assert ready.status_code == 200 and ready.get_json()['warm_up'] == warmed
+
+def test_gunicorn_config_preloads_the_wsgi_app():
+    settings = runpy.run_path(os.path.join(os.path.dirname(__file__), 'gunicorn.conf.py'))
+    assert settings['preload_app'] is True
+    assert settings['wsgi_app'] == 'wsgi:application'
+
+def test_calculator_pages_are_cached_and_compressed():
+    client = _client()
+    app.extensions.pop('page_cache', None)
+    plain = client.get('/gratuity?sector=government')
+    assert plain.headers.get('Content-Encoding') is None
+    assert 'Accept-Encoding' in plain.headers['Vary']
+
+    compressed = client.get('/gratuity?sector=government', headers={'Accept-Encoding': 'gzip'})
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(compressed.data) == plain.data
+    assert compressed.headers['ETag'] != plain.headers['ETag']
+    assert client.get('/gratuity?sector=government', headers={
+        'Accept-Encoding': 'gzip', 'If-None-Match': compressed.headers['ETag']}).status_code == 304
+    # An uncompressed hit keeps the encodings already stored with the page
+    page = app.extensions['page_cache'][('gratuity_calculator', 'government')]
+    assert client.get('/gratuity?sector=government').data == plain.data
+    assert app.extensions['page_cache'][('gratuity_calculator', 'government')] is page
+    assert set(page['encoded']) == {'gzip'}
+
+    assert set(app.extensions['page_cache']) == {('gratuity_calculator', 'government')}
+    # Other query parameters and form posts are rendered every time
+    client.get('/gratuity?sector=government&salary=1')
+    client.post('/gratuity', data={'salary': '50000', 'years': '10', 'sector': 'private'})
+    assert set(app.extensions['page_cache']) == {('gratuity_calculator', 'government')}
+
+def test_streamed_responses_are_compressed():
+    body = 'employee_id,basic\n' + ''.join(f'E{i},{20000 + i}\n' for i in range(2000))
+    client = _client()
+    plain = client.post('/api/payroll/process', data=body.encode('utf-8'), content_type='text/csv')
+    compressed = client.post('/api/payroll/process', data=body.encode('utf-8'), content_type='text/csv',
+                             headers={'Accept-Encoding': 'gzip'})
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(compressed.data) == plain.data
+    assert len(compressed.data) < len(plain.data) / 5
+
+def test_versioned_static_urls_are_cached_for_long(tmp_path):
+    (tmp_path / 'site.css').write_text('body { margin: 0; }', encoding='utf-8')
+    static_folder = app.static_folder
+    app.static_folder = str(tmp_path)
+    app.extensions.pop('static_versions', None)
+    try:
+        with app.test_request_context():
+            url = app.jinja_env.globals['static_url']('site.css')
+        assert '?v=' in url
+        response = _client().get(url)
+        assert response.cache_control.max_age == app.config['STATIC_CACHE_MAX_AGE']
+        assert response.cache_control.immutable
+        assert _client().get('/static/site.css').cache_control.max_age != app.config['STATIC_CACHE_MAX_AGE']
+    finally:
+        app.static_folder = static_folder
+        app.extensions.pop('static_versions', None)
@@ -0,0 +1,81 @@
+"""
+Tests for Arrow / Parquet export of batch results
+"""
+
+import io
+
+import pytest
+
+pa = pytest.importorskip('pyarrow')
+import pyarrow.parquet as pq
+
+from app import app
+from arrow_export import SCHEMAS, SCHEMA_VERSION, arrow_schema, open_arrow, record_batch, write_export
+from batch_engine import calculate_batch
+from payroll_pipeline import compute_rows, main, validate_rows
+
+ROWS = [
+    {'employee_id': 'E1', 'basic': '20000', 'da': '5000', 'years': '7'},
+    {'employee_id': 'E2', 'basic': '56100', 'sector': 'government', 'years': '12'},
+    {'employee_id': 'E3', 'basic': 'not a number'},
+    {'employee_id': 'E4', 'basic': '11000', 'da': '1500'}
+]
+
+def test_schema_is_fixed_per_calc_type():
+    for calc_type, columns in SCHEMAS.items():
+        schema = arrow_schema(calc_type, '2024-06')
+        assert [(field.name, str(field.type)) for field in schema] == [
+            (name, {'int64': 'int64', 'string': 'string', 'bool_': 'bool', 'float64': 'double'}[kind])
+            for name, kind in columns
+        ]
+        assert schema.metadata[b'schema_version'] == SCHEMA_VERSION.encode()
+        assert schema.metadata[b'pay_period'] == b'2024-06-01'
+    with pytest.raises(ValueError):
+        arrow_schema('leave')
+
+def test_float_columns_share_the_result_arrays():
+    results = calculate_batch([20000, 56100], [5000, 0], sector=['private', 'government'], years_of_service=[7, 12])
+    employees = [(1, {'employee_id': 'E1', 'sector': 'private', 'years': 7}),
+                 (2, {'employee_id': 'E2', 'sector': 'government', 'years': 12})]
+    batch = record_batch(arrow_schema('pf'), employees, results)
+    column = batch.column('employee_contribution')
+    assert column.buffers()[1].address == results['pf']['employee_contribution'].ctypes.data
+    # NaN ("not applicable") is a null in Arrow
+    assert column.to_pylist() == [1800.0, None]
+
+def test_arrow_file_matches_csv_pipeline(tmp_path):
+    path = str(tmp_path / 'esi.arrow')
+    assert write_export(ROWS, path, 'esi', 'arrow', pay_period='2024-06') == {'rows': 3, 'errors': 1}
+    table = open_arrow(path)
+    assert table.column('row').to_pylist() == [1, 2, 4]
+
+    expected = [row for row in compute_rows(validate_rows(ROWS), pay_period='2024-06') if not row.get('error')]
+    assert table.column('eligible').to_pylist() == [row['esi_eligible'] for row in expected]
+    assert table.column('employee_contribution').to_pylist() == [row['esi_employee_contribution'] for row in expected]
+
+def test_payroll_endpoint_streams_parquet():
+    body = 'employee_id,basic,da,years\nE1,20000,5000,7\nE2,11000,1500,3\n'
+    client = app.test_client()
+    response = client.post('/api/payroll/process?format=parquet&calc_type=gratuity&pay_period=2024-06',
+                           data=body.encode('utf-8'), content_type='text/csv')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/vnd.apache.parquet'
+    table = pq.read_table(io.BytesIO(response.data))
+    assert table.schema.metadata[b'calc_type'] == b'gratuity'
+    assert table.column('gratuity_amount').to_pylist() == [100961.54, 0.0]
+
+    assert client.post('/api/payroll/process?format=arrow&calc_type=leave', data=b'').status_code == 400
+    assert client.post('/api/payroll/process?format=feather', data=b'').status_code == 400
+
+def test_cli_honours_chunk_size_and_progress(tmp_path, monkeypatch, capsys):
+    source = tmp_path / 'payroll.csv'
+    source.write_text('employee_id,basic\n' + ''.join(f'E{i},{20000 + i}\n' for i in range(5)) + 'E5,oops\n',
+                      encoding='utf-8')
+    target = tmp_path / 'pf.arrow'
+    monkeypatch.setattr('sys.argv', ['payroll_pipeline.py', str(source), str(target), '--format', 'arrow',
+                                     '--chunk-size', '2', '--progress-every', '4'])
+    main()
+    with pa.memory_map(str(target), 'r') as mapped:
+        reader = pa.ipc.open_file(mapped)
+        assert [reader.get_batch(i).num_rows for i in range(reader.num_record_batches)] == [2, 2, 1]
+    assert '4 rows (0 errors)' in capsys.readouterr().err
@@ -0,0 +1,60 @@
+"""
+Tests for the vectorized batch engine
+Every batch row must match the scalar reference calculators exactly
+"""
+
+import random
+
+import numpy as np
+
+from batch_engine import calculate_batch, result_row, round_currency, to_records
+from core_calculators import (
+    calculate_gratuity, calculate_pf_contribution, calculate_nps_contribution,
+    is_esi_applicable
+)
+
+def _random_payroll(size, seed=7):
+    rng = random.Random(seed)
+    basic = [rng.choice([rng.randint(5000, 90000), round(rng.uniform(5000, 90000), 2)]) for _ in range(size)]
+    da = [rng.choice([0, rng.randint(0, 20000), round(rng.uniform(0, 20000), 2)]) for _ in range(size)]
+    salary = [b + d for b, d in zip(basic, da)]
+    sector = [rng.choice(['private', 'government']) for _ in range(size)]
+    years = [rng.choice([rng.randint(0, 40), round(rng.uniform(0, 40), 1)]) for _ in range(size)]
+    return basic, da, salary, sector, years
+
+def test_batch_matches_scalar():
+    basic, da, salary, sector, years = _random_payroll(2000)
+    results = calculate_batch(basic, da, salary, sector, years_of_service=years)
+
+    for i in range(len(basic)):
+        assert result_row('pf', results['pf'], i) == calculate_pf_contribution(basic[i], da[i], sector[i])
+        assert result_row('esi', results['esi'], i) == is_esi_applicable(salary[i])
+        assert result_row('nps', results['nps'], i) == calculate_nps_contribution(basic[i], da[i])
+        assert result_row('gratuity', results['gratuity'], i) == calculate_gratuity(salary[i], years[i], sector[i])
+
+def test_boundaries_match_scalar():
+    # PF ceiling, ESI limit, gratuity eligibility and cap edges
+    basic = [15000, 14999.99, 21000, 21000.01, 100000, 250000]
+    years = [5, 4.99, 10, 9.9, 35, 30]
+    sector = ['private', 'private', 'government', 'government', 'private', 'private']
+    results = calculate_batch(basic, 0, None, sector, years_of_service=years)
+
+    for i in range(len(basic)):
+        assert result_row('pf', results['pf'], i) == calculate_pf_contribution(basic[i], 0, sector[i])
+        assert result_row('esi', results['esi'], i) == is_esi_applicable(basic[i])
+        assert result_row('gratuity', results['gratuity'], i) == calculate_gratuity(basic[i], years[i], sector[i])
+
+def test_round_currency_matches_builtin_round():
+    values = np.array([2.675, 0.125, 0.375, 1.005, 1234.565, 10.0 / 3, 0.0, 112.5 * 0.75 / 100])
+    assert list(round_currency(values)) == [round(float(value), 2) for value in values]
+
+def test_records_match_scalar():
+    basic, da, salary, sector, years = _random_payroll(500, seed=11)
+    results = calculate_batch(basic, da, salary, sector, years_of_service=years)
+    records = {calc_type: to_records(calc_type, results[calc_type]) for calc_type in results}
+
+    for i in range(len(basic)):
+        assert records['pf'][i].to_dict() == calculate_pf_contribution(basic[i], da[i], sector[i])
+        assert records['esi'][i].to_dict() == is_esi_applicable(salary[i])
+        assert records['nps'][i].to_dict() == calculate_nps_contribution(basic[i], da[i])
+        assert records['gratuity'][i].to_dict() == calculate_gratuity(salary[i], years[i], sector[i])
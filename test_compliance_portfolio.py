@@ -0,0 +1,54 @@
+"""
+Tests for portfolio-wide compliance evaluation
+"""
+
+from app import app
+from compliance_portfolio import evaluate_portfolio, portfolio_checklists, portfolio_to_dict
+from core_calculators import generate_compliance_checklist
+
+BRANCHES = [
+    {'name': 'Pune Plant', 'state': 'Maharashtra', 'num_employees': 120, 'industry_type': 'Factory'},
+    {'name': 'Mumbai Office', 'state': 'Maharashtra', 'num_employees': 25, 'industry_type': 'IT'},
+    {'name': 'Nashik Plant', 'state': 'maharashtra', 'num_employees': 180, 'industry_type': 'factory'},
+    {'name': 'Bengaluru Office', 'state': 'Karnataka', 'num_employees': 8, 'industry_type': 'IT'},
+    {'name': 'Chennai Depot', 'state': 'Tamil Nadu', 'num_employees': 45, 'industry_type': 'Shop'},
+    {'name': 'Guwahati Depot', 'state': 'Assam', 'num_employees': 45, 'industry_type': 'Shop'},
+    {'name': 'Patna Depot', 'state': 'Bihar', 'num_employees': 40, 'industry_type': 'Warehouse'}
+]
+
+def test_matrix_matches_per_branch_checklists():
+    portfolio = evaluate_portfolio(BRANCHES)
+    texts = [requirement['text'] for requirement in portfolio['requirements']]
+    assert len(set(texts)) == len(texts)
+    assert portfolio['matrix'].shape == (len(BRANCHES), len(texts))
+    for branch, row in zip(BRANCHES, portfolio['matrix']):
+        expected = generate_compliance_checklist(branch['state'], branch['num_employees'], branch['industry_type'])
+        assert [text for text, applies in zip(texts, row) if applies] == expected
+
+    # Identical (state, industry, headcount band) keys are evaluated once
+    profiles = [branch['profile'] for branch in portfolio['branches']]
+    assert profiles == [0, 1, 0, 2, 3, 4, 4]
+    assert [len(group['branches']) for group in portfolio_checklists(portfolio)] == [2, 1, 1, 1, 2]
+
+def test_portfolio_api_json_and_pdf():
+    client = app.test_client()
+    response = client.post('/api/compliance/portfolio', json={'establishments': BRANCHES})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body == portfolio_to_dict(evaluate_portfolio(BRANCHES))
+    assert body['profiles'] == 5
+    assert body['matrix'][0][0] == '1' and len(body['matrix'][0]) == len(body['requirements'])
+
+    response = client.post('/api/compliance/portfolio?format=pdf', json=BRANCHES)
+    assert response.status_code == 200
+    assert response.data.startswith(b'%PDF')
+
+    response = client.post('/api/compliance/portfolio', json=[{'state': 'Goa', 'industry_type': 'Shop'}])
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Establishment 0: missing field num_employees'
+
+def test_portfolio_pdf_escapes_branch_names():
+    branches = [{'name': 'Unit <b>1', 'state': 'A & B <Region>', 'num_employees': 30, 'industry_type': 'Shop <retail>'}]
+    response = app.test_client().post('/api/compliance/portfolio?format=pdf', json=branches)
+    assert response.status_code == 200
+    assert response.data.startswith(b'%PDF')
@@ -0,0 +1,90 @@
+"""
+Tests for the rule-table driven compliance engine
+The compiled index must reproduce the original if-chain checklist exactly
+"""
+
+from compliance_rules import COMPLIANCE_RULES, lookup_requirements
+from core_calculators import generate_compliance_checklist, generate_compliance_checklists
+
+def _reference_checklist(state, num_employees, industry_type):
+    """Original if-chain implementation, kept as the reference"""
+    checklist = []
+    
+    # Basic registrations for all establishments
+    checklist.append("Obtain Trade License from local municipal authority")
+    checklist.append("Register for GST if annual turnover exceeds Rs. 20 lakhs")
+    
+    # Employee-based compliances
+    if num_employees >= 1:
+        checklist.append("Maintain attendance register for all employees")
+        checklist.append("Issue appointment letters to all employees")
+    
+    if num_employees >= 10:
+        checklist.append("Register under applicable Shops and Establishment Act")
+        if industry_type.lower() == 'factory':
+            checklist.append("Register under Factories Act, 1948")
+            checklist.append("Obtain Factory License from State Factory Inspector")
+    
+    if num_employees >= 20:
+        checklist.append("Register for Employee Provident Fund (EPF)")
+        checklist.append("Register for Employee State Insurance (ESI)")
+        checklist.append("Comply with Payment of Gratuity Act, 1972")
+    
+    if num_employees >= 30:
+        checklist.append("Constitute Internal Complaints Committee (ICC) for POSH Act")
+    
+    if num_employees >= 100:
+        checklist.append("Register under Contract Labour Act (if applicable)")
+    
+    # Industry-specific compliances
+    if industry_type.lower() == 'factory':
+        checklist.append("Maintain factory registers as per Factories Act")
+        checklist.append("Conduct annual medical examination of workers")
+        if num_employees >= 50:
+            checklist.append("Appoint Safety Officer")
+    
+    if industry_type.lower() in ['it', 'software', 'services']:
+        checklist.append("Comply with IT Act provisions for data protection")
+        checklist.append("Register under Professional Tax Act")
+    
+    # State-specific additions
+    state_lower = state.lower()
+    if state_lower == 'maharashtra':
+        checklist.append("Register under Maharashtra Shops and Establishment Act")
+        if num_employees >= 5:
+            checklist.append("Register for Professional Tax in Maharashtra")
+    elif state_lower == 'karnataka':
+        checklist.append("Register under Karnataka Shops and Commercial Establishment Act")
+    elif state_lower == 'tamil nadu':
+        checklist.append("Register under Tamil Nadu Shops and Establishment Act")
+    
+    return checklist
+
+STATES = ['Maharashtra', 'karnataka', 'Tamil Nadu', 'Assam', 'Delhi', '']
+INDUSTRIES = ['Factory', 'IT', 'software', 'Services', 'Shop', 'Retail', '']
+
+def test_index_matches_reference_checklist():
+    for state in STATES:
+        for industry in INDUSTRIES:
+            for num_employees in range(-1, 160):
+                assert generate_compliance_checklist(state, num_employees, industry) == \
+                    _reference_checklist(state, num_employees, industry)
+
+def test_lookup_requirements_positions():
+    positions = lookup_requirements('Karnataka', 55, 'Factory')
+    ids = [COMPLIANCE_RULES[position]['id'] for position in positions]
+    assert 'safety-officer' in ids and 'karnataka-shops-act' in ids
+    assert 'contract-labour-act' not in ids
+
+def test_batch_checklists():
+    establishments = [('Maharashtra', 25, 'Factory'),
+                      {'state': 'Assam', 'num_employees': 3, 'industry_type': 'IT'}]
+    assert generate_compliance_checklists(establishments) == [
+        _reference_checklist('Maharashtra', 25, 'Factory'),
+        _reference_checklist('Assam', 3, 'IT')
+    ]
+
+def test_checklist_is_a_fresh_list():
+    checklist = generate_compliance_checklist('Maharashtra', 25, 'Factory')
+    checklist.append('mutated')
+    assert 'mutated' not in generate_compliance_checklist('Maharashtra', 25, 'Factory')
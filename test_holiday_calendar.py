@@ -0,0 +1,82 @@
+"""
+Tests for the holiday calendar store
+"""
+
+from datetime import date
+
+from holiday_calendar import (
+    WEEKLY_OFF_POLICIES, count_working_days, count_working_days_between, count_working_days_bulk,
+    get_holiday_calendar, get_holiday_summary, get_holidays_by_month, get_holidays_in_range,
+    holidays_to_ics, is_holiday, is_weekly_off
+)
+
+def test_calendar_is_cached_per_year_and_state():
+    assert get_holiday_calendar(2025, 'Assam') is get_holiday_calendar(2025, 'assam')
+    # States without their own data file share the central calendar
+    assert get_holiday_calendar(2025, 'Kerala') is get_holiday_calendar(2025, 'central')
+
+def test_is_holiday():
+    assert is_holiday(date(2025, 1, 26))
+    assert not is_holiday(date(2025, 1, 15))
+    assert is_holiday(date(2025, 1, 15), 'assam')
+
+def test_holidays_in_range():
+    holidays = get_holidays_in_range(date(2025, 4, 13), date(2025, 4, 16), 'assam')
+    assert [holiday['date'] for holiday in holidays] == [
+        '2025-04-13', '2025-04-14', '2025-04-14', '2025-04-15', '2025-04-16'
+    ]
+
+def test_year_without_data_is_empty():
+    assert get_holidays_by_month(1999, 'central') == {}
+    assert get_holidays_in_range(date(1999, 12, 1), date(2025, 1, 1))[0]['name'] == "New Year's Day"
+
+def _brute_force_working_days(start, end, state, weekly_off):
+    from datetime import timedelta
+    count = 0
+    day = start
+    while day <= end:
+        if not is_weekly_off(day, weekly_off) and not is_holiday(day, state):
+            count += 1
+        day += timedelta(days=1)
+    return count
+
+def test_count_working_days_is_exact():
+    summary = count_working_days(2025, 'central')
+    assert summary['sundays'] == 52
+    # Republic Day and three other holidays fall on Sundays in 2025 and are not subtracted twice
+    assert summary['holidays_on_weekly_off'] == 4
+    assert summary['total_days'] == summary['working_days'] + summary['holidays'] + summary['weekly_offs']
+    assert count_working_days(2024)['total_days'] == 366
+
+def test_working_days_between_matches_brute_force():
+    import random
+    rng = random.Random(3)
+    first = date(2024, 1, 1).toordinal()
+    for _ in range(300):
+        start = date.fromordinal(first + rng.randint(0, 1095))
+        end = date.fromordinal(start.toordinal() + rng.randint(-5, 500))
+        state = rng.choice(['central', 'assam'])
+        weekly_off = rng.choice(WEEKLY_OFF_POLICIES)
+        expected = _brute_force_working_days(start, end, state, weekly_off)
+        assert count_working_days_between(start, end, state, weekly_off) == expected
+        assert count_working_days_bulk([start], [end], state, weekly_off)[0] == expected
+
+def test_second_fourth_saturday():
+    assert is_weekly_off(date(2025, 3, 8), 'second_fourth_saturday')
+    assert not is_weekly_off(date(2025, 3, 1), 'second_fourth_saturday')
+    assert is_weekly_off(date(2025, 3, 22), 'second_fourth_saturday')
+    assert not is_weekly_off(date(2025, 3, 29), 'second_fourth_saturday')
+
+def test_holiday_summary_is_precomputed_once():
+    summary = get_holiday_summary(2025, 'Assam')
+    assert summary is get_holiday_summary(2025, 'assam')
+    assert summary['months'] == get_holidays_by_month(2025, 'assam')
+    assert summary['working_days'] == count_working_days(2025, 'assam')
+    # Unknown states share the central summary
+    assert get_holiday_summary(2025, 'kerala') is get_holiday_summary(2025, 'central')
+
+def test_ics_lines_are_folded_and_escaped():
+    text = holidays_to_ics(2025, 'central')
+    assert all(len(line.encode('utf-8')) <= 75 for line in text.split('\r\n'))
+    assert 'DTSTART;VALUE=DATE:20250126\r\n' in text
+    assert text == holidays_to_ics(2025, 'central')
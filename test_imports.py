@@ -0,0 +1,26 @@
+"""
+Tests that headless entry points stay free of the web and PDF stacks
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+HEAVY = ('flask', 'werkzeug', 'jinja2', 'reportlab', 'numpy')
+
+def _loaded(module):
+    code = (f'import json, sys, {module}; '
+            f'print(json.dumps(sorted({{name.split(".")[0] for name in sys.modules}} & set({list(HEAVY)!r}))))')
+    completed = subprocess.run([sys.executable, '-c', code], cwd=os.path.dirname(os.path.abspath(__file__)),
+                               capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout)
+
+@pytest.mark.parametrize('module', ['core_calculators', 'calculations', 'parallel', 'jobs', 'bulk_reports'])
+def test_headless_modules_do_not_import_heavy_dependencies(module):
+    assert _loaded(module) == []
+
+def test_app_loads_reportlab_and_numpy_on_first_use():
+    assert _loaded('app') == ['flask', 'jinja2', 'werkzeug']
@@ -0,0 +1,62 @@
+"""
+Tests for request timing, Prometheus metrics and on-demand profiling
+"""
+
+import os
+
+from app import app
+from instrumentation import MetricsRegistry, stage
+
+def _client(monkeypatch, **config):
+    # monkeypatch puts the original settings back after the test
+    for name, value in config.items():
+        monkeypatch.setitem(app.config, name, value)
+    return app.test_client()
+
+def test_stage_is_a_no_op_outside_timed_requests():
+    with stage('calculate', 'pf'):
+        pass
+
+def test_registry_renders_cumulative_histograms():
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    registry.describe('latency_seconds', 'Latency')
+    registry.observe('latency_seconds', {'route': '/pf'}, 0.05)
+    registry.observe('latency_seconds', {'route': '/pf'}, 0.5)
+    registry.observe('latency_seconds', {'route': '/pf'}, 5)
+    lines = registry.render().splitlines()
+    assert lines[:2] == ['# HELP latency_seconds Latency', '# TYPE latency_seconds histogram']
+    assert 'latency_seconds_bucket{route="/pf",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/pf",le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{route="/pf",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{route="/pf"} 3' in lines
+
+def test_stage_timings_and_metrics_endpoint(monkeypatch):
+    client = _client(monkeypatch, INSTRUMENTATION_ENABLED=True, REPORT_CACHE_MAX_BYTES=0)
+    app.extensions.pop('report_cache', None)
+    try:
+        response = client.post('/pf', data={'basic': '20000', 'da': '2000'})
+        stages = [entry.split(';')[0] for entry in response.headers['Server-Timing'].split(', ')]
+        assert stages == ['parse', 'calculate', 'render', 'total']
+
+        response = client.get('/download/esi/pdf?salary=15000')
+        assert 'pdf_build;dur=' in response.headers['Server-Timing']
+
+        metrics = client.get('/metrics').get_data(as_text=True)
+        assert ('statutorycalc_request_duration_seconds_count{calc_type="pf",method="POST",route="/pf",status="200"} 1'
+                in metrics)
+        assert 'statutorycalc_stage_duration_seconds_count{calc_type="esi",route="/download/<calc_type>/<format>",stage="pdf_build"}' in metrics
+    finally:
+        app.config['INSTRUMENTATION_ENABLED'] = False
+        app.extensions.pop('report_cache', None)
+    assert client.get('/metrics').status_code == 404
+    assert 'Server-Timing' not in client.get('/').headers
+
+def test_profile_capture(tmp_path, monkeypatch):
+    client = _client(monkeypatch, PROFILING_ENABLED=True, PROFILE_DIR=str(tmp_path))
+    try:
+        response = client.get('/compliance', headers={'X-Profile': '1'})
+        assert os.path.exists(tmp_path / response.headers['X-Profile-File'])
+        assert 'X-Profile-File' not in client.get('/compliance').headers
+    finally:
+        app.config['PROFILING_ENABLED'] = False
+    assert 'X-Profile-File' not in client.get('/compliance?_profile=1').headers
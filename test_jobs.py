@@ -0,0 +1,128 @@
+"""
+Tests for the persistent background job queue and its endpoints
+"""
+
+import io
+import json
+import time
+
+import pytest
+
+from app import app
+from jobs import FAILED, JOB_HANDLERS, QUEUED, RUNNING, SUCCEEDED, JobError, JobQueue
+
+def _wait(queue, job_id, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.get(job_id)
+        if job['status'] in (SUCCEEDED, FAILED):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f'Job {job_id} did not finish')
+
+@pytest.fixture
+def queue(tmp_path):
+    attempts = []
+
+    def flaky(params, input_path, output, progress):
+        attempts.append(1)
+        if len(attempts) < params['fail_times']:
+            raise RuntimeError('temporary failure')
+        output.write(b'done')
+        return 'flaky.txt', 'text/plain'
+
+    def invalid(params, input_path, output, progress):
+        raise JobError('bad input')
+
+    handlers = dict(JOB_HANDLERS, flaky=flaky, invalid=invalid)
+    queue = JobQueue(str(tmp_path), handlers, workers=2, max_attempts=3, retry_delay=0.01, poll_interval=0.05)
+    queue.start()
+    yield queue
+    queue.stop()
+
+def test_batch_job_produces_ndjson_artifact(queue):
+    job_id = queue.submit('batch', {'records': [{'type': 'esi', 'salary': 15000}, {'type': 'pf'}]})
+    job = _wait(queue, job_id)
+    assert job['status'] == SUCCEEDED
+    assert job['progress'] == {'done': 2, 'total': 2}
+    path, filename, mimetype = queue.artifact(job_id)
+    with open(path) as results:
+        lines = [json.loads(line) for line in results]
+    assert lines[0]['success'] and lines[1]['error'] == 'Missing field: basic'
+    assert mimetype == 'application/x-ndjson'
+
+def test_failed_jobs_are_retried_then_given_up(queue):
+    assert _wait(queue, queue.submit('flaky', {'fail_times': 3}))['attempts'] == 3
+    job = _wait(queue, queue.submit('flaky', {'fail_times': 10}))
+    assert job['status'] == FAILED and job['error'] == 'temporary failure'
+    job = _wait(queue, queue.submit('invalid'))
+    assert job['status'] == FAILED and job['attempts'] == 1
+
+def test_running_jobs_are_not_taken_over_by_a_new_queue(tmp_path):
+    runs = []
+
+    def slow(params, input_path, output, progress):
+        runs.append(1)
+        time.sleep(0.6)
+        return 'slow.txt', 'text/plain'
+
+    queue = JobQueue(str(tmp_path), {'slow': slow}, workers=1, poll_interval=0.05, stale_after=0.15)
+    queue.start()
+    try:
+        job_id = queue.submit('slow')
+        time.sleep(0.4)
+        # A sibling process starting up with the same directory, long after stale_after
+        sibling = JobQueue(str(tmp_path), {'slow': slow}, stale_after=0.15)
+        assert sibling.get(job_id)['status'] == RUNNING
+        assert _wait(queue, job_id)['status'] == SUCCEEDED
+        assert len(runs) == 1
+    finally:
+        queue.stop()
+
+def test_expired_jobs_are_purged(tmp_path):
+    queue = JobQueue(str(tmp_path), JOB_HANDLERS, retention_seconds=0)
+    job_id = queue.submit('batch', {'records': []})
+    queue._run(queue._claim())
+    assert queue.get(job_id) is None
+    queue._purge_expired()
+    assert queue.stats() == {}
+    assert [name for name in tmp_path.iterdir() if name.suffix in ('.output', '.input')] == []
+
+def test_queued_jobs_survive_restart(tmp_path):
+    job_id = JobQueue(str(tmp_path), JOB_HANDLERS).submit('report', {'calc_type': 'esi', 'params': {'salary': '15000'}})
+    queue = JobQueue(str(tmp_path), JOB_HANDLERS)
+    assert queue.get(job_id)['status'] == QUEUED
+    queue._run(queue._claim())
+    path, filename, _ = queue.artifact(job_id)
+    assert filename == 'esi_report.pdf'
+    with open(path, 'rb') as pdf:
+        assert pdf.read(4) == b'%PDF'
+
+def test_job_endpoints(tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, 'JOBS_DIR', str(tmp_path))
+    app.extensions.pop('job_queue', None)
+    client = app.test_client()
+    try:
+        response = client.get('/download/pf/pdf?basic=20000&da=2000&async=1')
+        assert response.status_code == 202
+        job_url = response.headers['Location']
+        assert client.get(response.get_json()['download_url']).status_code in (200, 409)
+
+        deadline = time.time() + 30
+        while client.get(job_url).get_json()['status'] != SUCCEEDED:
+            assert time.time() < deadline
+            time.sleep(0.02)
+        download = client.get(response.get_json()['download_url'])
+        assert download.mimetype == 'application/pdf' and download.data.startswith(b'%PDF')
+
+        body = 'employee_id,type,basic\nE1,pf,20000\n'
+        response = client.post('/api/jobs', data={'file': (io.BytesIO(body.encode()), 'employees.csv')},
+                               content_type='multipart/form-data')
+        assert response.get_json()['kind'] == 'bulk_reports'
+        assert client.post('/api/jobs', json={'kind': 'bogus'}).status_code == 400
+        assert client.get('/api/jobs/unknown').status_code == 404
+    finally:
+        # The queue points at tmp_path: drop it so later tests start their own
+        queue = app.extensions.pop('job_queue', None)
+        if queue is not None:
+            queue.stop()
@@ -0,0 +1,48 @@
+"""
+Tests for the opt-in calculator memoization layer
+"""
+
+from core_calculators import calculate_leave_entitlement, generate_compliance_checklist, is_esi_applicable
+from memoize import configure_memoization, memoization_stats
+
+def test_memoization_hits_and_copies():
+    configure_memoization(8)
+    try:
+        first = generate_compliance_checklist('Maharashtra', 25, 'Factory')
+        first.append('caller mutation')
+        second = generate_compliance_checklist('Maharashtra', 25, 'Factory')
+        assert 'caller mutation' not in second
+
+        second_result = is_esi_applicable(18000)
+        second_result['employee_contribution'] = -1
+        assert is_esi_applicable(18000)['employee_contribution'] == 135.0
+
+        stats = memoization_stats()['functions']
+        assert stats['generate_compliance_checklist']['hits'] >= 1
+        assert stats['is_esi_applicable']['hits'] >= 1
+    finally:
+        configure_memoization(0)
+
+def test_memoization_distinguishes_int_and_float():
+    configure_memoization(8)
+    try:
+        assert calculate_leave_entitlement(300, 'general', 'factory')['earned_leave'] == 15
+        assert isinstance(calculate_leave_entitlement(300.0, 'general', 'factory')['earned_leave'], float)
+    finally:
+        configure_memoization(0)
+
+def test_memoization_evicts_when_full():
+    configure_memoization(2)
+    try:
+        before = memoization_stats()['functions']['is_esi_applicable']['evictions']
+        for salary in (1000, 2000, 3000, 4000):
+            is_esi_applicable(salary)
+        after = memoization_stats()['functions']['is_esi_applicable']
+        assert after['evictions'] - before == 2
+        assert after['size'] == 2
+    finally:
+        configure_memoization(0)
+
+def test_disabled_by_default_passes_through():
+    assert memoization_stats()['enabled'] is False
+    assert is_esi_applicable(25000)['eligible'] is False
@@ -0,0 +1,73 @@
+"""
+Tests for the process-pool batch executor
+Pooled results must match in-process ones, in input order
+"""
+
+import json
+
+from calculations import run_batch_record
+from parallel import BatchExecutor, parallel_map
+from rates import RATES_FILE, reload_rates
+
+def _records(count):
+    types = [
+        {'type': 'pf', 'basic': 20000, 'da': 2000},
+        {'type': 'leave', 'state': 'karnataka', 'days_worked': 240},
+        {'type': 'compliance', 'state': 'maharashtra', 'num_employees': 45, 'industry_type': 'factory'},
+        {'type': 'gratuity', 'salary': 50000, 'years': 7},
+        {'type': 'esi'},
+    ]
+    return [(index, dict(types[index % len(types)], salary=10000 + index)) for index in range(count)]
+
+def test_parallel_results_match_in_process_and_keep_order():
+    records = _records(2000)
+    expected = [run_batch_record(*item) for item in records]
+    results = parallel_map(run_batch_record, records, workers=2, chunksize=64, min_parallel=100)
+    assert results == expected
+    assert [entry['index'] for entry in results] == list(range(2000))
+
+def test_small_batches_run_in_process():
+    executor = BatchExecutor(workers=4, min_parallel=100)
+    results = list(executor.map(run_batch_record, _records(10)))
+    assert len(results) == 10
+    assert executor._pool is None
+
+def test_results_stream_before_min_parallel_records_are_read():
+    read = []
+    def records():
+        for item in _records(200):
+            read.append(item[0])
+            yield item
+
+    executor = BatchExecutor(workers=2, chunksize=16, min_parallel=100)
+    try:
+        results = executor.map(run_batch_record, records())
+        assert next(results)['index'] == 0
+        assert read == [0]
+        assert [entry['index'] for entry in results] == list(range(1, 200))
+        # Workers are never forked from the (threaded) parent process
+        assert executor._pool._mp_context.get_start_method() in ('forkserver', 'spawn')
+    finally:
+        executor.shutdown()
+
+def test_parse_errors_are_reported_per_record():
+    entry = run_batch_record(3, ValueError('Invalid JSON: bad'))
+    assert entry == {'index': 3, 'success': False, 'error': 'Invalid JSON: bad'}
+
+def test_pool_workers_follow_rate_reloads(tmp_path):
+    with open(RATES_FILE, encoding='utf-8') as source:
+        document = json.load(source)
+    document['rates']['pf_wage_ceiling'].append({'from': '2020-01-01', 'value': 21000})
+    rules_file = tmp_path / 'rates.json'
+    rules_file.write_text(json.dumps(document), encoding='utf-8')
+
+    records = [(index, {'type': 'pf', 'basic': 25000, 'da': 5000}) for index in range(40)]
+    executor = BatchExecutor(workers=2, chunksize=5, min_parallel=10)
+    try:
+        # Start the workers with the default rules, then reload in the parent only
+        assert {entry['result']['pf_eligible_salary'] for entry in executor.map(run_batch_record, records)} == {15000}
+        reload_rates(str(rules_file))
+        assert {entry['result']['pf_eligible_salary'] for entry in executor.map(run_batch_record, records)} == {21000}
+    finally:
+        executor.shutdown()
+        reload_rates(RATES_FILE)
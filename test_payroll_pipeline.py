@@ -0,0 +1,65 @@
+"""
+Tests for the streaming payroll pipeline
+Every output row must match the scalar reference calculators
+"""
+
+import csv
+import io
+import math
+
+from app import app
+from core_calculators import calculate_pf_contribution, is_esi_applicable, calculate_gratuity, calculate_nps_contribution
+from payroll_pipeline import OUTPUT_COLUMNS, PipelineProgress, process_payroll, read_csv_rows
+
+PAYROLL_CSV = (
+    'employee_id,basic,da,salary,years,sector\n'
+    'E1,12000,3000,18000,6,private\n'
+    'E2,40000,10000,,,government\n'
+    'E3,abc,0,,,private\n'
+    'E4,9000,,,4,\n'
+)
+
+def _run(text, chunk_size=2):
+    progress = PipelineProgress()
+    output = ''.join(process_payroll(read_csv_rows(io.StringIO(text)), chunk_size, progress))
+    return list(csv.DictReader(io.StringIO(output))), progress
+
+def test_pipeline_matches_scalar_calculators():
+    rows, progress = _run(PAYROLL_CSV)
+    assert list(rows[0].keys()) == OUTPUT_COLUMNS
+    assert [row['row'] for row in rows] == ['1', '2', '3', '4']
+    assert progress.rows == 4 and progress.errors == 1
+
+    first = rows[0]
+    pf = calculate_pf_contribution(12000, 3000)
+    esi = is_esi_applicable(18000)
+    gratuity = calculate_gratuity(18000, 6)
+    assert float(first['pf_total_monthly']) == pf['total_monthly_pf']
+    assert float(first['esi_total_contribution']) == esi['total_contribution']
+    assert float(first['gratuity_amount']) == gratuity['gratuity_amount']
+    assert first['nps_total_contribution'] == ''
+
+    government = rows[1]
+    nps = calculate_nps_contribution(40000, 10000)
+    assert float(government['nps_total_contribution']) == nps['total_contribution']
+    assert government['pf_total_monthly'] == '' and government['esi_eligible'] == 'False'
+    assert government['gratuity_amount'] == ''
+
+    assert rows[2]['error'] and rows[2]['employee_id'] == 'E3'
+    assert rows[3]['gratuity_eligible'] == 'False'
+
+def test_pipeline_chunk_size_does_not_change_output():
+    text = 'basic,da,years\n' + ''.join(f'{10000 + i * 37},{i % 500},{i % 12}\n' for i in range(1000))
+    small, _ = _run(text, chunk_size=7)
+    large, _ = _run(text, chunk_size=5000)
+    assert small == large
+    assert all(not math.isnan(float(row['pf_total_monthly'])) for row in small)
+
+def test_payroll_endpoint_streams_csv():
+    client = app.test_client()
+    response = client.post('/api/payroll/process', data={'file': (io.BytesIO(PAYROLL_CSV.encode()), 'payroll.csv')},
+                           content_type='multipart/form-data')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/csv'
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert len(rows) == 4
@@ -0,0 +1,61 @@
+"""
+Tests for the vectorized corpus projections
+"""
+
+import numpy as np
+import pytest
+
+from core_calculators import calculate_nps_contribution, calculate_pf_contribution
+from projections import project_corpus
+
+def _reference(basic, da_percent, sector, years, salary_growth, da_revision, da_revision_months,
+               epf_rate, nps_rate):
+    """Month-by-month loop over the scalar calculators"""
+    epf = nps = eps = 0.0
+    epf_interest = 0.0
+    balances = []
+    monthly_nps = (1 + nps_rate / 100) ** (1 / 12) - 1
+    for month in range(years * 12):
+        month_basic = basic * (1 + salary_growth / 100) ** (month // 12)
+        month_da = month_basic * (da_percent + da_revision * (month // da_revision_months)) / 100
+        nps *= 1 + monthly_nps
+        if sector == 'government':
+            nps += calculate_nps_contribution(month_basic, month_da)['total_contribution']
+        else:
+            pf = calculate_pf_contribution(month_basic, month_da)
+            # Interest on the running balance before this month's deposit
+            epf_interest += epf * epf_rate / 100 / 12
+            epf += pf['employee_contribution'] + pf['employer_epf_contribution']
+            eps += pf['employer_eps_contribution']
+        if month % 12 == 11:
+            epf += epf_interest
+            epf_interest = 0.0
+            balances.append((epf, eps, nps))
+    return balances
+
+@pytest.mark.parametrize('basic, da_percent, sector', [
+    (9000, 20, 'private'), (14000, 46, 'private'), (56100, 50, 'government')
+])
+def test_projection_matches_month_by_month_loop(basic, da_percent, sector):
+    projection = project_corpus([basic], da_percent, sector, years=12, salary_growth=3, da_revision=4,
+                                epf_interest_rate=8.25, nps_return=10)
+    for year, (epf, eps, nps) in enumerate(_reference(basic, da_percent, sector, 12, 3, 4, 6, 8.25, 10)):
+        assert projection['epf_balance'][0, year] == pytest.approx(epf, abs=0.01)
+        assert projection['eps_contributions'][0, year] == pytest.approx(eps, abs=1e-6)
+        assert projection['nps_balance'][0, year] == pytest.approx(nps, abs=0.01)
+
+def test_chunking_and_per_year_rates_are_consistent():
+    rng = np.random.default_rng(3)
+    basic = rng.integers(8000, 90000, 500)
+    sector = rng.choice(['private', 'government'], 500)
+    rates = np.linspace(8.5, 7.5, 20)
+    whole = project_corpus(basic, 42, sector, years=20, salary_growth=5, epf_interest_rate=rates, chunk_size=1000)
+    chunked = project_corpus(basic, 42, sector, years=20, salary_growth=5, epf_interest_rate=rates, chunk_size=37)
+    for name in ('epf_balance', 'nps_balance', 'eps_contributions', 'employer_contributions'):
+        np.testing.assert_array_equal(whole[name], chunked[name])
+    assert (whole['nps_balance'][sector == 'private'] == 0).all()
+    assert (whole['epf_balance'][sector == 'government'] == 0).all()
+
+def test_per_year_rates_must_cover_the_horizon():
+    with pytest.raises(ValueError):
+        project_corpus([20000], years=10, epf_interest_rate=[8.25, 8.1])
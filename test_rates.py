@@ -0,0 +1,103 @@
+"""
+Tests for the effective-dated statutory rate registry
+"""
+
+import json
+import os
+from datetime import date
+
+import pytest
+
+from app import app
+from batch_engine import calculate_batch, result_row
+from core_calculators import calculate_gratuity, calculate_nps_contribution, calculate_pf_contribution, is_esi_applicable
+from memoize import configure_memoization
+from rates import RATES_FILE, as_pay_period, rate, rates_on, reload_if_changed, reload_rates, rules_version
+
+def test_rates_change_on_their_effective_dates():
+    assert rate('pf_wage_ceiling', '2014-08-31') == 6500
+    assert rate('pf_wage_ceiling', '2014-09-01') == 15000
+    assert rate('esi_wage_limit', '2016-12') == 15000
+    assert rate('esi_wage_limit', '2017-01') == 21000
+    assert (rate('esi_employee_rate', '2019-06'), rate('esi_employer_rate', '2019-06')) == (1.75, 4.75)
+    assert (rate('esi_employee_rate', '2019-07'), rate('esi_employer_rate', '2019-07')) == (0.75, 3.25)
+    assert rate('gratuity_cap', date(2018, 3, 28)) == 1000000
+    assert rate('gratuity_cap', date(2018, 3, 29)) == 2000000
+    assert rate('nps_employer_rate', '2019-03') == 10
+
+    assert 'nps_employer_rate' not in rates_on('2003-05') and rate('esi_wage_limit', '2011-01') == 15000
+    with pytest.raises(ValueError):
+        rates_on('1990-01-01')['pf_wage_ceiling']
+    with pytest.raises(ValueError):
+        as_pay_period('April 2019')
+    with pytest.raises(TypeError):
+        rates_on('2020-01')['pf_wage_ceiling'] = 0
+
+def test_calculators_use_rates_of_the_pay_period():
+    assert calculate_pf_contribution(25000, 5000, pay_period='2014-08')['pf_eligible_salary'] == 6500
+    assert calculate_pf_contribution(25000, 5000)['pf_eligible_salary'] == 15000
+
+    old_esi = is_esi_applicable(18000, pay_period='2016-06')
+    assert old_esi['eligible'] is False
+    assert old_esi['reason'] == 'Monthly salary exceeds ESI limit of Rs. 15000'
+    assert is_esi_applicable(12000, pay_period='2018-01')['employee_contribution'] == 210.0
+
+    assert calculate_gratuity(200000, 30, pay_period='2017-04-01')['gratuity_amount'] == 1000000
+    assert calculate_gratuity(200000, 30)['gratuity_amount'] == 2000000
+    assert calculate_nps_contribution(50000, 0, pay_period='2018-04')['employer_contribution'] == 5000.0
+    assert calculate_nps_contribution(50000, 0)['employer_contribution'] == 7000.0
+
+def test_batch_matches_scalar_for_past_pay_period():
+    basic = [5000, 12000, 15000, 40000]
+    results = calculate_batch(basic, 0, years_of_service=[6, 12, 30, 40], pay_period='2016-06')
+    for i, salary in enumerate(basic):
+        assert result_row('pf', results['pf'], i) == calculate_pf_contribution(salary, 0, pay_period='2016-06')
+        assert result_row('esi', results['esi'], i) == is_esi_applicable(salary, pay_period='2016-06')
+        assert result_row('nps', results['nps'], i) == calculate_nps_contribution(salary, 0, pay_period='2016-06')
+
+def _write_rules(path, **changes):
+    with open(RATES_FILE, encoding='utf-8') as source:
+        document = json.load(source)
+    for name, value in changes.items():
+        document['rates'][name].append({'from': '2020-01-01', 'value': value})
+    path.write_text(json.dumps(document), encoding='utf-8')
+
+def test_reload_swaps_rules_and_invalidates_memoized_results(tmp_path):
+    rules_file = tmp_path / 'rates.json'
+    _write_rules(rules_file)
+    configure_memoization(8)
+    try:
+        reload_rates(str(rules_file))
+        version = rules_version()
+        assert calculate_pf_contribution(25000, 5000)['pf_eligible_salary'] == 15000
+
+        _write_rules(rules_file, pf_wage_ceiling=21000)
+        os.utime(rules_file, ns=(1, 1))
+        assert reload_if_changed() is True
+        assert rules_version() != version
+        assert calculate_pf_contribution(25000, 5000)['pf_eligible_salary'] == 21000
+        assert calculate_pf_contribution(25000, 5000, pay_period='2019-12')['pf_eligible_salary'] == 15000
+        assert reload_if_changed() is False
+
+        # An invalid file is rejected and the rules in force stay
+        rules_file.write_text('{"version": "broken", "rates": {}}', encoding='utf-8')
+        os.utime(rules_file, ns=(2, 2))
+        with pytest.raises(ValueError):
+            reload_if_changed()
+        assert reload_if_changed() is False
+        assert rate('pf_wage_ceiling') == 21000
+    finally:
+        configure_memoization(0)
+        reload_rates(RATES_FILE)
+
+def test_rates_endpoint_and_pay_period_in_api():
+    client = app.test_client()
+    body = client.get('/api/rates?pay_period=2014-08').get_json()
+    assert body['pay_period'] == '2014-08-01'
+    assert body['rates']['pf_wage_ceiling'] == 6500
+    assert body['rules_version'] == rules_version()
+    assert client.get('/api/rates?pay_period=someday').status_code == 400
+    assert client.get('/api/rates?pay_period=1990-01').status_code == 400
+
+    response = client.post('/api/calculate', json={'type': 'pf', 'basic': 25000, 'da': 5000, 'pay_period': '2014-08'})
+    assert response.get_json()['result']['pf_eligible_salary'] == 6500
@@ -0,0 +1,29 @@
+"""
+Tests for the rendered PDF report cache
+"""
+
+from datetime import date
+
+from report_cache import ReportCache, report_cache_key
+
+def test_cache_key_is_canonical():
+    key = report_cache_key('pf', {'basic': 25000.0, 'da': 0.0}, '2025.1', date(2025, 4, 1))
+    assert key == report_cache_key('pf', {'da': 0.0, 'basic': 25000.0}, '2025.1', date(2025, 4, 1))
+    assert key != report_cache_key('pf', {'da': 0.0, 'basic': 25000.0}, '2025.2', date(2025, 4, 1))
+    assert key != report_cache_key('pf', {'da': 0.0, 'basic': 25000.0}, '2025.1', date(2025, 4, 2))
+
+def test_lru_eviction_by_size():
+    cache = ReportCache(max_bytes=10)
+    cache.put('a', b'12345')
+    cache.put('b', b'12345')
+    assert cache.get('a') == b'12345'
+    cache.put('c', b'12345')
+    assert cache.get('b') is None
+    assert cache.get('a') == b'12345'
+    assert cache.stats()['evictions'] == 1
+
+def test_disk_tier_survives_restart(tmp_path):
+    ReportCache(max_bytes=100, directory=str(tmp_path)).put('key', b'%PDF-1.4')
+    restarted = ReportCache(max_bytes=100, directory=str(tmp_path))
+    assert restarted.get('key') == b'%PDF-1.4'
+    assert restarted.stats()['disk_hits'] == 1
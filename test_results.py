@@ -0,0 +1,37 @@
+"""
+Tests for the slotted result records
+"""
+
+import pytest
+
+from core_calculators import (
+    calculate_gratuity, calculate_pf_contribution, calculate_nps_contribution, is_esi_applicable,
+    calculate_leave_entitlement
+)
+from results import GratuityResult, as_record
+
+CASES = [
+    ('gratuity', calculate_gratuity(50000, 6, 'private')),
+    ('gratuity', calculate_gratuity(500000, 40, 'private')),
+    ('gratuity', calculate_gratuity(30000, 4, 'private')),
+    ('gratuity', calculate_gratuity(50000, 15, 'government')),
+    ('gratuity', calculate_gratuity(50000, 8, 'government')),
+    ('pf', calculate_pf_contribution(25000, 3000, 'private')),
+    ('pf', calculate_pf_contribution(40000, 5000, 'government')),
+    ('esi', is_esi_applicable(18000)),
+    ('esi', is_esi_applicable(25000)),
+    ('nps', calculate_nps_contribution(45000, 8000, 14)),
+    ('leave', calculate_leave_entitlement(300, 'maharashtra', 'shop', 'private')),
+    ('leave', calculate_leave_entitlement(0, '', '', 'government'))
+]
+
+@pytest.mark.parametrize('calc_type, result', CASES)
+def test_record_round_trip_preserves_keys_and_order(calc_type, result):
+    record = as_record(calc_type, result)
+    assert list(record.to_dict().items()) == list(result.items())
+
+def test_records_are_compact_and_immutable():
+    record = GratuityResult(True, 1000.0, capped_at_maximum=False)
+    assert not hasattr(record, '__dict__')
+    with pytest.raises(AttributeError):
+        record.gratuity_amount = 0
@@ -0,0 +1,96 @@
+"""
+Tests for the EPF ECR and ESI return generator
+"""
+
+import io
+import json
+import zipfile
+
+from app import app
+from statutory_returns import ECR_SEPARATOR, ESI_COLUMNS, generate_returns
+
+ROSTER = [
+    {'establishment': 'MHBAN0012345', 'uan': '100200300401', 'ip_number': '3100112233', 'name': 'Asha Rao',
+     'basic': '12000', 'da': '3000', 'ncp_days': '2'},
+    {'establishment': 'MHBAN0012345', 'uan': '100200300402', 'ip_number': '', 'name': "R. K. D'Souza",
+     'basic': '40000', 'da': '10000', 'gross_wages': '65000', 'eps_member': 'no'},
+    {'establishment': 'MHBAN0012345', 'uan': '', 'ip_number': '3100112299', 'name': 'Contract Worker',
+     'basic': '9000.50', 'days_paid': '0', 'last_working_day': '12/06/2024'},
+    {'establishment': 'KAPNY0067890', 'uan': '100200300403', 'ip_number': '3100112244', 'name': 'Vikram Singh',
+     'basic': '20000', 'da': '1500'},
+    {'establishment': 'KAPNY0067890', 'uan': '12345', 'name': 'Bad UAN', 'basic': '10000'},
+    {'establishment': 'KAPNY0067890', 'uan': '100200300404', 'name': 'No Basic'}
+]
+
+def test_ecr_lines_and_challan_totals(tmp_path):
+    summary = generate_returns(ROSTER, str(tmp_path), '2024-06')
+    assert (summary['rows'], summary['errors']) == (6, 2)
+    assert [error['row'] for error in summary['error_rows']] == [5, 6]
+
+    lines = (tmp_path / 'MHBAN0012345_ECR_202406.txt').read_text(encoding='utf-8').splitlines()
+    assert [line.split(ECR_SEPARATOR) for line in lines] == [
+        ['100200300401', 'ASHA RAO', '15000', '15000', '15000', '15000', '1800', '1250', '550', '2', '0'],
+        ['100200300402', 'R. K. D SOUZA', '65000', '15000', '0', '15000', '1800', '0', '1800', '0', '0']
+    ]
+
+    totals = summary['establishments']['MHBAN0012345']
+    assert totals['files'] == ['MHBAN0012345_ECR_202406.txt', 'MHBAN0012345_ESI_202406.csv']
+    assert totals['ecr']['challan'] == {
+        'ac_1': 3600 + 2350, 'ac_2': 500, 'ac_10': 1250, 'ac_21': 150, 'ac_22': 0,
+        'total': 5950 + 500 + 1250 + 150
+    }
+    # Admin charges above the minimum, at the rates of an earlier period
+    older = generate_returns(ROSTER[:2], str(tmp_path / 'older'), '2016-06')
+    assert older['establishments']['MHBAN0012345']['ecr']['challan']['ac_2'] == 255
+
+def test_esi_file_excludes_members_above_the_wage_limit(tmp_path):
+    summary = generate_returns(ROSTER, str(tmp_path), '2024-06')
+    with open(tmp_path / 'MHBAN0012345_ESI_202406.csv', encoding='utf-8') as source:
+        rows = source.read().splitlines()
+    assert rows == [','.join(ESI_COLUMNS), '3100112233,ASHA RAO,28,15000,,', '3100112299,CONTRACT WORKER,0,9001,0,12/06/2024']
+
+    esi = summary['establishments']['MHBAN0012345']['esi']
+    # 0.75% / 3.25% rounded up: 112.50 -> 113, 67.51 -> 68; 487.50 -> 488, 292.53 -> 293
+    assert (esi['members'], esi['wages'], esi['employee_contribution'], esi['employer_contribution']) == (2, 24001, 181, 781)
+    assert summary['establishments']['KAPNY0067890']['esi']['above_wage_limit'] == 1
+    assert json.loads((tmp_path / 'summary.json').read_text(encoding='utf-8')) == summary
+
+def test_returns_endpoint_returns_zip():
+    header = ','.join(ROSTER[0])
+    body = header + '\n' + ','.join(ROSTER[0].values()) + '\n'
+    response = app.test_client().post('/api/returns?pay_period=2024-06', data=body.encode('utf-8'),
+                                      content_type='text/csv')
+    assert response.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(response.data)) as archive:
+        assert archive.namelist() == ['MHBAN0012345_ECR_202406.txt', 'MHBAN0012345_ESI_202406.csv', 'summary.json']
+    assert app.test_client().post('/api/returns?pay_period=June', data=b'').status_code == 400
+
+def test_rejected_rows_are_left_out_of_every_file(tmp_path):
+    member = {'establishment': 'TNMAS0011111', 'uan': '100200300409', 'ip_number': '3100112255',
+              'name': 'Meena K', 'basic': '12000'}
+    rows = [dict(member, days_paid='abc'), dict(member, days_paid='31'), dict(member, ncp_days='-1'),
+            dict(member, refund='x'), dict(member, uan='100200300410', ip_number='', days_paid='10')]
+    summary = generate_returns(rows, str(tmp_path), '2024-06')
+    assert summary['errors'] == 4
+    totals = summary['establishments']['TNMAS0011111']
+    assert (totals['ecr']['members'], totals['esi']['members']) == (1, 0)
+    assert (tmp_path / 'TNMAS0011111_ECR_202406.txt').read_text(encoding='utf-8').startswith('100200300410#~#')
+
+def test_codes_with_the_same_file_name_get_their_own_files(tmp_path):
+    member = {'uan': '100200300411', 'name': 'Meena K', 'basic': '12000'}
+    rows = [dict(member, establishment='MH/001'), dict(member, establishment='MH 001', uan='100200300412')]
+    summary = generate_returns(rows, str(tmp_path), '2024-06')
+    assert summary['establishments']['MH/001']['files'][0] == 'MH_001_ECR_202406.txt'
+    assert summary['establishments']['MH 001']['files'][0] == 'MH_001_2_ECR_202406.txt'
+    assert (tmp_path / 'MH_001_ECR_202406.txt').read_text(encoding='utf-8').startswith('100200300411#~#')
+    assert (tmp_path / 'MH_001_2_ECR_202406.txt').read_text(encoding='utf-8').startswith('100200300412#~#')
+
+def test_output_is_appended_in_blocks(tmp_path, monkeypatch):
+    import statutory_returns
+    monkeypatch.setattr(statutory_returns, 'WRITE_BUFFER_BYTES', 100)
+    rows = [{'establishment': f'EST{i % 300:03d}', 'uan': f'{100200300000 + i}', 'name': 'Member', 'basic': '12000'}
+            for i in range(1200)]
+    summary = generate_returns(rows, str(tmp_path), '2024-06')
+    assert len(summary['establishments']) == 300
+    lines = (tmp_path / 'EST007_ECR_202406.txt').read_text(encoding='utf-8').splitlines()
+    assert [line.split(ECR_SEPARATOR)[0] for line in lines] == [str(100200300000 + i) for i in (7, 307, 607, 907)]
@@ -0,0 +1,21 @@
+"""
+WSGI entry point for production servers
+
+    gunicorn -c gunicorn.conf.py
+
+gunicorn.conf.py sets preload_app, so this module is imported once in the
+master process: the application is imported and warmed up there, and the
+forked workers share that memory copy-on-write.
+"""
+
+import gc
+
+from app import app, warm_up
+
+warm_up()
+# Everything loaded so far lives as long as the process. Moving it out of the
+# garbage collector's generations stops collections in the workers from
+# writing to (and so copying) the shared pages.
+gc.freeze()
+
+application = app